@@ -1,33 +1,34 @@
-from typing import List, Optional, Dict, Any, Tuple, Set
+import os
+from typing import List, Optional, Dict, Any, Tuple, Set, Union
 from pytctracer.config.constants import LevelType, TechniqueParameter
 from pytctracer.config import Config
-from pytctracer.io.input import read_trace_csv_log, load_link_json
+from pytctracer.io.input import load_link_json
 from pytctracer.io.output import (
     display_predicted_links,
     write_dict_to_json,
     write_evaluation_metrics_to_csv,
+    write_threshold_sweep_results_to_csv,
+    write_grid_search_results_to_csv,
     display_evaluation_results,
+    display_threshold_sweep_results,
+    display_grid_search_results,
     display_classifications,
 )
-from pytctracer.parsing import (
-    find_function_names_tuple,
-    find_test_names_tuple,
-    find_functions_called_by_test,
-    find_functions_called_by_test_count,
-    find_functions_called_by_test_depth,
-    find_tests_that_call_function,
-    find_functions_called_before_assert_for_each_test,
-    find_function_classes_called_by_test_depth,
-    find_classes_called_before_assert_for_each_test,
-    find_function_class_names_tuple,
-    find_test_class_names_tuple,
-    find_function_classes_called_by_test,
-    find_function_classes_called_by_test_count,
-    find_tests_that_call_function_classes,
-)
+from pytctracer.parsing import TechniqueParameterLoader
 from pytctracer.evaluation.metrics import ArgNameToMetricMapper, Metric
-from pytctracer.evaluation import classify_predictions, evaluate_predictions
-from pytctracer.techniques import ArgNameToTechniqueMapper, Combined
+from pytctracer.evaluation import (
+    classify_predictions,
+    evaluate_predictions,
+    sweep_thresholds,
+    find_best_threshold,
+    RawScoreTable,
+    search_grid,
+)
+from pytctracer.techniques import (
+    ArgNameToTechniqueMapper,
+    Combined,
+    TechniqueRunner,
+)
 
 
 class Analyser:
@@ -36,45 +37,134 @@ class Analyser:
     of test-to-code traceability links.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        use_parsed_trace_cache: bool = True,
+        cache_directory: Optional[str] = None,
+        parse_jobs: int = 1,
+        jobs: int = 1,
+        test_jobs: int = 1,
+    ) -> None:
+        """
+        Class which handles the the generation, evaluation and comparison
+        of test-to-code traceability links.
+
+        Args:
+            use_parsed_trace_cache (bool): Whether to load and store the parsed trace
+            data in a cache, so that repeat runs on the same trace log skip parsing.
+            cache_directory (Optional[str]): The directory to store cache files in. If
+            omitted, the cache file is stored next to the trace log.
+            parse_jobs (int): The number of processes to read and parse trace logs with.
+            jobs (int): The number of processes to run traceability techniques with.
+            test_jobs (int): The number of processes to score the tests of each
+            traceability technique with.
+        """
         self.arg_name_to_technique_map = ArgNameToTechniqueMapper()
         self.arg_name_to_metric_map = ArgNameToMetricMapper()
         self.default_technique_names = Config.DEFAULT_CHOSEN_TECHNIQUE_NAMES
         self.default_metric_names = Config.DEFAULT_CHOSEN_METRIC_NAMES
+        self.technique_parameter_loader = TechniqueParameterLoader(
+            use_parsed_trace_cache=use_parsed_trace_cache,
+            cache_directory=cache_directory,
+            parse_jobs=parse_jobs,
+        )
+        self.technique_runner = TechniqueRunner(jobs=jobs, test_jobs=test_jobs)
+
+    def clear_parsed_trace_cache(self, trace_csv_log_path: str) -> bool:
+        """
+        Remove the parsed trace cache for a given dynamic trace log.
+
+        Args:
+            trace_csv_log_path (str): The path to the dynamic trace log CSV file.
+
+        Returns:
+            bool: Whether a cache file was removed.
+        """
+        return self.technique_parameter_loader.clear_parsed_trace_cache(
+            trace_csv_log_path
+        )
 
     def produce_traceability_links_for_trace(
         self,
         trace_csv_log_path: str,
-        traceability_level: LevelType,
+        traceability_level: Union[LevelType, List[LevelType]],
         add_combined_technique: bool = False,
+        combined_technique_weights: Optional[Dict[str, float]] = None,
         chosen_technique_names: Optional[List[str]] = None,
         prediction_output_directory_path: Optional[str] = None,
+        top_k: Optional[int] = None,
     ) -> None:
         """
         Produces traceability links for a given dynamic trace log. The
         chosen technique names, whether to add a combined technique, the
         level to produce links at, and an output output directory path can
         be specified. If no directory is specified, the links are printed to
-        standard output.
+        standard output. When several levels are given, the trace log is loaded
+        and parsed once, and links are produced at each level in turn.
 
         Args:
             trace_csv_log_path (str): The path to the dynamic trace log CSV file.
-            traceability_level (LevelType): The level of traceability to produce links for.
+            traceability_level (Union[LevelType, List[LevelType]]): The level, or levels,
+            of traceability to produce links for.
             add_combined_technique (bool): Whether to produce links with the combined technique.
+            combined_technique_weights (Optional[Dict[str, float]]): The weight of each technique
+            in the combined technique, keyed by its arg name. If omitted, the techniques are
+            weighted equally.
             chosen_technique_names (Optional[List[str]]): The arg names of the techniques to use.
-            prediction_output_directory_path (Optional[str]): The directory to write the output links to.
+            prediction_output_directory_path (Optional[str]): The directory to write the output
+            links to.
+            top_k (Optional[int]): The maximum number of links to produce for each test.
         """
         if not chosen_technique_names:
             chosen_technique_names = self.default_technique_names
+        traceability_levels = _list_traceability_levels(traceability_level)
+        technique_parameter_maps = self._load_technique_parameter_maps(
+            trace_csv_log_path, traceability_levels
+        )
+        for level in traceability_levels:
+            self._produce_traceability_links_for_level(
+                technique_parameter_map=technique_parameter_maps[level],
+                traceability_level=level,
+                add_combined_technique=add_combined_technique,
+                combined_technique_weights=combined_technique_weights,
+                chosen_technique_names=chosen_technique_names,
+                prediction_output_directory_path=prediction_output_directory_path,
+                top_k=top_k,
+                label_level=len(traceability_levels) > 1,
+            )
+
+    def _produce_traceability_links_for_level(
+        self,
+        technique_parameter_map: Dict[TechniqueParameter, Any],
+        traceability_level: LevelType,
+        add_combined_technique: bool,
+        combined_technique_weights: Optional[Dict[str, float]],
+        chosen_technique_names: List[str],
+        prediction_output_directory_path: Optional[str],
+        top_k: Optional[int],
+        label_level: bool,
+    ) -> None:
+        name_vocabulary = technique_parameter_map[TechniqueParameter.NAME_VOCABULARY]
+        # The scores are only used to predict links, unless they are combined
         _, link_predictions_for_techniques = self._predict_links(
-            trace_csv_log_path=trace_csv_log_path,
+            technique_parameter_map=technique_parameter_map,
             chosen_technique_names=chosen_technique_names,
-            traceability_level=traceability_level,
             add_combined_technique=add_combined_technique,
+            combined_technique_weights=combined_technique_weights,
+            prediction_only=not add_combined_technique,
+            top_k=top_k,
         )
+        for (
+            technique_arg_name,
+            link_predictions,
+        ) in link_predictions_for_techniques.items():
+            link_predictions_for_techniques[technique_arg_name] = (
+                name_vocabulary.decode_links(link_predictions)
+            )
         if not prediction_output_directory_path:
             self._display_predicted_links_for_techniques(
-                link_predictions_for_techniques
+                link_predictions_for_techniques,
+                traceability_level if label_level else None,
             )
         else:
             self._write_predicted_links_for_techniques(
@@ -86,9 +176,10 @@ class Analyser:
     def evaluate_traceability_links_for_trace(
         self,
         trace_csv_log_path: str,
-        ground_truth_path: str,
-        traceability_level: LevelType,
+        ground_truth_path: Union[str, List[str]],
+        traceability_level: Union[LevelType, List[LevelType]],
         add_combined_technique: bool = False,
+        combined_technique_weights: Optional[Dict[str, float]] = None,
         chosen_technique_names: Optional[List[str]] = None,
         chosen_metric_names: Optional[List[str]] = None,
         classifications_output_directory_path: Optional[str] = None,
@@ -101,13 +192,22 @@ class Analyser:
         evaluates them against a specified ground truth. Allows for choosing
         the technique names to evaluate predictions for, the metric names to
         compute, and whether to add a combined technique as well as output
-        paths for the classifications and metrics.
+        paths for the classifications and metrics. When several levels are given,
+        the trace log is loaded and parsed once, and the links at each level are
+        evaluated against the ground truth for that level in turn. The evaluation
+        metrics CSV of each level is then written with the level added to the end
+        of its file name.
 
         Args:
             trace_csv_log_path (str): The path to the dynamic trace log CSV file.
-            ground_truth_path (str): The path to the ground truth JSON file.
-            traceability_level (LevelType): The level of traceability to produce links for.
+            ground_truth_path (Union[str, List[str]]): The path to the ground truth JSON
+            file, or a path for each of the levels, in the same order.
+            traceability_level (Union[LevelType, List[LevelType]]): The level, or levels,
+            of traceability to produce links for.
             add_combined_technique (bool): Whether to produce links with the combined technique.
+            combined_technique_weights (Optional[Dict[str, float]]): The weight of each technique
+            in the combined technique, keyed by its arg name. If omitted, the techniques are
+            weighted equally.
             chosen_technique_names (Optional[List[str]]): The arg names of the techniques to use.
             chosen_metric_names (Optional[List[str]]): The arg names of the metrics to use.
             classifications_output_directory_path (Optional[str]): The directory to write the output
@@ -124,15 +224,82 @@ class Analyser:
         if not chosen_metric_names:
             chosen_metric_names = self.default_metric_names
 
-        ground_truth_links = load_link_json(ground_truth_path)
+        traceability_levels = _list_traceability_levels(traceability_level)
+        ground_truth_paths = (
+            [ground_truth_path]
+            if isinstance(ground_truth_path, str)
+            else list(ground_truth_path)
+        )
+        if len(ground_truth_paths) != len(traceability_levels):
+            raise ValueError(
+                f"Expected a ground truth path for each of the {len(traceability_levels)} "
+                f"traceability levels, but got {len(ground_truth_paths)}."
+            )
+
+        ground_truth_links_for_levels = {
+            level: load_link_json(level_ground_truth_path)
+            for level, level_ground_truth_path in zip(
+                traceability_levels, ground_truth_paths
+            )
+        }
+        # Only the tests in the ground truth are scored, so only their calls
+        # need to be parsed if the trace log is parsed for this run alone
+        technique_parameter_maps = self._load_technique_parameter_maps(
+            trace_csv_log_path,
+            traceability_levels,
+            tests_to_parse={
+                level: set(ground_truth_links) or None
+                for level, ground_truth_links in ground_truth_links_for_levels.items()
+            },
+        )
+        label_level = len(traceability_levels) > 1
+        for level in traceability_levels:
+            self._evaluate_traceability_links_for_level(
+                technique_parameter_map=technique_parameter_maps[level],
+                ground_truth_links=ground_truth_links_for_levels[level],
+                traceability_level=level,
+                add_combined_technique=add_combined_technique,
+                combined_technique_weights=combined_technique_weights,
+                chosen_technique_names=chosen_technique_names,
+                chosen_metric_names=chosen_metric_names,
+                classifications_output_directory_path=classifications_output_directory_path,
+                evaluation_metrics_output_path=(
+                    _add_level_to_path(evaluation_metrics_output_path, level)
+                    if evaluation_metrics_output_path and label_level
+                    else evaluation_metrics_output_path
+                ),
+                display_classifications_to_stdout=display_classifications_to_stdout,
+                metric_as_percentage=metric_as_percentage,
+                label_level=label_level,
+            )
+
+    def _evaluate_traceability_links_for_level(
+        self,
+        technique_parameter_map: Dict[TechniqueParameter, Any],
+        ground_truth_links: Dict[str, List[str]],
+        traceability_level: LevelType,
+        add_combined_technique: bool,
+        combined_technique_weights: Optional[Dict[str, float]],
+        chosen_technique_names: List[str],
+        chosen_metric_names: List[str],
+        classifications_output_directory_path: Optional[str],
+        evaluation_metrics_output_path: Optional[str],
+        display_classifications_to_stdout: bool,
+        metric_as_percentage: bool,
+        label_level: bool,
+    ) -> None:
+        name_vocabulary = technique_parameter_map[TechniqueParameter.NAME_VOCABULARY]
+        # Links are predicted and evaluated with the IDs of the names, which are
+        # only decoded for the classifications that are output
+        ground_truth_links = name_vocabulary.encode_links(ground_truth_links)
         ground_truth_tests = set(ground_truth_links.keys())
 
         traceability_scores_for_techniques, link_predictions_for_techniques = (
             self._predict_links(
-                trace_csv_log_path=trace_csv_log_path,
+                technique_parameter_map=technique_parameter_map,
                 chosen_technique_names=chosen_technique_names,
-                traceability_level=traceability_level,
                 add_combined_technique=add_combined_technique,
+                combined_technique_weights=combined_technique_weights,
                 test_to_create_links_for=ground_truth_tests,
             )
         )
@@ -144,16 +311,25 @@ class Analyser:
             chosen_metric_names=chosen_metric_names,
             metric_as_percentage=metric_as_percentage,
         )
-        classifications_for_techniques = self._compute_classifications(
-            link_predictions_for_techniques=link_predictions_for_techniques,
-            ground_truth_links=ground_truth_links,
-        )
+        classifications_for_techniques = {
+            technique_arg_name: name_vocabulary.decode_classifications(classifications)
+            for technique_arg_name, classifications in self._compute_classifications(
+                link_predictions_for_techniques=link_predictions_for_techniques,
+                ground_truth_links=ground_truth_links,
+            ).items()
+        }
         if display_classifications_to_stdout:
-            self._display_classifications_for_techniques(classifications_for_techniques)
+            self._display_classifications_for_techniques(
+                classifications_for_techniques,
+                traceability_level if label_level else None,
+            )
 
         display_evaluation_results(
             evaluation_metric_dict=evaluation_metrics_for_techniques,
-            title=Config.EVALUATION_METRICS_TITLE,
+            title=_add_level_to_title(
+                Config.EVALUATION_METRICS_TITLE,
+                traceability_level if label_level else None,
+            ),
         )
 
         if classifications_output_directory_path:
@@ -169,6 +345,195 @@ class Analyser:
                 csv_name=evaluation_metrics_output_path,
             )
 
+    def sweep_traceability_thresholds_for_trace(
+        self,
+        trace_csv_log_path: str,
+        ground_truth_path: str,
+        traceability_level: LevelType,
+        add_combined_technique: bool = False,
+        combined_technique_weights: Optional[Dict[str, float]] = None,
+        chosen_technique_names: Optional[List[str]] = None,
+        thresholds: Optional[List[float]] = None,
+        sweep_output_path: Optional[str] = None,
+        metric_as_percentage: bool = False,
+    ) -> None:
+        """
+        Scores the test-to-code pairs of a given dynamic trace log once, and then
+        evaluates the links predicted at each of many thresholds against a specified
+        ground truth, reporting the metrics at each threshold and the threshold with
+        the best F1 score for each technique. Only the techniques that use a threshold
+        are swept.
+
+        Args:
+            trace_csv_log_path (str): The path to the dynamic trace log CSV file.
+            ground_truth_path (str): The path to the ground truth JSON file.
+            traceability_level (LevelType): The level of traceability to produce links for.
+            add_combined_technique (bool): Whether to sweep the combined technique as well.
+            combined_technique_weights (Optional[Dict[str, float]]): The weight of each technique
+            in the combined technique, keyed by its arg name. If omitted, the techniques are
+            weighted equally.
+            chosen_technique_names (Optional[List[str]]): The arg names of the techniques to use.
+            thresholds (Optional[List[float]]): The thresholds to evaluate. If omitted, every
+            distinct score of each technique is evaluated.
+            sweep_output_path (Optional[str]): The path to write the CSV containing the
+            threshold sweep results to.
+            metric_as_percentage (bool): Whether to report metrics as percentages.
+        """
+        if not chosen_technique_names:
+            chosen_technique_names = self.default_technique_names
+        chosen_technique_names = [
+            technique_arg_name
+            for technique_arg_name in chosen_technique_names
+            if self.arg_name_to_technique_map.get_technique(
+                technique_arg_name
+            ).uses_threshold
+        ]
+
+        ground_truth_links = load_link_json(ground_truth_path)
+        technique_parameter_map = self._load_technique_parameter_map(
+            trace_csv_log_path, traceability_level, set(ground_truth_links) or None
+        )
+        ground_truth_links = technique_parameter_map[
+            TechniqueParameter.NAME_VOCABULARY
+        ].encode_links(ground_truth_links)
+        traceability_scores_for_techniques = self._run_technique_scoring(
+            chosen_technique_names=chosen_technique_names,
+            technique_parameter_map=technique_parameter_map,
+            tests_to_score=set(ground_truth_links) or None,
+        )
+        if add_combined_technique:
+            traceability_scores_for_techniques[Combined.arg_name] = Combined(
+                weights=combined_technique_weights
+            ).run(traceability_scores_for_techniques)
+
+        sweep_results_for_techniques = {}
+        best_thresholds_for_techniques = {}
+        for (
+            technique_arg_name,
+            traceability_scores,
+        ) in traceability_scores_for_techniques.items():
+            sweep_results = sweep_thresholds(
+                traceability_score_dict=traceability_scores,
+                ground_truth_links=ground_truth_links,
+                thresholds=thresholds,
+                metric_as_percentage=metric_as_percentage,
+            )
+            sweep_results_for_techniques[technique_arg_name] = sweep_results
+            if sweep_results:
+                best_thresholds_for_techniques[technique_arg_name] = (
+                    find_best_threshold(sweep_results)
+                )
+
+        display_threshold_sweep_results(
+            sweep_results_for_techniques=sweep_results_for_techniques,
+            best_thresholds_for_techniques=best_thresholds_for_techniques,
+            title=Config.THRESHOLD_SWEEP_TITLE,
+        )
+
+        if sweep_output_path:
+            write_threshold_sweep_results_to_csv(
+                sweep_results_for_techniques=sweep_results_for_techniques,
+                csv_name=sweep_output_path,
+            )
+
+    def grid_search_traceability_for_trace(
+        self,
+        trace_csv_log_path: str,
+        ground_truth_path: str,
+        traceability_level: LevelType,
+        chosen_technique_names: Optional[List[str]] = None,
+        discount_factors: Optional[List[float]] = None,
+        thresholds: Optional[List[float]] = None,
+        grid_output_path: Optional[str] = None,
+        metric_as_percentage: bool = False,
+    ) -> None:
+        """
+        Produces the raw scores of each technique for a given dynamic trace log once,
+        without call depth discounting or normalisation, and then evaluates every
+        configuration of discount factor, normalisation and threshold against a
+        specified ground truth. The configurations are applied to the raw scores
+        afterwards, and are evaluated in parallel across the analyser's jobs. Only
+        the techniques that use a threshold are searched.
+
+        Args:
+            trace_csv_log_path (str): The path to the dynamic trace log CSV file.
+            ground_truth_path (str): The path to the ground truth JSON file.
+            traceability_level (LevelType): The level of traceability to produce links for.
+            chosen_technique_names (Optional[List[str]]): The arg names of the techniques to use.
+            discount_factors (Optional[List[float]]): The discount factors to evaluate, where
+            a discount factor of one is no call depth discounting. If omitted, the default
+            grid search discount factors are evaluated.
+            thresholds (Optional[List[float]]): The thresholds to evaluate. If omitted, every
+            distinct score of each configuration is evaluated.
+            grid_output_path (Optional[str]): The path to write the CSV containing the grid
+            search results to.
+            metric_as_percentage (bool): Whether to report metrics as percentages.
+        """
+        if not chosen_technique_names:
+            chosen_technique_names = self.default_technique_names
+        chosen_technique_names = [
+            technique_arg_name
+            for technique_arg_name in chosen_technique_names
+            if self.arg_name_to_technique_map.get_technique(
+                technique_arg_name
+            ).uses_threshold
+        ]
+        if not discount_factors:
+            discount_factors = Config.DEFAULT_GRID_SEARCH_DISCOUNT_FACTORS
+
+        ground_truth_links = load_link_json(ground_truth_path)
+        technique_parameter_map = self._load_technique_parameter_map(
+            trace_csv_log_path, traceability_level, set(ground_truth_links) or None
+        )
+        ground_truth_links = technique_parameter_map[
+            TechniqueParameter.NAME_VOCABULARY
+        ].encode_links(ground_truth_links)
+        raw_scores_for_techniques = self._run_technique_scoring(
+            chosen_technique_names=chosen_technique_names,
+            technique_parameter_map=technique_parameter_map,
+            tests_to_score=set(ground_truth_links) or None,
+            raw_scores=True,
+        )
+        raw_score_tables = {
+            technique_arg_name: RawScoreTable(
+                raw_scores=raw_scores,
+                ground_truth_links=ground_truth_links,
+                functions_called_by_test_depth=technique_parameter_map[
+                    TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH
+                ],
+            )
+            for technique_arg_name, raw_scores in raw_scores_for_techniques.items()
+        }
+
+        grid_results_for_techniques = search_grid(
+            raw_score_tables=raw_score_tables,
+            discount_factors=discount_factors,
+            normalise_options=[True, False],
+            thresholds=thresholds,
+            metric_as_percentage=metric_as_percentage,
+            jobs=self.technique_runner.jobs,
+        )
+        best_thresholds_for_techniques = {
+            technique_arg_name: {
+                configuration: find_best_threshold(sweep_results)
+                for configuration, sweep_results in grid_results.items()
+                if sweep_results
+            }
+            for technique_arg_name, grid_results in grid_results_for_techniques.items()
+        }
+
+        display_grid_search_results(
+            grid_results_for_techniques=grid_results_for_techniques,
+            best_thresholds_for_techniques=best_thresholds_for_techniques,
+            title=Config.GRID_SEARCH_TITLE,
+        )
+
+        if grid_output_path:
+            write_grid_search_results_to_csv(
+                grid_results_for_techniques=grid_results_for_techniques,
+                csv_name=grid_output_path,
+            )
+
     def compare_traceability_links(
         self,
         predicted_links_path: str,
@@ -188,7 +553,8 @@ class Analyser:
             predicted_links_path (str): The path to the JSON file containing the predicted links.
             ground_truth_path (str): The path to the JSON file containing the ground truth links.
             chosen_metric_names (Optional[List[str]]): The arg names of the metrics to use.
-            classifications_output_path (Optional[str]): The path to write the output classifications to.
+            classifications_output_path (Optional[str]): The path to write the output
+            classifications to.
             evaluation_metrics_output_path (Optional[str]): The path to write the CSV containing the
             evaluation metric results to.
             display_classifications_to_stdout (bool): Whether to display the classifications to
@@ -265,7 +631,9 @@ class Analyser:
             write_dict_to_json(classifications, file_path)
 
     def _display_classifications_for_techniques(
-        self, classifications_for_techniques: Dict[str, Dict[str, List[str]]]
+        self,
+        classifications_for_techniques: Dict[str, Dict[str, List[str]]],
+        traceability_level: Optional[LevelType] = None,
     ) -> None:
         for (
             technique_arg_name,
@@ -274,7 +642,10 @@ class Analyser:
             technique_short_name = self.arg_name_to_technique_map.get_short_name(
                 technique_arg_name
             )
-            display_classifications(classifications, technique_short_name)
+            display_classifications(
+                classifications,
+                _add_level_to_title(technique_short_name, traceability_level),
+            )
 
     def _compute_classifications(
         self,
@@ -337,29 +708,29 @@ class Analyser:
 
     def _predict_links(
         self,
-        trace_csv_log_path: str,
+        technique_parameter_map: Dict[TechniqueParameter, Any],
         chosen_technique_names: List[str],
-        traceability_level: LevelType,
         add_combined_technique: bool,
+        combined_technique_weights: Optional[Dict[str, float]] = None,
         test_to_create_links_for: Optional[Set[str]] = None,
+        prediction_only: bool = False,
+        top_k: Optional[int] = None,
     ) -> Tuple[Dict[str, Dict[str, Dict[str, float]]], Dict[str, Dict[str, List[str]]]]:
-        if traceability_level == LevelType.FUNCTION:
-            technique_parameter_map = self._parse_function_level_data(
-                trace_csv_log_path
-            )
-        else:
-            technique_parameter_map = self._parse_class_level_data(trace_csv_log_path)
+        # Links are only created for the given tests, so only they are scored
         traceability_scores_for_techniques = self._run_technique_scoring(
             chosen_technique_names=chosen_technique_names,
             technique_parameter_map=technique_parameter_map,
+            tests_to_score=test_to_create_links_for or None,
+            prediction_only=prediction_only,
         )
         link_predictions_for_techniques = self._run_technique_link_prediction(
             traceability_scores_for_techniques=traceability_scores_for_techniques,
             tests_to_create_links_for=test_to_create_links_for,
+            top_k=top_k,
         )
 
         if add_combined_technique:
-            combined_technique = Combined()
+            combined_technique = Combined(weights=combined_technique_weights)
             combined_traceability_scores = combined_technique.run(
                 traceability_scores_for_techniques
             )
@@ -369,6 +740,7 @@ class Analyser:
             combined_link_predictions = combined_technique.generate_predicted_links(
                 traceability_score_dict=combined_traceability_scores,
                 tests_to_create_links_for=test_to_create_links_for,
+                top_k=top_k,
             )
             link_predictions_for_techniques[combined_technique.arg_name] = (
                 combined_link_predictions
@@ -391,7 +763,9 @@ class Analyser:
             write_dict_to_json(link_predictions, file_path)
 
     def _display_predicted_links_for_techniques(
-        self, link_predictions_for_techniques: Dict[str, Dict[str, List[str]]]
+        self,
+        link_predictions_for_techniques: Dict[str, Dict[str, List[str]]],
+        traceability_level: Optional[LevelType] = None,
     ) -> None:
         for (
             technique_arg_name,
@@ -400,12 +774,16 @@ class Analyser:
             technique_short_name = self.arg_name_to_technique_map.get_short_name(
                 technique_arg_name
             )
-            display_predicted_links(link_predictions, technique_short_name)
+            display_predicted_links(
+                link_predictions,
+                _add_level_to_title(technique_short_name, traceability_level),
+            )
 
     def _run_technique_link_prediction(
         self,
         traceability_scores_for_techniques: Dict[str, Dict[str, Dict[str, float]]],
         tests_to_create_links_for: Optional[Set[str]] = None,
+        top_k: Optional[int] = None,
     ) -> Dict[str, Dict[str, List[str]]]:
         link_predictions_for_techniques = {}
         for (
@@ -418,6 +796,7 @@ class Analyser:
             link_predictions = technique.generate_predicted_links(
                 traceability_score_dict=traceability_scores,
                 tests_to_create_links_for=tests_to_create_links_for,
+                top_k=top_k,
             )
             link_predictions_for_techniques[technique_arg_name] = link_predictions
 
@@ -427,78 +806,62 @@ class Analyser:
         self,
         chosen_technique_names: List[str],
         technique_parameter_map: Dict[TechniqueParameter, Any],
+        tests_to_score: Optional[Set[str]] = None,
+        **technique_options,
     ) -> Dict[str, Dict[str, Dict[str, float]]]:
-        traceability_scores_for_techniques = {}
-        for technique_arg_name in chosen_technique_names:
-            technique = self.arg_name_to_technique_map.get_technique(
-                technique_arg_name
-            )()
+        # The technique options, such as prediction_only, are passed to the
+        # constructor of each technique
+        return self.technique_runner.run_techniques(
+            chosen_technique_names,
+            technique_parameter_map,
+            tests_to_score,
+            **technique_options,
+        )
 
-            technique_parameters = {
-                required_parameter: technique_parameter_map[required_parameter]
-                for required_parameter in technique.required_parameters
-            }
+    def _load_technique_parameter_map(
+        self,
+        trace_csv_log_path: str,
+        traceability_level: LevelType,
+        tests_to_parse: Optional[Set[str]] = None,
+    ) -> Dict[TechniqueParameter, Any]:
+        return self._load_technique_parameter_maps(
+            trace_csv_log_path,
+            [traceability_level],
+            {traceability_level: tests_to_parse},
+        )[traceability_level]
 
-            traceability_scores = technique.run(**technique_parameters)
-            traceability_scores_for_techniques[technique_arg_name] = traceability_scores
+    def _load_technique_parameter_maps(
+        self,
+        trace_csv_log_path: str,
+        traceability_levels: List[LevelType],
+        tests_to_parse: Optional[Dict[LevelType, Optional[Set[str]]]] = None,
+    ) -> Dict[LevelType, Dict[TechniqueParameter, Any]]:
+        return self.technique_parameter_loader.load_technique_parameter_maps(
+            trace_csv_log_path, traceability_levels, tests_to_parse
+        )
 
-        return traceability_scores_for_techniques
 
-    def _parse_function_level_data(
-        self, trace_csv_log_path: str
-    ) -> Dict[TechniqueParameter, Any]:
-        trace_data = read_trace_csv_log(trace_csv_log_path)
-        function_names_tuple = find_function_names_tuple(trace_data)
-        test_names_tuple = find_test_names_tuple(trace_data)
-        functions_called_by_test = find_functions_called_by_test(trace_data)
-        functions_called_by_test_count = find_functions_called_by_test_count(trace_data)
-        functions_called_by_test_depth = find_functions_called_by_test_depth(trace_data)
-        functions_called_by_test_before_assert = (
-            find_functions_called_before_assert_for_each_test(trace_data)
-        )
-        tests_that_call_function = find_tests_that_call_function(trace_data)
-
-        return {
-            TechniqueParameter.FUNCTION_NAMES_TUPLE: function_names_tuple,
-            TechniqueParameter.TEST_NAMES_TUPLE: test_names_tuple,
-            TechniqueParameter.FUNCTIONS_CALLED_BY_TESTS: functions_called_by_test,
-            TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT: functions_called_by_test_count,
-            TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH: functions_called_by_test_depth,
-            TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_BEFORE_ASSERT: functions_called_by_test_before_assert,
-            TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS: tests_that_call_function,
-        }
+def _list_traceability_levels(
+    traceability_level: Union[LevelType, List[LevelType]],
+) -> List[LevelType]:
+    # A single level may be given on its own. Repeated levels are only run once.
+    if isinstance(traceability_level, str):
+        return [LevelType(traceability_level)]
 
-    def _parse_class_level_data(
-        self, trace_csv_log_path: str
-    ) -> Dict[TechniqueParameter, Any]:
-        trace_data = read_trace_csv_log(trace_csv_log_path)
-        function_class_names_tuple = find_function_class_names_tuple(trace_data)
-        test_class_names_tuple = find_test_class_names_tuple(trace_data)
-        functions_called_by_test_class = find_function_classes_called_by_test(
-            trace_data
-        )
-        functions_called_by_test_class_count = (
-            find_function_classes_called_by_test_count(trace_data)
-        )
-        functions_called_by_test_class_depth = (
-            find_function_classes_called_by_test_depth(trace_data)
-        )
-        functions_called_by_test_class_before_assert = (
-            find_classes_called_before_assert_for_each_test(trace_data)
-        )
-        tests_that_call_function_classes = find_tests_that_call_function_classes(
-            trace_data
-        )
+    return list(dict.fromkeys(LevelType(level) for level in traceability_level))
 
-        return {
-            TechniqueParameter.FUNCTION_NAMES_TUPLE: function_class_names_tuple,
-            TechniqueParameter.TEST_NAMES_TUPLE: test_class_names_tuple,
-            TechniqueParameter.FUNCTIONS_CALLED_BY_TESTS: functions_called_by_test_class,
-            TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT: functions_called_by_test_class_count,
-            TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH: functions_called_by_test_class_depth,
-            TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_BEFORE_ASSERT: functions_called_by_test_class_before_assert,
-            TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS: tests_that_call_function_classes,
-        }
+
+def _add_level_to_title(title: str, traceability_level: Optional[LevelType]) -> str:
+    if traceability_level is None:
+        return title
+
+    return f"{title} ({traceability_level.lower()} level)"
+
+
+def _add_level_to_path(path: str, traceability_level: LevelType) -> str:
+    root, extension = os.path.splitext(path)
+
+    return f"{root}_{traceability_level.lower()}{extension}"
 
 
 __all__ = ["Analyser"]
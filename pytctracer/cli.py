@@ -1,8 +1,17 @@
-from typing import Tuple, Optional
+import math
+from typing import Dict, List, Tuple, Optional
 import click
 from pytctracer import Analyser
 from pytctracer.config import Config
 from pytctracer.config.constants import LevelType
+from pytctracer.io.index import (
+    build_trace_segment_index,
+    write_trace_segment_index,
+    get_trace_segment_index_path,
+)
+
+# Selects every level of traceability for the commands that run several levels
+ALL_LEVELS = "all"
 
 
 @click.group(
@@ -36,17 +45,28 @@ def cli():
 )
 @click.option(
     "--level",
-    type=click.Choice([LevelType.FUNCTION, LevelType.CLASS]),
-    default=LevelType.FUNCTION,
-    help="""What level of traceability to produce links for (function or class). 
-    If omitted, links are produced at the function level by default.""",
+    type=click.Choice([LevelType.FUNCTION, LevelType.CLASS, ALL_LEVELS]),
+    multiple=True,
+    default=[LevelType.FUNCTION],
+    help="""What level of traceability to produce links for (function, class or
+    all). Can be multiple of this flag, in which case the trace log is parsed once
+    and links are produced at each level. If omitted, links are produced at the
+    function level by default.""",
 )
 @click.option(
     "--add-combined",
     is_flag=True,
     default=False,
     help="""Produce an additional set of links using a combined scoring 
-    technique of the selected techniques (simple average).""",
+    technique of the selected techniques (weighted average).""",
+)
+@click.option(
+    "--combined-weight",
+    multiple=True,
+    metavar="TECHNIQUE=WEIGHT",
+    help="""Weight a technique in the combined scoring technique, given as the
+    technique's name and its weight (can be multiple of this flag). If omitted,
+    the selected techniques are weighted equally by default.""",
 )
 @click.option(
     "--output-directory",
@@ -55,22 +75,94 @@ def cli():
     Each technique's links will be written to a separate JSON file. If omitted,
     the links are printed to standard output only.""",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="""Bypass the parsed trace cache. The trace log is parsed from scratch,
+    and no cache file is read or written.""",
+)
+@click.option(
+    "--clear-cache",
+    is_flag=True,
+    default=False,
+    help="""Remove any existing parsed trace cache for the trace log before
+    running.""",
+)
+@click.option(
+    "--cache-directory",
+    type=click.Path(exists=True, file_okay=False),
+    help="""Directory to store the parsed trace cache in. If omitted, the cache
+    is stored next to the trace log.""",
+)
+@click.option(
+    "--parse-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to read and parse the trace log with. The trace
+    log is split into chunks on test boundaries, which are parsed in parallel.
+    If omitted, the trace log is parsed in a single process by default.""",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to run the traceability techniques with. Each
+    technique is run in one of the processes, in parallel with the others. If
+    omitted, the techniques are run one after another in a single process by
+    default.""",
+)
+@click.option(
+    "--test-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to score the tests of each traceability
+    technique with. The tests are split into shards, which are scored in
+    parallel. If omitted, the tests of each technique are scored in a single
+    process by default.""",
+)
+@click.option(
+    "--top-k",
+    type=click.IntRange(min=1),
+    help="""Maximum number of links to produce for each test, keeping the
+    highest scoring links. If omitted, every predicted link is produced.""",
+)
 def produce_links(
     trace_csv_log_path: str,
     technique: Optional[Tuple[str]],
-    level: str,
+    level: Tuple[str],
     add_combined: bool,
+    combined_weight: Tuple[str],
     output_directory: Optional[str],
+    no_cache: bool,
+    clear_cache: bool,
+    cache_directory: Optional[str],
+    parse_jobs: int,
+    jobs: int,
+    test_jobs: int,
+    top_k: Optional[int],
 ):
     try:
-        analyser = Analyser()
+        analyser = Analyser(
+            use_parsed_trace_cache=not no_cache,
+            cache_directory=cache_directory,
+            parse_jobs=parse_jobs,
+            jobs=jobs,
+            test_jobs=test_jobs,
+        )
+        if clear_cache:
+            analyser.clear_parsed_trace_cache(trace_csv_log_path)
         chosen_technique_names = list(technique)
         analyser.produce_traceability_links_for_trace(
             trace_csv_log_path=trace_csv_log_path,
-            traceability_level=level,
+            traceability_level=_list_levels(level),
             add_combined_technique=add_combined,
+            combined_technique_weights=_parse_combined_weights(
+                combined_weight, add_combined
+            ),
             chosen_technique_names=chosen_technique_names,
             prediction_output_directory_path=output_directory,
+            top_k=top_k,
         )
     except Exception as e:
         raise click.ClickException(str(e))
@@ -89,10 +181,16 @@ def produce_links(
     show for each test artefact, which code artefacts were classified as true positives,
     false positives, and false negatives. The evaluation metrics will be reported for
     each set of links, and is saveable to a CSV file.
+
+    To evaluate several levels of traceability at once, give a ground truth
+    for each level, in the same order as the levels (function then class for
+    all levels).
     """,
 )
 @click.argument("trace-csv-log-path", type=click.Path(exists=True))
-@click.argument("ground-truth-path", type=click.Path(exists=True))
+@click.argument(
+    "ground-truth-path", type=click.Path(exists=True), nargs=-1, required=True
+)
 @click.option(
     "--technique",
     type=click.Choice(Config.SELECTABLE_TECHNIQUE_NAMES),
@@ -109,17 +207,29 @@ def produce_links(
 )
 @click.option(
     "--level",
-    type=click.Choice([LevelType.FUNCTION, LevelType.CLASS]),
-    default=LevelType.FUNCTION,
-    help="""What level of traceability to produce links for (function or class).
-    If omitted, links are produced at the function level by default.""",
+    type=click.Choice([LevelType.FUNCTION, LevelType.CLASS, ALL_LEVELS]),
+    multiple=True,
+    default=[LevelType.FUNCTION],
+    help="""What level of traceability to produce links for (function, class or
+    all). Can be multiple of this flag, in which case the trace log is parsed once
+    and links are evaluated at each level, and the metrics CSV of each level has
+    the level added to its file name. If omitted, links are produced at the
+    function level by default.""",
 )
 @click.option(
     "--add-combined",
     is_flag=True,
     default=False,
     help="""Produce an additional set of links using a combined scoring 
-              technique of the selected techniques (simple average).""",
+              technique of the selected techniques (weighted average).""",
+)
+@click.option(
+    "--combined-weight",
+    multiple=True,
+    metavar="TECHNIQUE=WEIGHT",
+    help="""Weight a technique in the combined scoring technique, given as the
+    technique's name and its weight (can be multiple of this flag). If omitted,
+    the selected techniques are weighted equally by default.""",
 )
 @click.option(
     "--as-percentage",
@@ -146,27 +256,91 @@ def produce_links(
     type=click.Path(exists=False),
     help="""Path to write the CSV containing the evaluation metric results to.""",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="""Bypass the parsed trace cache. The trace log is parsed from scratch,
+    and no cache file is read or written.""",
+)
+@click.option(
+    "--clear-cache",
+    is_flag=True,
+    default=False,
+    help="""Remove any existing parsed trace cache for the trace log before
+    running.""",
+)
+@click.option(
+    "--cache-directory",
+    type=click.Path(exists=True, file_okay=False),
+    help="""Directory to store the parsed trace cache in. If omitted, the cache
+    is stored next to the trace log.""",
+)
+@click.option(
+    "--parse-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to read and parse the trace log with. The trace
+    log is split into chunks on test boundaries, which are parsed in parallel.
+    If omitted, the trace log is parsed in a single process by default.""",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to run the traceability techniques with. Each
+    technique is run in one of the processes, in parallel with the others. If
+    omitted, the techniques are run one after another in a single process by
+    default.""",
+)
+@click.option(
+    "--test-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to score the tests of each traceability
+    technique with. The tests are split into shards, which are scored in
+    parallel. If omitted, the tests of each technique are scored in a single
+    process by default.""",
+)
 def evaluate_links(
     trace_csv_log_path: str,
-    ground_truth_path: str,
+    ground_truth_path: Tuple[str],
     technique: Optional[Tuple[str]],
     metric: Optional[Tuple[str]],
-    level: str,
+    level: Tuple[str],
     add_combined: bool,
+    combined_weight: Tuple[str],
     as_percentage: bool,
     classifications_output_directory: Optional[str],
     display_classifications: bool,
     metrics_output_path: Optional[str],
+    no_cache: bool,
+    clear_cache: bool,
+    cache_directory: Optional[str],
+    parse_jobs: int,
+    jobs: int,
+    test_jobs: int,
 ):
     try:
-        analyser = Analyser()
+        analyser = Analyser(
+            use_parsed_trace_cache=not no_cache,
+            cache_directory=cache_directory,
+            parse_jobs=parse_jobs,
+            jobs=jobs,
+            test_jobs=test_jobs,
+        )
+        if clear_cache:
+            analyser.clear_parsed_trace_cache(trace_csv_log_path)
         chosen_technique_names = list(technique)
         chosen_metric_names = list(metric)
         analyser.evaluate_traceability_links_for_trace(
             trace_csv_log_path=trace_csv_log_path,
-            ground_truth_path=ground_truth_path,
-            traceability_level=level,
+            ground_truth_path=list(ground_truth_path),
+            traceability_level=_list_levels(level),
             add_combined_technique=add_combined,
+            combined_technique_weights=_parse_combined_weights(
+                combined_weight, add_combined
+            ),
             metric_as_percentage=as_percentage,
             chosen_technique_names=chosen_technique_names,
             chosen_metric_names=chosen_metric_names,
@@ -178,6 +352,318 @@ def evaluate_links(
         raise click.ClickException(str(e))
 
 
+@cli.command(
+    "sweep-thresholds",
+    short_help="Evaluate links at many thresholds against a ground truth.",
+    help="""Score test-to-code traceability links once for a given trace log CSV
+    file, and evaluate the links predicted at each of many thresholds against
+    ground truth links, using the traceability techniques that use a threshold.
+
+    The CSV should be in the exact format generated from using the PytestTracer
+    class. For each technique, the precision, recall, F1 score and MAP at each
+    threshold will be reported, along with the threshold with the best F1 score.
+    The results are saveable to a CSV file.""",
+)
+@click.argument("trace-csv-log-path", type=click.Path(exists=True))
+@click.argument("ground-truth-path", type=click.Path(exists=True))
+@click.option(
+    "--technique",
+    type=click.Choice(Config.SELECTABLE_TECHNIQUE_NAMES),
+    multiple=True,
+    help="""Use a specified technique (can be multiple of this flag). Techniques
+    that don't use a threshold are skipped. If omitted, all selectable techniques
+    that use a threshold are used by default.""",
+)
+@click.option(
+    "--level",
+    type=click.Choice([LevelType.FUNCTION, LevelType.CLASS]),
+    default=LevelType.FUNCTION,
+    help="""What level of traceability to produce links for (function or class).
+    If omitted, links are produced at the function level by default.""",
+)
+@click.option(
+    "--add-combined",
+    is_flag=True,
+    default=False,
+    help="""Also sweep the thresholds of a combined scoring technique of the
+              selected techniques (weighted average).""",
+)
+@click.option(
+    "--combined-weight",
+    multiple=True,
+    metavar="TECHNIQUE=WEIGHT",
+    help="""Weight a technique in the combined scoring technique, given as the
+    technique's name and its weight (can be multiple of this flag). If omitted,
+    the selected techniques are weighted equally by default.""",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0, min_open=True),
+    multiple=True,
+    help="""Evaluate a specified threshold (can be multiple of this flag). If
+    omitted, and no threshold step is given, every distinct score of each
+    technique is evaluated by default.""",
+)
+@click.option(
+    "--threshold-step",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    help="""Evaluate a grid of thresholds from the step up to 1, in increments
+    of the step.""",
+)
+@click.option(
+    "--as-percentage",
+    is_flag=True,
+    default=False,
+    help="""Report continous metrics as percentages. If omitted,
+              metrics are reported as raw values by default.""",
+)
+@click.option(
+    "--sweep-output-path",
+    type=click.Path(exists=False),
+    help="""Path to write the CSV containing the threshold sweep results to.""",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="""Bypass the parsed trace cache. The trace log is parsed from scratch,
+    and no cache file is read or written.""",
+)
+@click.option(
+    "--clear-cache",
+    is_flag=True,
+    default=False,
+    help="""Remove any existing parsed trace cache for the trace log before
+    running.""",
+)
+@click.option(
+    "--cache-directory",
+    type=click.Path(exists=True, file_okay=False),
+    help="""Directory to store the parsed trace cache in. If omitted, the cache
+    is stored next to the trace log.""",
+)
+@click.option(
+    "--parse-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to read and parse the trace log with. The trace
+    log is split into chunks on test boundaries, which are parsed in parallel.
+    If omitted, the trace log is parsed in a single process by default.""",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to run the traceability techniques with. Each
+    technique is run in one of the processes, in parallel with the others. If
+    omitted, the techniques are run one after another in a single process by
+    default.""",
+)
+@click.option(
+    "--test-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to score the tests of each traceability
+    technique with. The tests are split into shards, which are scored in
+    parallel. If omitted, the tests of each technique are scored in a single
+    process by default.""",
+)
+def sweep_thresholds(
+    trace_csv_log_path: str,
+    ground_truth_path: str,
+    technique: Optional[Tuple[str]],
+    level: str,
+    add_combined: bool,
+    combined_weight: Tuple[str],
+    threshold: Optional[Tuple[float]],
+    threshold_step: Optional[float],
+    as_percentage: bool,
+    sweep_output_path: Optional[str],
+    no_cache: bool,
+    clear_cache: bool,
+    cache_directory: Optional[str],
+    parse_jobs: int,
+    jobs: int,
+    test_jobs: int,
+):
+    try:
+        analyser = Analyser(
+            use_parsed_trace_cache=not no_cache,
+            cache_directory=cache_directory,
+            parse_jobs=parse_jobs,
+            jobs=jobs,
+            test_jobs=test_jobs,
+        )
+        if clear_cache:
+            analyser.clear_parsed_trace_cache(trace_csv_log_path)
+        analyser.sweep_traceability_thresholds_for_trace(
+            trace_csv_log_path=trace_csv_log_path,
+            ground_truth_path=ground_truth_path,
+            traceability_level=level,
+            add_combined_technique=add_combined,
+            combined_technique_weights=_parse_combined_weights(
+                combined_weight, add_combined
+            ),
+            chosen_technique_names=list(technique),
+            thresholds=_create_thresholds(threshold, threshold_step),
+            sweep_output_path=sweep_output_path,
+            metric_as_percentage=as_percentage,
+        )
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
+@cli.command(
+    "grid-search",
+    short_help="Search discount factors, normalisation and thresholds.",
+    help="""Produce the raw scores of test-to-code traceability links once for a
+    given trace log CSV file, without call depth discounting or normalisation, and
+    evaluate every configuration of discount factor, normalisation and threshold
+    against ground truth links, using the traceability techniques that use a
+    threshold.
+
+    The CSV should be in the exact format generated from using the PytestTracer
+    class. For each technique and configuration of discount factor and
+    normalisation, the metrics at the threshold with the best F1 score will be
+    reported. The metrics at every threshold are saveable to a CSV file.""",
+)
+@click.argument("trace-csv-log-path", type=click.Path(exists=True))
+@click.argument("ground-truth-path", type=click.Path(exists=True))
+@click.option(
+    "--technique",
+    type=click.Choice(Config.SELECTABLE_TECHNIQUE_NAMES),
+    multiple=True,
+    help="""Use a specified technique (can be multiple of this flag). Techniques
+    that don't use a threshold are skipped. If omitted, all selectable techniques
+    that use a threshold are used by default.""",
+)
+@click.option(
+    "--level",
+    type=click.Choice([LevelType.FUNCTION, LevelType.CLASS]),
+    default=LevelType.FUNCTION,
+    help="""What level of traceability to produce links for (function or class).
+    If omitted, links are produced at the function level by default.""",
+)
+@click.option(
+    "--discount-factor",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    multiple=True,
+    help="""Evaluate a specified call depth discount factor (can be multiple of
+    this flag), where a discount factor of 1 is no discounting. If omitted, the
+    discount factors 0.25, 0.5, 0.75 and 1 are evaluated by default.""",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0, min_open=True),
+    multiple=True,
+    help="""Evaluate a specified threshold (can be multiple of this flag). If
+    omitted, and no threshold step is given, every distinct score of each
+    configuration is evaluated by default.""",
+)
+@click.option(
+    "--threshold-step",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    help="""Evaluate a grid of thresholds from the step up to 1, in increments
+    of the step.""",
+)
+@click.option(
+    "--as-percentage",
+    is_flag=True,
+    default=False,
+    help="""Report continous metrics as percentages. If omitted,
+              metrics are reported as raw values by default.""",
+)
+@click.option(
+    "--grid-output-path",
+    type=click.Path(exists=False),
+    help="""Path to write the CSV containing the grid search results to.""",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="""Bypass the parsed trace cache. The trace log is parsed from scratch,
+    and no cache file is read or written.""",
+)
+@click.option(
+    "--clear-cache",
+    is_flag=True,
+    default=False,
+    help="""Remove any existing parsed trace cache for the trace log before
+    running.""",
+)
+@click.option(
+    "--cache-directory",
+    type=click.Path(exists=True, file_okay=False),
+    help="""Directory to store the parsed trace cache in. If omitted, the cache
+    is stored next to the trace log.""",
+)
+@click.option(
+    "--parse-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to read and parse the trace log with. The trace
+    log is split into chunks on test boundaries, which are parsed in parallel.
+    If omitted, the trace log is parsed in a single process by default.""",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to run the traceability techniques, and then to
+    evaluate the configurations, with. If omitted, everything is run in a single
+    process by default.""",
+)
+@click.option(
+    "--test-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="""Number of processes to score the tests of each traceability
+    technique with. The tests are split into shards, which are scored in
+    parallel. If omitted, the tests of each technique are scored in a single
+    process by default.""",
+)
+def grid_search(
+    trace_csv_log_path: str,
+    ground_truth_path: str,
+    technique: Optional[Tuple[str]],
+    level: str,
+    discount_factor: Optional[Tuple[float]],
+    threshold: Optional[Tuple[float]],
+    threshold_step: Optional[float],
+    as_percentage: bool,
+    grid_output_path: Optional[str],
+    no_cache: bool,
+    clear_cache: bool,
+    cache_directory: Optional[str],
+    parse_jobs: int,
+    jobs: int,
+    test_jobs: int,
+):
+    try:
+        analyser = Analyser(
+            use_parsed_trace_cache=not no_cache,
+            cache_directory=cache_directory,
+            parse_jobs=parse_jobs,
+            jobs=jobs,
+            test_jobs=test_jobs,
+        )
+        if clear_cache:
+            analyser.clear_parsed_trace_cache(trace_csv_log_path)
+        analyser.grid_search_traceability_for_trace(
+            trace_csv_log_path=trace_csv_log_path,
+            ground_truth_path=ground_truth_path,
+            traceability_level=level,
+            chosen_technique_names=list(technique),
+            discount_factors=list(discount_factor),
+            thresholds=_create_thresholds(threshold, threshold_step),
+            grid_output_path=grid_output_path,
+            metric_as_percentage=as_percentage,
+        )
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
 @cli.command(
     "compare-links",
     short_help="Compare a set of links against a ground truth.",
@@ -243,5 +729,86 @@ def compare_links(
         raise click.ClickException(str(e))
 
 
+@cli.command(
+    "index-trace",
+    short_help="Build a test segment index for a given trace.",
+    help="""Build a test segment index for a given trace log CSV file.
+
+    The index maps the fully qualified name of each test to the byte offsets and
+    row numbers of its segments in the trace log, and is written next to the trace
+    log. The index allows the segments of individual tests to be read without
+    scanning the whole trace log, and is used to split the trace log when parsing
+    in parallel.""",
+)
+@click.argument("trace-csv-log-path", type=click.Path(exists=True))
+def index_trace(trace_csv_log_path: str):
+    try:
+        trace_segment_index = build_trace_segment_index(trace_csv_log_path)
+        write_trace_segment_index(trace_csv_log_path, trace_segment_index)
+        click.echo(
+            f"Test segment index written to: {get_trace_segment_index_path(trace_csv_log_path)}"
+        )
+    except Exception as e:
+        raise click.ClickException(str(e))
+
+
+def _create_thresholds(
+    thresholds: Tuple[float], threshold_step: Optional[float]
+) -> Optional[List[float]]:
+    # The grid runs from the step up to 1, with the steps rounded so that
+    # thresholds such as 0.3 aren't evaluated as 0.30000000000000004
+    thresholds = list(thresholds)
+    if threshold_step:
+        number_of_steps = int(round(1 / threshold_step, 9))
+        thresholds.extend(
+            round(threshold_step * step, 9) for step in range(1, number_of_steps + 1)
+        )
+
+    return thresholds or None
+
+
+def _parse_combined_weights(
+    combined_weights: Tuple[str], add_combined: bool
+) -> Optional[Dict[str, float]]:
+    # Each weight is given as the arg name of a technique and its weight
+    if combined_weights and not add_combined:
+        raise click.BadParameter(
+            "Weights are only used with '--add-combined'.",
+            param_hint="'--combined-weight'",
+        )
+    weights = {}
+    for combined_weight in combined_weights:
+        technique_arg_name, _, weight = combined_weight.partition("=")
+        if technique_arg_name not in Config.SELECTABLE_TECHNIQUE_NAMES:
+            raise click.BadParameter(
+                f"Unknown technique '{technique_arg_name}' in '{combined_weight}'.",
+                param_hint="'--combined-weight'",
+            )
+        try:
+            technique_weight = float(weight)
+        except ValueError as err:
+            raise click.BadParameter(
+                f"Invalid weight '{weight}' in '{combined_weight}'.",
+                param_hint="'--combined-weight'",
+            ) from err
+        if not math.isfinite(technique_weight) or technique_weight < 0:
+            raise click.BadParameter(
+                f"Weight '{weight}' in '{combined_weight}' must be a finite number "
+                "that isn't negative.",
+                param_hint="'--combined-weight'",
+            )
+        weights[technique_arg_name] = technique_weight
+
+    return weights or None
+
+
+def _list_levels(level: Tuple[str]) -> List[LevelType]:
+    # All levels are run in the order they are declared, function then class
+    if ALL_LEVELS in level:
+        return list(LevelType)
+
+    return [LevelType(traceability_level) for traceability_level in level]
+
+
 if __name__ == "__main__":
     cli()
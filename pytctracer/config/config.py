@@ -46,6 +46,9 @@ class Config:
         "fn",
     ]
     EVALUATION_METRICS_TITLE = "Evaluation Metrics"
+    THRESHOLD_SWEEP_TITLE = "Threshold Sweep"
+    GRID_SEARCH_TITLE = "Grid Search"
+    DEFAULT_GRID_SEARCH_DISCOUNT_FACTORS = [0.25, 0.5, 0.75, 1.0]
     DEFAULT_THRESHOLDS = {
         "lcsu": 0.75,
         "lcsb": 0.55,
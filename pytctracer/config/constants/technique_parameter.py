@@ -9,6 +9,7 @@ class TechniqueParameter(StrEnum):
     FUNCTIONS_CALLED_BY_TEST_COUNT = "functions_called_by_test_count"
     FUNCTIONS_CALLED_BY_TEST_DEPTH = "functions_called_by_test_depth"
     FUNCTIONS_CALLED_BY_TEST_BEFORE_ASSERT = "functions_called_by_test_before_assert"
+    NAME_VOCABULARY = "name_vocabulary"
 
 
 __all__ = ["TechniqueParameter"]
@@ -1,4 +1,18 @@
 from .classify_predictions import classify_predictions
 from .evaluate_predictions import evaluate_predictions
+from .sweep_thresholds import (
+    sweep_thresholds,
+    sweep_thresholds_of_ranked_pairs,
+    find_best_threshold,
+)
+from .grid_search import RawScoreTable, search_grid
 
-__all__ = ["classify_predictions", "evaluate_predictions"]
+__all__ = [
+    "classify_predictions",
+    "evaluate_predictions",
+    "sweep_thresholds",
+    "sweep_thresholds_of_ranked_pairs",
+    "find_best_threshold",
+    "RawScoreTable",
+    "search_grid",
+]
@@ -0,0 +1,256 @@
+from itertools import product
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from pytctracer.parallel import map_in_worker_pool
+from pytctracer.evaluation.sweep_thresholds import sweep_thresholds_of_ranked_pairs
+
+# The keys of the state shared by the configurations evaluated in each worker
+RAW_SCORE_TABLES = "raw_score_tables"
+THRESHOLDS = "thresholds"
+METRIC_AS_PERCENTAGE = "metric_as_percentage"
+
+
+class RawScoreTable:
+    """
+    Table of the raw scores of a traceability technique for the tests in a
+    ground truth, before any call depth discounting or normalisation. The scored
+    pairs are stored test by test, in the order the technique scored them, along
+    with the call depth of each pair and whether it is a ground truth link, so
+    that the scores can be discounted, normalised and evaluated for many
+    configurations without running the technique again.
+
+    Attributes:
+        scores (np.ndarray): The raw score of each pair.
+        depth_exponents (np.ndarray): The power to raise the discount factor to for
+        each pair, which is one less than the call depth of the function, or zero if
+        the call depth wasn't recorded.
+        is_true_link (np.ndarray): Whether each pair is a ground truth link, as a one
+        or a zero.
+        test_positions (np.ndarray): The position of the test of each pair in the
+        ground truth.
+        test_starts (np.ndarray): The position of the first pair of each test in the
+        ground truth, followed by the number of pairs.
+        number_of_ground_truth_links (np.ndarray): The number of ground truth links of
+        each test in the ground truth.
+    """
+
+    def __init__(
+        self,
+        raw_scores: Dict[str, Dict[str, float]],
+        ground_truth_links: Dict[str, List[str]],
+        functions_called_by_test_depth: Dict[str, Dict[str, int]],
+    ) -> None:
+        """
+        Table of the raw scores of a traceability technique for the tests in a
+        ground truth.
+
+        Args:
+            raw_scores (Dict[str, Dict[str, float]]): The raw traceability scores of the
+            technique for each test and source code pair.
+            ground_truth_links (Dict[str, List[str]]): A dictionary where the keys are
+            the fully qualified names of the unit tests, and the values are lists
+            of fully qualified names of the functions that are actually linked
+            to the unit test.
+            functions_called_by_test_depth (Dict[str, Dict[str, int]]): A dictionary
+            where the keys are the fully qualified names of the test or test classes,
+            and the values are dictionaries containing the fully qualified names of
+            each function or function class invoked and the depth of the call.
+        """
+        scores = []
+        depth_exponents = []
+        is_true_link = []
+        test_starts = []
+        number_of_ground_truth_links = []
+        for (
+            fully_qualified_test_name,
+            ground_truth_links_for_test,
+        ) in ground_truth_links.items():
+            ground_truth_links_for_test = set(ground_truth_links_for_test)
+            depths_for_test = functions_called_by_test_depth.get(
+                fully_qualified_test_name, {}
+            )
+            test_starts.append(len(scores))
+            number_of_ground_truth_links.append(len(ground_truth_links_for_test))
+            for fully_qualified_function_name, score in raw_scores[
+                fully_qualified_test_name
+            ].items():
+                depth = depths_for_test.get(fully_qualified_function_name)
+                scores.append(score)
+                depth_exponents.append(depth - 1 if depth is not None else 0)
+                is_true_link.append(
+                    fully_qualified_function_name in ground_truth_links_for_test
+                )
+        test_starts.append(len(scores))
+
+        self.scores = np.array(scores, dtype=np.float64)
+        self.depth_exponents = np.array(depth_exponents, dtype=np.float64)
+        self.is_true_link = np.array(is_true_link, dtype=np.int64)
+        self.test_starts = np.array(test_starts, dtype=np.int64)
+        self.test_positions = np.repeat(
+            np.arange(len(ground_truth_links)), np.diff(self.test_starts)
+        )
+        self.number_of_ground_truth_links = np.array(
+            number_of_ground_truth_links, dtype=np.int64
+        )
+
+    def apply_configuration(
+        self, discount_factor: float, normalise: bool
+    ) -> np.ndarray:
+        """
+        Discount and normalise the raw scores in the same way as a traceability
+        technique, as operations over every pair at once.
+
+        Args:
+            discount_factor (float): The factor to discount scores by for each level of
+            call depth. A discount factor of one leaves the scores undiscounted.
+            normalise (bool): Whether to divide the scores of each test by its maximum
+            score.
+
+        Returns:
+            np.ndarray: The score of each pair.
+        """
+        scores = self.scores * np.power(discount_factor, self.depth_exponents)
+        if normalise and len(scores) > 0:
+            pair_counts = np.diff(self.test_starts)
+            non_empty_tests = pair_counts > 0
+            max_scores = np.zeros(len(pair_counts), dtype=np.float64)
+            max_scores[non_empty_tests] = np.maximum.reduceat(
+                scores, self.test_starts[:-1][non_empty_tests]
+            )
+            max_scores = np.maximum(max_scores, 0)
+            scores /= np.repeat(np.where(max_scores > 0, max_scores, 1), pair_counts)
+
+        return scores
+
+    def sweep_thresholds(
+        self,
+        scores: np.ndarray,
+        thresholds: Optional[List[float]] = None,
+        metric_as_percentage: bool = False,
+    ) -> Dict[float, Dict[str, float]]:
+        """
+        Evaluate the links predicted from a configuration of the scores at many
+        thresholds at once. The pairs of each test are ranked by descending score,
+        keeping tied pairs in the order they were scored as the predicted links do,
+        with a single sort over every pair.
+
+        Args:
+            scores (np.ndarray): The score of each pair, from apply_configuration.
+            thresholds (Optional[List[float]], optional): The thresholds to evaluate,
+            which must be greater than zero. If None, every distinct score greater than
+            zero is evaluated. Defaults to None.
+            metric_as_percentage (bool, optional): Whether to report continous metrics
+            as percentages. Defaults to False.
+
+        Returns:
+            Dict[float, Dict[str, float]]: A dictionary where the keys are the thresholds
+            in ascending order, and the values are dictionaries where the keys are the
+            argument names of the metrics, and the values are the scores for the metrics.
+        """
+        # Pairs that can't be predicted are ranked after every pair that can, so
+        # they don't change the rank of any predicted pair
+        ranking_scores = np.where(scores > 0, scores, 0)
+        order = np.lexsort((-ranking_scores, self.test_positions))
+        ranked_is_true_link = self.is_true_link[order]
+        ranked_test_positions = self.test_positions[order]
+        test_starts = self.test_starts[:-1][ranked_test_positions]
+        ranks = np.arange(1, len(order) + 1) - test_starts
+
+        cumulative_true_links = np.cumsum(ranked_is_true_link)
+        true_links_before_test = np.concatenate(([0], cumulative_true_links))[
+            test_starts
+        ]
+        count_true_links = cumulative_true_links - true_links_before_test
+        ground_truth_sizes = self.number_of_ground_truth_links[ranked_test_positions]
+        average_precisions = np.divide(
+            ranked_is_true_link * (count_true_links / ranks),
+            ground_truth_sizes,
+            out=np.zeros(len(order), dtype=np.float64),
+            where=ground_truth_sizes > 0,
+        )
+
+        return sweep_thresholds_of_ranked_pairs(
+            pair_scores=scores[order],
+            pair_is_true_link=ranked_is_true_link,
+            pair_average_precisions=average_precisions,
+            number_of_ground_truth_links=int(self.number_of_ground_truth_links.sum()),
+            number_of_tests=len(self.number_of_ground_truth_links),
+            thresholds=thresholds,
+            metric_as_percentage=metric_as_percentage,
+        )
+
+
+def search_grid(
+    raw_score_tables: Dict[str, RawScoreTable],
+    discount_factors: List[float],
+    normalise_options: List[bool],
+    thresholds: Optional[List[float]] = None,
+    metric_as_percentage: bool = False,
+    jobs: int = 1,
+) -> Dict[str, Dict[Tuple[float, bool], Dict[float, Dict[str, float]]]]:
+    """
+    Evaluate every configuration of discount factor, normalisation and threshold
+    for the raw scores of each technique. Each configuration of discount factor
+    and normalisation is applied to the raw scores, and its thresholds are swept
+    in a single pass. The configurations can be evaluated in parallel.
+
+    Args:
+        raw_score_tables (Dict[str, RawScoreTable]): A dictionary where the keys are the
+            names of the techniques, and the values are the tables of their raw scores.
+        discount_factors (List[float]): The discount factors to evaluate, where a discount
+            factor of one is no call depth discounting.
+        normalise_options (List[bool]): Whether to evaluate with normalisation, without
+            normalisation, or both.
+        thresholds (Optional[List[float]], optional): The thresholds to evaluate. If None,
+            every distinct score of each configuration is evaluated. Defaults to None.
+        metric_as_percentage (bool, optional): Whether to report continous metrics as
+            percentages. Defaults to False.
+        jobs (int, optional): The number of processes to evaluate the configurations with.
+            Defaults to 1.
+
+    Returns:
+        Dict[str, Dict[Tuple[float, bool], Dict[float, Dict[str, float]]]]: A
+            dictionary where the keys are the names of the techniques, and the values are
+            dictionaries where the keys are the (discount factor, normalise) configurations,
+            and the values are the threshold sweep results of the configuration.
+    """
+    configurations = list(
+        product(raw_score_tables, discount_factors, normalise_options)
+    )
+    # The raw score tables are handed to each worker once, and only the
+    # configuration is sent with each task
+    sweep_results = map_in_worker_pool(
+        _evaluate_configuration,
+        configurations,
+        jobs,
+        {
+            RAW_SCORE_TABLES: raw_score_tables,
+            THRESHOLDS: thresholds,
+            METRIC_AS_PERCENTAGE: metric_as_percentage,
+        },
+    )
+
+    grid_results = {technique: {} for technique in raw_score_tables}
+    for (technique, discount_factor, normalise), sweep_results_for_configuration in zip(
+        configurations, sweep_results
+    ):
+        grid_results[technique][
+            (discount_factor, normalise)
+        ] = sweep_results_for_configuration
+
+    return grid_results
+
+
+def _evaluate_configuration(
+    configuration: Tuple[str, float, bool], worker_state: Dict[str, Any]
+) -> Dict[float, Dict[str, float]]:
+    technique, discount_factor, normalise = configuration
+    raw_score_table = worker_state[RAW_SCORE_TABLES][technique]
+    scores = raw_score_table.apply_configuration(discount_factor, normalise)
+
+    return raw_score_table.sweep_thresholds(
+        scores, worker_state[THRESHOLDS], worker_state[METRIC_AS_PERCENTAGE]
+    )
+
+
+__all__ = ["RawScoreTable", "search_grid"]
@@ -2,6 +2,7 @@ from typing import Dict, List, Optional
 from sklearn.metrics import precision_recall_curve, auc
 from pytctracer.config.constants import MetricScoreType
 from pytctracer.evaluation.metrics.metric import Metric
+from pytctracer.techniques.traceability_scores import TraceabilityScores
 
 
 class AreaUnderCurve(Metric):
@@ -42,6 +43,7 @@ class AreaUnderCurve(Metric):
         """
         ground_truth_labels = []
         predicted_labels = []
+        sample_weights = []
 
         for full_qualified_test_name in ground_truth_links:
             ground_truth_links_for_test = set(
@@ -60,9 +62,25 @@ class AreaUnderCurve(Metric):
                         fully_qualified_function_name
                     ]
                 )
+                sample_weights.append(1)
+
+            if (
+                isinstance(traceability_score_dict, TraceabilityScores)
+                and full_qualified_test_name in traceability_score_dict
+            ):
+                # Add the unscored functions of a sparse score store, which have
+                # a score of zero, as a single weighted sample for each label
+                unscored_counts = traceability_score_dict.count_unscored_functions(
+                    full_qualified_test_name, ground_truth_links_for_test
+                )
+                for label, unscored_count in zip((1, 0), unscored_counts):
+                    if unscored_count > 0:
+                        ground_truth_labels.append(label)
+                        predicted_labels.append(0)
+                        sample_weights.append(unscored_count)
 
         precision, recall, _ = precision_recall_curve(
-            ground_truth_labels, predicted_labels
+            ground_truth_labels, predicted_labels, sample_weight=sample_weights
         )
 
         auc_score = auc(recall, precision)
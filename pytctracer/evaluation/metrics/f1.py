@@ -39,6 +39,21 @@ class F1(Metric):
         precision = Precision().calculate(predicted_links, ground_truth_links, _)
         recall = Recall().calculate(predicted_links, ground_truth_links, _)
 
+        return self.calculate_from_precision_and_recall(precision, recall)
+
+    def calculate_from_precision_and_recall(
+        self, precision: float, recall: float
+    ) -> float:
+        """
+        Calculate the F1 metric score given the Precision and Recall metric scores.
+
+        Args:
+            precision (float): The Precision metric score.
+            recall (float): The Recall metric score.
+
+        Returns:
+            float: The F1 metric score.
+        """
         f1 = 0
         if precision + recall > 0:
             f1 = (2 * precision * recall) / (precision + recall)
@@ -57,10 +57,28 @@ class MeanAveragePrecision(Metric):
             ap = sum_precisions / len(ground_truth_links_for_test)
             total_ap += ap
 
-        # Calculate MAP
-        map_score = total_ap / len(ground_truth_links)
+        return self.calculate_from_total_average_precision(
+            total_ap, len(ground_truth_links)
+        )
 
-        return map_score
+    def calculate_from_total_average_precision(
+        self, total_average_precision: float, number_of_tests: int
+    ) -> float:
+        """
+        Calculate the Mean Average Precision (mAP) metric score given the sum of
+        the average precisions of the tests.
+
+        Args:
+            total_average_precision (float): The sum of the average precision of each
+                test, where the average precision of a test is the sum of the precisions
+                at the ranks of its predicted ground truth links, divided by its number
+                of ground truth links.
+            number_of_tests (int): The number of tests in the ground truth.
+
+        Returns:
+            float: The Mean Average Precision (mAP) metric score.
+        """
+        return total_average_precision / number_of_tests
 
 
 __all__ = ["MeanAveragePrecision"]
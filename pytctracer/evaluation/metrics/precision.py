@@ -43,6 +43,20 @@ class Precision(Metric):
             predicted_links, ground_truth_links, _
         )
 
+        return self.calculate_from_counts(true_positives, false_positives)
+
+    def calculate_from_counts(self, true_positives: int, false_positives: int) -> float:
+        """
+        Calculate the Precision metric score given the number of true positives
+        and false positives.
+
+        Args:
+            true_positives (int): The number of predicted links that are ground truth links.
+            false_positives (int): The number of predicted links that aren't ground truth links.
+
+        Returns:
+            float: The Precision metric score.
+        """
         precision = 1
         if true_positives + false_positives > 0:
             precision = true_positives / (true_positives + false_positives)
@@ -43,6 +43,20 @@ class Recall(Metric):
             predicted_links, ground_truth_links, _
         )
 
+        return self.calculate_from_counts(true_positives, false_negatives)
+
+    def calculate_from_counts(self, true_positives: int, false_negatives: int) -> float:
+        """
+        Calculate the Recall metric score given the number of true positives
+        and false negatives.
+
+        Args:
+            true_positives (int): The number of predicted links that are ground truth links.
+            false_negatives (int): The number of ground truth links that aren't predicted.
+
+        Returns:
+            float: The Recall metric score.
+        """
         recall = 1
         if true_positives + false_negatives > 0:
             recall = true_positives / (true_positives + false_negatives)
@@ -0,0 +1,226 @@
+from typing import Dict, List, Optional
+from operator import itemgetter
+import numpy as np
+from pytctracer.evaluation.metrics import (
+    Precision,
+    Recall,
+    F1,
+    MeanAveragePrecision,
+    TruePositives,
+    FalsePositives,
+    FalseNegatives,
+)
+
+THRESHOLD_TOLERANCE = 1e-9
+
+
+def sweep_thresholds(
+    traceability_score_dict: Dict[str, Dict[str, float]],
+    ground_truth_links: Dict[str, List[str]],
+    thresholds: Optional[List[float]] = None,
+    metric_as_percentage: bool = False,
+) -> Dict[float, Dict[str, float]]:
+    """
+    Evaluate the links predicted from a set of traceability scores at many
+    thresholds at once. The scored pairs of each test in the ground truth are
+    ranked and labelled against the ground truth once, and then every pair
+    across the tests is sorted by score, so that the true positives, false
+    positives and precisions at each rank of every threshold are found in a
+    single cumulative pass. The metrics at each threshold are the same as
+    evaluating the links predicted with that threshold.
+
+    Args:
+        traceability_score_dict (Dict[str, Dict[str, float]]): A dictionary of traceability
+            scores for each test and source code pair.
+        ground_truth_links (Dict[str, List[str]]): A dictionary where the keys are
+            the fully qualified names of the unit tests, and the values are lists
+            of fully qualified names of the functions that are actually linked
+            to the unit test.
+        thresholds (Optional[List[float]], optional): The thresholds to evaluate, which must
+            be greater than zero. If None, every distinct score greater than zero of the
+            tests in the ground truth is evaluated, treating scores within 1e-9 of each other
+            as one. Defaults to None.
+        metric_as_percentage (bool, optional): Whether to report continous metrics as
+            percentages. Defaults to False.
+
+    Returns:
+        Dict[float, Dict[str, float]]: A dictionary where the keys are the thresholds in
+            ascending order, and the values are dictionaries where the keys are the argument
+            names of the metrics, and the values are the scores for the metrics.
+    """
+    pair_scores = []
+    pair_is_true_link = []
+    pair_average_precisions = []
+    number_of_ground_truth_links = 0
+    for (
+        fully_qualified_test_name,
+        ground_truth_links_for_test,
+    ) in ground_truth_links.items():
+        ground_truth_links_for_test = set(ground_truth_links_for_test)
+        number_of_ground_truth_links += len(ground_truth_links_for_test)
+        # Ranked in the same order as the predicted links, so the links predicted
+        # at any threshold are the top ranked pairs of the test
+        ranked_functions_and_score = sorted(
+            (
+                (fully_qualified_function_name, score)
+                for fully_qualified_function_name, score in traceability_score_dict[
+                    fully_qualified_test_name
+                ].items()
+                if score > 0
+            ),
+            key=itemgetter(1),
+            reverse=True,
+        )
+        count_true_links = 0
+        for i, (fully_qualified_function_name, score) in enumerate(
+            ranked_functions_and_score
+        ):
+            is_true_link = fully_qualified_function_name in ground_truth_links_for_test
+            average_precision = 0
+            if is_true_link:
+                count_true_links += 1
+                # The precision at this rank, divided as in MeanAveragePrecision,
+                # so the pairs of a test sum to its average precision
+                average_precision = (count_true_links / (i + 1)) / len(
+                    ground_truth_links_for_test
+                )
+            pair_scores.append(score)
+            pair_is_true_link.append(is_true_link)
+            pair_average_precisions.append(average_precision)
+
+    return sweep_thresholds_of_ranked_pairs(
+        pair_scores=np.array(pair_scores, dtype=np.float64),
+        pair_is_true_link=np.array(pair_is_true_link, dtype=np.int64),
+        pair_average_precisions=np.array(pair_average_precisions, dtype=np.float64),
+        number_of_ground_truth_links=number_of_ground_truth_links,
+        number_of_tests=len(ground_truth_links),
+        thresholds=thresholds,
+        metric_as_percentage=metric_as_percentage,
+    )
+
+
+def sweep_thresholds_of_ranked_pairs(
+    pair_scores: np.ndarray,
+    pair_is_true_link: np.ndarray,
+    pair_average_precisions: np.ndarray,
+    number_of_ground_truth_links: int,
+    number_of_tests: int,
+    thresholds: Optional[List[float]] = None,
+    metric_as_percentage: bool = False,
+) -> Dict[float, Dict[str, float]]:
+    """
+    Evaluate the links predicted at many thresholds from the scored pairs of the
+    tests in the ground truth, in a single cumulative pass. Each pair must have
+    been ranked among the pairs of its test in the order the links of the test
+    are predicted in, to find the precision at its rank.
+
+    Args:
+        pair_scores (np.ndarray): The score of each pair. Pairs with a score of zero
+            or less are never predicted.
+        pair_is_true_link (np.ndarray): Whether each pair is a ground truth link, as
+            a one or a zero.
+        pair_average_precisions (np.ndarray): The contribution of each pair to the
+            average precision of its test, which is the precision at the rank of the
+            pair divided by the number of ground truth links of the test if the pair
+            is a ground truth link, and zero otherwise.
+        number_of_ground_truth_links (int): The number of ground truth links of every
+            test in the ground truth.
+        number_of_tests (int): The number of tests in the ground truth.
+        thresholds (Optional[List[float]], optional): The thresholds to evaluate, which must
+            be greater than zero. If None, every distinct score greater than zero is
+            evaluated, treating scores within 1e-9 of each other as one. Defaults
+            to None.
+        metric_as_percentage (bool, optional): Whether to report continous metrics as
+            percentages. Defaults to False.
+
+    Returns:
+        Dict[float, Dict[str, float]]: A dictionary where the keys are the thresholds in
+            ascending order, and the values are dictionaries where the keys are the argument
+            names of the metrics, and the values are the scores for the metrics.
+    """
+    # Pairs are sorted by descending score, so the pairs predicted at a threshold
+    # are a prefix of the sorted pairs, and the cumulative sums up to the end of
+    # the prefix give the counts at the threshold
+    order = np.argsort(-pair_scores, kind="stable")
+    negated_sorted_scores = -pair_scores[order]
+    cumulative_true_positives = np.cumsum(pair_is_true_link[order])
+    cumulative_average_precisions = np.cumsum(pair_average_precisions[order])
+
+    if thresholds is None:
+        # Scores that only differ by floating point error, such as 0.3 and
+        # 0.30000000000000004, are evaluated as a single threshold at the lowest
+        # of them, so that every pair with one of the scores is predicted
+        distinct_scores = np.unique(pair_scores[pair_scores > 0])
+        is_new_threshold = (
+            np.diff(distinct_scores, prepend=-np.inf) > THRESHOLD_TOLERANCE
+        )
+        thresholds = distinct_scores[is_new_threshold].tolist()
+
+    precision_metric = Precision()
+    recall_metric = Recall()
+    f1_metric = F1()
+    map_metric = MeanAveragePrecision()
+    sweep_results = {}
+    for threshold in sorted(set(thresholds)):
+        number_of_predictions = int(
+            np.searchsorted(negated_sorted_scores, -threshold, side="right")
+        )
+        true_positives = 0
+        total_average_precision = 0
+        if number_of_predictions > 0:
+            true_positives = int(cumulative_true_positives[number_of_predictions - 1])
+            total_average_precision = float(
+                cumulative_average_precisions[number_of_predictions - 1]
+            )
+        false_positives = number_of_predictions - true_positives
+        false_negatives = number_of_ground_truth_links - true_positives
+
+        precision = precision_metric.calculate_from_counts(
+            true_positives, false_positives
+        )
+        recall = recall_metric.calculate_from_counts(true_positives, false_negatives)
+
+        continuous_metrics = {
+            precision_metric: precision,
+            recall_metric: recall,
+            f1_metric: f1_metric.calculate_from_precision_and_recall(precision, recall),
+            map_metric: map_metric.calculate_from_total_average_precision(
+                total_average_precision, number_of_tests
+            ),
+        }
+        sweep_results[threshold] = {
+            metric.arg_name: (
+                metric.to_percentage(score) if metric_as_percentage else score
+            )
+            for metric, score in continuous_metrics.items()
+        }
+        sweep_results[threshold][TruePositives.arg_name] = true_positives
+        sweep_results[threshold][FalsePositives.arg_name] = false_positives
+        sweep_results[threshold][FalseNegatives.arg_name] = false_negatives
+
+    return sweep_results
+
+
+def find_best_threshold(sweep_results: Dict[float, Dict[str, float]]) -> float:
+    """
+    Find the threshold with the highest F1 score in the results of a threshold
+    sweep. Ties are broken by the lowest threshold.
+
+    Args:
+        sweep_results (Dict[float, Dict[str, float]]): A dictionary where the keys are the
+            thresholds, and the values are dictionaries of the metric scores at the threshold.
+
+    Returns:
+        float: The threshold with the highest F1 score.
+    """
+    return max(
+        sorted(sweep_results),
+        key=lambda threshold: sweep_results[threshold][F1.arg_name],
+    )
+
+
+__all__ = [
+    "sweep_thresholds",
+    "sweep_thresholds_of_ranked_pairs",
+    "find_best_threshold",
+]
@@ -0,0 +1,13 @@
+from .parsed_trace_cache import (
+    get_parsed_trace_cache_path,
+    load_parsed_trace_cache,
+    write_parsed_trace_cache,
+    clear_parsed_trace_cache,
+)
+
+__all__ = [
+    "get_parsed_trace_cache_path",
+    "load_parsed_trace_cache",
+    "write_parsed_trace_cache",
+    "clear_parsed_trace_cache",
+]
@@ -0,0 +1,194 @@
+import os
+import json
+import pickle
+import hashlib
+import warnings
+from typing import Any, BinaryIO, Dict, Optional
+from pytctracer.config.constants import LevelType, TechniqueParameter
+from pytctracer.io.trace_fingerprint import (
+    fingerprint_trace_csv_log,
+    matches_trace_csv_log,
+)
+
+# Bump whenever the structure of the parsed technique parameters changes,
+# so that caches written by older versions are ignored
+CACHE_FORMAT_VERSION = 3
+CACHE_FILE_SUFFIX = ".pytctracer-cache"
+VERSION = "version"
+PARAMETERS_SHA256 = "parameters_sha256"
+# The header is a single line of JSON, so a longer first line can't be a header
+MAX_HEADER_LENGTH = 4096
+
+
+def get_parsed_trace_cache_path(
+    trace_csv_log_path: str, cache_directory: Optional[str] = None
+) -> str:
+    """
+    Get the path of the parsed trace cache file for a trace log. If no cache
+    directory is given, the cache file is placed next to the trace log.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+        cache_directory (Optional[str]): The directory to store cache files in.
+
+    Returns:
+        str: The path to the cache file for the trace log.
+    """
+    if not cache_directory:
+        return f"{trace_csv_log_path}{CACHE_FILE_SUFFIX}"
+
+    # Include a digest of the absolute trace path so that trace logs with the
+    # same file name in different directories don't share a cache file
+    absolute_path_digest = hashlib.sha1(
+        os.path.abspath(trace_csv_log_path).encode("utf8")
+    ).hexdigest()[:12]
+    cache_file_name = (
+        f"{os.path.basename(trace_csv_log_path)}.{absolute_path_digest}"
+        f"{CACHE_FILE_SUFFIX}"
+    )
+
+    return os.path.join(cache_directory, cache_file_name)
+
+
+def load_parsed_trace_cache(
+    trace_csv_log_path: str, cache_directory: Optional[str] = None
+) -> Optional[Dict[LevelType, Dict[TechniqueParameter, Any]]]:
+    """
+    Load the parsed technique parameters for a trace log from its cache file.
+    The cache is only used if it was written for a trace log with the same size,
+    and either the same modification time or the same content hash. The cache file
+    starts with a JSON header holding the fingerprint of the trace log and the hash
+    of the pickled parameters, which are both checked before anything is unpickled.
+    Unpickling can still run arbitrary code, so cache files must only come from a
+    trusted source.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+        cache_directory (Optional[str]): The directory the cache files are stored in.
+
+    Returns:
+        Optional[Dict[LevelType, Dict[TechniqueParameter, Any]]]: A dictionary where
+        the keys are the traceability levels, and the values are the technique parameter
+        maps parsed at that level. None is returned if there is no valid cache.
+    """
+    cache_path = get_parsed_trace_cache_path(trace_csv_log_path, cache_directory)
+    if not os.path.isfile(cache_path):
+        return None
+
+    try:
+        with open(cache_path, "rb") as file:
+            header = _read_cache_header(file)
+            if (
+                header is None
+                or header.get(VERSION) != CACHE_FORMAT_VERSION
+                or not matches_trace_csv_log(header, trace_csv_log_path)
+            ):
+                return None
+
+            pickled_technique_parameter_maps = file.read()
+        if (
+            hashlib.sha256(pickled_technique_parameter_maps).hexdigest()
+            != header[PARAMETERS_SHA256]
+        ):
+            return None
+
+        return pickle.loads(pickled_technique_parameter_maps)
+
+    except (OSError, EOFError, KeyError, TypeError, ValueError, pickle.UnpicklingError):
+        # A corrupt or unreadable cache is treated as a cache miss
+        return None
+
+
+def write_parsed_trace_cache(
+    trace_csv_log_path: str,
+    technique_parameter_maps: Dict[LevelType, Dict[TechniqueParameter, Any]],
+    cache_directory: Optional[str] = None,
+) -> None:
+    """
+    Write the parsed technique parameters for a trace log to its cache file, after
+    a JSON header holding the size, modification time and content hash of the trace
+    log, and the hash of the pickled parameters.
+    Writing the cache is best effort: if the cache file can't be written, such as
+    when its directory is read-only or the disk is full, a warning is emitted and
+    the cache is skipped, as the parsed parameters can still be used.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+        technique_parameter_maps (Dict[LevelType, Dict[TechniqueParameter, Any]]): A
+        dictionary where the keys are the traceability levels, and the values are the
+        technique parameter maps parsed at that level.
+        cache_directory (Optional[str]): The directory to store cache files in.
+    """
+    cache_path = get_parsed_trace_cache_path(trace_csv_log_path, cache_directory)
+    # Write to a temporary file first, so that an interrupted write never
+    # leaves a truncated cache behind
+    temporary_cache_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        pickled_technique_parameter_maps = pickle.dumps(
+            technique_parameter_maps, protocol=pickle.HIGHEST_PROTOCOL
+        )
+        header = {
+            VERSION: CACHE_FORMAT_VERSION,
+            **fingerprint_trace_csv_log(trace_csv_log_path),
+            PARAMETERS_SHA256: hashlib.sha256(
+                pickled_technique_parameter_maps
+            ).hexdigest(),
+        }
+        with open(temporary_cache_path, "wb") as file:
+            file.write(json.dumps(header).encode("utf8") + b"\n")
+            file.write(pickled_technique_parameter_maps)
+        os.replace(temporary_cache_path, cache_path)
+
+    except (OSError, pickle.PicklingError) as e:
+        if os.path.exists(temporary_cache_path):
+            os.remove(temporary_cache_path)
+        warnings.warn(
+            f"Could not write the parsed trace cache with path: {cache_path} ({e}). "
+            "The trace log will be parsed again on the next run.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+
+
+def clear_parsed_trace_cache(
+    trace_csv_log_path: str, cache_directory: Optional[str] = None
+) -> bool:
+    """
+    Remove the cache file for a trace log, if one exists.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+        cache_directory (Optional[str]): The directory the cache files are stored in.
+
+    Returns:
+        bool: Whether a cache file was removed.
+    """
+    cache_path = get_parsed_trace_cache_path(trace_csv_log_path, cache_directory)
+    if not os.path.isfile(cache_path):
+        return False
+
+    os.remove(cache_path)
+
+    return True
+
+
+def _read_cache_header(file: BinaryIO) -> Optional[Dict[str, Any]]:
+    # The header is JSON rather than a pickle, so that it can be checked against
+    # the trace log without unpickling anything from the cache file
+    header_line = file.readline(MAX_HEADER_LENGTH)
+    if not header_line.endswith(b"\n"):
+        return None
+
+    header = json.loads(header_line)
+    if not isinstance(header, dict):
+        return None
+
+    return header
+
+
+__all__ = [
+    "get_parsed_trace_cache_path",
+    "load_parsed_trace_cache",
+    "write_parsed_trace_cache",
+    "clear_parsed_trace_cache",
+]
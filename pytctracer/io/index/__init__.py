@@ -0,0 +1,23 @@
+from .trace_segment_index import (
+    get_trace_segment_index_path,
+    create_trace_segment_index,
+    build_trace_segment_index,
+    write_trace_segment_index,
+    load_trace_segment_index,
+    read_trace_csv_log_for_tests,
+    find_test_segments,
+    find_segment_start_offsets,
+    find_trace_chunk_boundaries_from_index,
+)
+
+__all__ = [
+    "get_trace_segment_index_path",
+    "create_trace_segment_index",
+    "build_trace_segment_index",
+    "write_trace_segment_index",
+    "load_trace_segment_index",
+    "read_trace_csv_log_for_tests",
+    "find_test_segments",
+    "find_segment_start_offsets",
+    "find_trace_chunk_boundaries_from_index",
+]
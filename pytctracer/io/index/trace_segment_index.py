@@ -0,0 +1,357 @@
+import os
+import csv
+import json
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from pytctracer.config.constants import TraceDataHeader, TestingMethodType
+from pytctracer.io.input import TraceRecord, read_trace_csv_log_range
+from pytctracer.io.trace_fingerprint import (
+    SIZE,
+    fingerprint_trace_csv_log,
+    matches_trace_csv_log,
+)
+
+# Bump whenever the structure of the index changes, so that indexes written
+# by older versions are rebuilt
+INDEX_FORMAT_VERSION = 1
+INDEX_FILE_SUFFIX = ".index.json"
+VERSION = "version"
+COLUMNS = "columns"
+DATA_START = "data_start"
+ROW_COUNT = "row_count"
+SEGMENTS = "segments"
+TEST_METHOD_MARKER = b"TEST METHOD "
+QUOTE = b'"'
+
+# Each segment is stored as [start byte, end byte, start row, end row], where
+# the ends are exclusive and rows are numbered from the first row after the header
+START_BYTE = 0
+END_BYTE = 1
+START_ROW = 2
+END_ROW = 3
+
+
+def get_trace_segment_index_path(trace_csv_log_path: str) -> str:
+    """
+    Get the path of the test segment index file for a trace log, which is
+    placed next to the trace log.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+
+    Returns:
+        str: The path to the index file for the trace log.
+    """
+    return f"{trace_csv_log_path}{INDEX_FILE_SUFFIX}"
+
+
+def create_trace_segment_index(
+    trace_csv_log_path: str,
+    columns: List[str],
+    data_start: int,
+    row_count: int,
+    segments: Dict[str, List[List[int]]],
+) -> Dict[str, Any]:
+    """
+    Create a test segment index for a trace log from the segments found in it,
+    fingerprinted with the size, modification time and content hash of the
+    trace log as it currently is on disk.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+        columns (List[str]): The column names of the trace log.
+        data_start (int): The byte offset of the first row after the header.
+        row_count (int): The number of rows after the header.
+        segments (Dict[str, List[List[int]]]): A dictionary where the keys are the
+        fully qualified names of the tests, and the values are lists of the
+        [start byte, end byte, start row, end row] of each segment of the test.
+
+    Returns:
+        Dict[str, Any]: The test segment index for the trace log.
+    """
+    return {
+        VERSION: INDEX_FORMAT_VERSION,
+        **fingerprint_trace_csv_log(trace_csv_log_path),
+        COLUMNS: columns,
+        DATA_START: data_start,
+        ROW_COUNT: row_count,
+        SEGMENTS: segments,
+    }
+
+
+def build_trace_segment_index(trace_csv_log_path: str) -> Dict[str, Any]:
+    """
+    Build a test segment index for a trace log, by scanning it for the rows
+    where each test method is called and returns. A test segment runs from its
+    TEST METHOD CALL row up to and including its TEST METHOD RETURN row. A test
+    that is run more than once, such as a parametrised test, has a segment for
+    each run.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+
+    Returns:
+        Dict[str, Any]: The test segment index for the trace log.
+    """
+    segments = defaultdict(list)
+    try:
+        with open(trace_csv_log_path, "rb") as file:
+            columns = next(csv.reader([file.readline().decode("utf8")]))
+            data_start = file.tell()
+            testing_method_index = columns.index(TraceDataHeader.TESTNG_METHOD)
+            test_name_index = columns.index(
+                TraceDataHeader.FULLY_QUALIFIED_FUNCTION_NAME
+            )
+
+            row_start = data_start
+            row_count = 0
+            # The test whose segment is open, and the start byte and start row
+            # of the segment. The segment is added once its end is known
+            open_test = None
+            open_start_byte = open_start_row = 0
+            for row_bytes in _iterate_row_bytes(file):
+                row_end = row_start + len(row_bytes)
+                # Only fully decode the rows that could mark a test boundary
+                if TEST_METHOD_MARKER in row_bytes:
+                    record = next(csv.reader([row_bytes.decode("utf8")]))
+                    testing_method = record[testing_method_index]
+                    if testing_method == TestingMethodType.TEST_METHOD_CALL:
+                        if open_test is not None:
+                            # The previous test never returned, so close its
+                            # segment where the next test starts
+                            segments[open_test].append(
+                                [open_start_byte, row_start, open_start_row, row_count]
+                            )
+                        open_test = record[test_name_index]
+                        open_start_byte, open_start_row = row_start, row_count
+                    elif (
+                        testing_method == TestingMethodType.TEST_METHOD_RETURN
+                        and open_test is not None
+                        and record[test_name_index] == open_test
+                    ):
+                        segments[open_test].append(
+                            [open_start_byte, row_end, open_start_row, row_count + 1]
+                        )
+                        open_test = None
+
+                row_start = row_end
+                row_count += 1
+
+            if open_test is not None:
+                segments[open_test].append(
+                    [open_start_byte, row_start, open_start_row, row_count]
+                )
+
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Trace log not found at path: {trace_csv_log_path}")
+
+    except:
+        raise ValueError(
+            f"An error occurred while indexing the trace log at path: {trace_csv_log_path}."
+        )
+
+    return create_trace_segment_index(
+        trace_csv_log_path, columns, data_start, row_count, dict(segments)
+    )
+
+
+def write_trace_segment_index(
+    trace_csv_log_path: str, trace_segment_index: Dict[str, Any]
+) -> None:
+    """
+    Write a test segment index to the index file next to its trace log.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+        trace_segment_index (Dict[str, Any]): The test segment index for the trace log.
+    """
+    index_path = get_trace_segment_index_path(trace_csv_log_path)
+    try:
+        with open(index_path, "w", encoding="utf8") as file:
+            json.dump(trace_segment_index, file)
+
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found at path: {index_path}")
+
+    except:
+        raise ValueError(
+            f"An error occurred while writing the trace segment index with path: {index_path}."
+        )
+
+
+def load_trace_segment_index(trace_csv_log_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the test segment index for a trace log from its index file. The index
+    is only used if it was written for a trace log with the same size, and either
+    the same modification time or the same content hash.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+
+    Returns:
+        Optional[Dict[str, Any]]: The test segment index for the trace log. None is
+        returned if there is no valid index.
+    """
+    index_path = get_trace_segment_index_path(trace_csv_log_path)
+    if not os.path.isfile(index_path):
+        return None
+
+    try:
+        with open(index_path, encoding="utf8") as file:
+            trace_segment_index = json.load(file)
+
+        if trace_segment_index[VERSION] != INDEX_FORMAT_VERSION or not (
+            matches_trace_csv_log(trace_segment_index, trace_csv_log_path)
+        ):
+            return None
+
+        return trace_segment_index
+
+    except (OSError, KeyError, TypeError, ValueError):
+        # A corrupt or unreadable index is treated as a missing index
+        return None
+
+
+def read_trace_csv_log_for_tests(
+    trace_csv_log_path: str,
+    fully_qualified_test_names: Iterable[str],
+    trace_segment_index: Dict[str, Any],
+) -> List[TraceRecord]:
+    """
+    Read only the segments of the given tests from a trace log, by seeking
+    straight to each segment using the test segment index. The rows are returned
+    in the same order as they appear in the trace log.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+        fully_qualified_test_names (Iterable[str]): The fully qualified names of the
+        tests to read the segments of. Tests missing from the index are skipped.
+        trace_segment_index (Dict[str, Any]): The test segment index for the trace log.
+
+    Returns:
+        List[TraceRecord]: A list of records where each record represents a row in
+        the segments of the given tests.
+    """
+    columns = trace_segment_index[COLUMNS]
+    trace_data = []
+    for segment in find_test_segments(trace_segment_index, fully_qualified_test_names):
+        trace_data.extend(
+            read_trace_csv_log_range(
+                trace_csv_log_path, segment[START_BYTE], segment[END_BYTE], columns
+            )
+        )
+
+    return trace_data
+
+
+def find_test_segments(
+    trace_segment_index: Dict[str, Any], fully_qualified_test_names: Iterable[str]
+) -> List[List[int]]:
+    """
+    Find the segments of the given tests in a test segment index, in the order
+    they appear in the trace log.
+
+    Args:
+        trace_segment_index (Dict[str, Any]): The test segment index for the trace log.
+        fully_qualified_test_names (Iterable[str]): The fully qualified names of the
+        tests to find the segments of. Tests missing from the index are skipped.
+
+    Returns:
+        List[List[int]]: A list of the [start byte, end byte, start row, end row]
+        of each segment.
+    """
+    segments = trace_segment_index[SEGMENTS]
+    test_segments = [
+        segment
+        for test_name in set(fully_qualified_test_names)
+        for segment in segments.get(test_name, [])
+    ]
+
+    return sorted(test_segments, key=lambda segment: segment[START_BYTE])
+
+
+def find_segment_start_offsets(trace_segment_index: Dict[str, Any]) -> List[int]:
+    """
+    Find the byte offsets that every test segment in a test segment index
+    starts at, in file order.
+
+    Args:
+        trace_segment_index (Dict[str, Any]): The test segment index for the trace log.
+
+    Returns:
+        List[int]: The start byte offset of each test segment.
+    """
+    return sorted(
+        segment[START_BYTE]
+        for test_segments in trace_segment_index[SEGMENTS].values()
+        for segment in test_segments
+    )
+
+
+def find_trace_chunk_boundaries_from_index(
+    trace_segment_index: Dict[str, Any], number_of_chunks: int
+) -> List[Tuple[int, int]]:
+    """
+    Split a trace log into roughly equal byte ranges that can be parsed
+    independently, using the test segment index rather than scanning the trace
+    log. Every range after the first begins at the start of a test segment.
+
+    Args:
+        trace_segment_index (Dict[str, Any]): The test segment index for the trace log.
+        number_of_chunks (int): The desired number of byte ranges.
+
+    Returns:
+        List[Tuple[int, int]]: A list of (start, end) byte offsets for each range,
+        in file order.
+    """
+    data_start = trace_segment_index[DATA_START]
+    file_size = trace_segment_index[SIZE]
+    segment_start_offsets = find_segment_start_offsets(trace_segment_index)
+
+    boundaries = [data_start]
+    for chunk_index in range(1, number_of_chunks):
+        target_offset = (
+            data_start + (file_size - data_start) * chunk_index // number_of_chunks
+        )
+        segment_position = bisect_left(
+            segment_start_offsets, max(target_offset, boundaries[-1] + 1)
+        )
+        if segment_position == len(segment_start_offsets):
+            break
+        boundaries.append(segment_start_offsets[segment_position])
+    boundaries.append(file_size)
+
+    return [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start
+    ]
+
+
+def _iterate_row_bytes(file: BinaryIO) -> Iterator[bytes]:
+    # A row can span several lines if a quoted field contains a newline, and
+    # a row is only complete once its quotes are balanced
+    row_lines = []
+    quote_count = 0
+    for line in file:
+        row_lines.append(line)
+        quote_count += line.count(QUOTE)
+        if quote_count % 2 == 0:
+            yield row_lines[0] if len(row_lines) == 1 else b"".join(row_lines)
+            row_lines = []
+            quote_count = 0
+
+    if row_lines:
+        yield b"".join(row_lines)
+
+
+__all__ = [
+    "get_trace_segment_index_path",
+    "create_trace_segment_index",
+    "build_trace_segment_index",
+    "write_trace_segment_index",
+    "load_trace_segment_index",
+    "read_trace_csv_log_for_tests",
+    "find_test_segments",
+    "find_segment_start_offsets",
+    "find_trace_chunk_boundaries_from_index",
+]
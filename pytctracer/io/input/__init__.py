@@ -1,3 +1,21 @@
-from .from_file import read_trace_csv_log, load_link_json
+from .from_file import (
+    read_trace_csv_log,
+    read_trace_csv_log_columns,
+    read_trace_csv_log_range,
+    find_trace_chunk_boundaries,
+    load_link_json,
+)
+from .trace_record import TraceRecord, get_trace_record_type
+from .from_mmap import read_trace_csv_log_mmap, PARSED_TRACE_COLUMNS
 
-__all__ = ["read_trace_csv_log", "load_link_json"]
+__all__ = [
+    "read_trace_csv_log",
+    "read_trace_csv_log_columns",
+    "read_trace_csv_log_range",
+    "find_trace_chunk_boundaries",
+    "load_link_json",
+    "read_trace_csv_log_mmap",
+    "PARSED_TRACE_COLUMNS",
+    "TraceRecord",
+    "get_trace_record_type",
+]
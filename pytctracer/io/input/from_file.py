@@ -1,7 +1,16 @@
+import io
+import os
+import re
 import sys
 import csv
 import json
-from typing import List, Dict
+from typing import List, Dict, Tuple, Optional, Pattern, BinaryIO, Iterable
+from pytctracer.config.constants import TraceDataHeader, TestingMethodType
+from pytctracer.io.input.trace_record import (
+    TraceRecord,
+    get_trace_record_type,
+    get_interned_column_flags,
+)
 
 # Increase the maximum field size limit for CSV files,
 # for very large trace logs
@@ -10,32 +19,33 @@ try:
 except OverflowError:
     csv.field_size_limit(int(1e9))
 
+SEARCH_BLOCK_SIZE = 1 << 20
+SEARCH_BLOCK_OVERLAP = 1 << 12
 
-def read_trace_csv_log(file_path: str) -> List[Dict[str, str]]:
+
+def read_trace_csv_log(file_path: str) -> List[TraceRecord]:
     """
-    Read a CSV file containing trace data and return it as a list of dictionaries.
+    Read a CSV file containing trace data and return it as a list of records.
+    Names and other repeated values are interned, so that every record refers
+    to a single copy of each distinct value.
 
     Args:
         file_path (str): The path to the CSV file.
 
     Returns:
-        List[Dict[str, str]]: A list of dictionaries where each dictionary represents
-        a row in the CSV file, with the keys being the column names and the values
-        being the corresponding values in the row.
+        List[TraceRecord]: A list of records where each record represents a row in
+        the CSV file, indexed by the column names in the same way as a dictionary,
+        with the values being the corresponding values in the row.
     """
-    data = []
     try:
         with open(file_path, encoding="utf8") as file:
             lines = csv.reader(file)
-            # Iterate through each line in the CSV file, extract the fields
-            for index, record in enumerate(lines):
-                # Extract column names from first row
-                if index == 0:
-                    columns = record
-                    continue
-                data.append({columns[i]: record[i] for i in range(len(columns))})
+            # Extract column names from first row
+            columns = next(lines, None)
+            if columns is None:
+                return []
 
-        return data
+            return _create_trace_records(lines, columns)
 
     except FileNotFoundError:
         raise FileNotFoundError(f"Trace log not found at path: {file_path}")
@@ -46,6 +56,180 @@ def read_trace_csv_log(file_path: str) -> List[Dict[str, str]]:
         )
 
 
+def read_trace_csv_log_columns(file_path: str) -> List[str]:
+    """
+    Read the column names from the header row of a trace log CSV file.
+
+    Args:
+        file_path (str): The path to the CSV file.
+
+    Returns:
+        List[str]: The column names of the trace log, in order.
+    """
+    try:
+        with open(file_path, encoding="utf8") as file:
+            return next(csv.reader(file))
+
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Trace log not found at path: {file_path}")
+
+    except:
+        raise ValueError(
+            f"An error occurred while reading the trace log at path: {file_path}."
+        )
+
+
+def read_trace_csv_log_range(
+    file_path: str, start: int, end: int, columns: List[str]
+) -> List[TraceRecord]:
+    """
+    Read the rows of a trace log CSV file that lie within a byte range, and return
+    them as a list of records. The range must start and end on row boundaries.
+
+    Args:
+        file_path (str): The path to the CSV file.
+        start (int): The byte offset of the first row to read.
+        end (int): The byte offset after the last row to read.
+        columns (List[str]): The column names of the trace log.
+
+    Returns:
+        List[TraceRecord]: A list of records where each record represents a row in
+        the byte range, indexed by the column names in the same way as a dictionary,
+        with the values being the corresponding values in the row.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            file.seek(start)
+            range_bytes = file.read(end - start)
+
+        # Decode through a text wrapper to translate newlines in the same way
+        # as reading the whole file in text mode
+        lines = csv.reader(io.TextIOWrapper(io.BytesIO(range_bytes), encoding="utf8"))
+
+        return _create_trace_records(lines, columns)
+
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Trace log not found at path: {file_path}")
+
+    except:
+        raise ValueError(
+            f"An error occurred while reading the trace log at path: {file_path}."
+        )
+
+
+def find_trace_chunk_boundaries(
+    file_path: str, number_of_chunks: int
+) -> List[Tuple[int, int]]:
+    """
+    Split a trace log CSV file into roughly equal byte ranges that can be parsed
+    independently. Every range after the first begins at a row where a test method
+    is called, so no test segment is split across two ranges. The first range
+    begins after the header row, and the last range ends at the end of the file.
+
+    Args:
+        file_path (str): The path to the CSV file.
+        number_of_chunks (int): The desired number of byte ranges.
+
+    Returns:
+        List[Tuple[int, int]]: A list of (start, end) byte offsets for each range,
+        in file order. Fewer ranges than requested are returned if the trace log
+        doesn't contain enough test segments.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            header_row = file.readline()
+            data_start = file.tell()
+            file_size = os.fstat(file.fileno()).st_size
+            columns = next(csv.reader([header_row.decode("utf8")]))
+            test_method_call_pattern = _compile_test_method_call_pattern(columns)
+
+            boundaries = [data_start]
+            for chunk_index in range(1, number_of_chunks):
+                target_offset = (
+                    data_start
+                    + (file_size - data_start) * chunk_index // number_of_chunks
+                )
+                boundary = _find_next_row_matching(
+                    file,
+                    max(target_offset, boundaries[-1] + 1),
+                    test_method_call_pattern,
+                )
+                if boundary is None:
+                    break
+                if boundary > boundaries[-1]:
+                    boundaries.append(boundary)
+            boundaries.append(file_size)
+
+        return [
+            (start, end)
+            for start, end in zip(boundaries, boundaries[1:])
+            if end > start
+        ]
+
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Trace log not found at path: {file_path}")
+
+    except:
+        raise ValueError(
+            f"An error occurred while reading the trace log at path: {file_path}."
+        )
+
+
+def _create_trace_records(
+    lines: Iterable[List[str]], columns: List[str]
+) -> List[TraceRecord]:
+    record_type = get_trace_record_type(tuple(columns))
+    interned_column_flags = get_interned_column_flags(columns)
+    intern = sys.intern
+    create_record = tuple.__new__
+
+    # Blank lines are skipped, as csv.DictReader does, but a row with a different
+    # number of fields to the header is malformed, so raises a ValueError rather
+    # than being truncated or padded
+    return [
+        create_record(
+            record_type,
+            [
+                intern(value) if interned else value
+                for value, interned in zip(record, interned_column_flags, strict=True)
+            ],
+        )
+        for record in lines
+        if record
+    ]
+
+
+def _compile_test_method_call_pattern(columns: List[str]) -> Pattern[bytes]:
+    # The columns before the testing method (depth and function type) are never
+    # quoted, so a test method call row can be matched from the start of a line
+    testing_method_index = columns.index(TraceDataHeader.TESTNG_METHOD)
+
+    return re.compile(
+        b"\n"
+        + b'[^,"\r\n]*,' * testing_method_index
+        + re.escape(TestingMethodType.TEST_METHOD_CALL.encode("utf8"))
+        + b"[,\r\n]"
+    )
+
+
+def _find_next_row_matching(
+    file: BinaryIO, offset: int, pattern: Pattern[bytes]
+) -> Optional[int]:
+    # Search from the byte before the offset, so a row starting at the offset
+    # is preceded by its newline
+    search_offset = offset - 1
+    while True:
+        file.seek(search_offset)
+        block = file.read(SEARCH_BLOCK_SIZE)
+        match = pattern.search(block)
+        if match:
+            return search_offset + match.start() + 1
+        if len(block) < SEARCH_BLOCK_SIZE:
+            return None
+        # Overlap consecutive blocks so matches spanning a block edge are found
+        search_offset += SEARCH_BLOCK_SIZE - SEARCH_BLOCK_OVERLAP
+
+
 def load_link_json(link_path: str) -> Dict[str, List[str]]:
     """
     Loads a JSON file containing test-to-code links as a dictionary.
@@ -73,4 +257,10 @@ def load_link_json(link_path: str) -> Dict[str, List[str]]:
     return link_dict
 
 
-__all__ = ["read_trace_csv_log", "load_link_json"]
+__all__ = [
+    "read_trace_csv_log",
+    "read_trace_csv_log_columns",
+    "read_trace_csv_log_range",
+    "find_trace_chunk_boundaries",
+    "load_link_json",
+]
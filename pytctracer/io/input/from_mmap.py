@@ -0,0 +1,162 @@
+import re
+import sys
+import csv
+import mmap
+from typing import List, Optional, Pattern, Sequence, Tuple, Type
+from pytctracer.config.constants import TraceDataHeader
+from pytctracer.io.input.trace_record import TraceRecord, get_trace_record_type
+
+# The columns read by the trace parsers. The remaining columns, such as return
+# values, can be large and are skipped without being decoded
+PARSED_TRACE_COLUMNS = (
+    TraceDataHeader.DEPTH,
+    TraceDataHeader.FUNCTION_TYPE,
+    TraceDataHeader.TESTNG_METHOD,
+    TraceDataHeader.FUNCTION_NAME,
+    TraceDataHeader.FULLY_QUALIFIED_FUNCTION_NAME,
+    TraceDataHeader.CLASS_NAME,
+    TraceDataHeader.FULLY_QUALIFIED_CLASS_NAME,
+    TraceDataHeader.EVENT_TYPE,
+)
+# Possessive quantifiers stop the pattern backtracking through long return values
+QUOTED_FIELD_PATTERN = b'"(?:[^"]++|"")*+"'
+UNQUOTED_FIELD_PATTERN = b'[^,"\\r\\n]*+'
+ROW_END_PATTERN = b"(?:\\r?\\n|\\Z)"
+QUOTE = b'"'
+
+
+def read_trace_csv_log_mmap(
+    file_path: str,
+    byte_ranges: Optional[Sequence[Tuple[int, int]]] = None,
+    columns: Sequence[str] = PARSED_TRACE_COLUMNS,
+) -> List[TraceRecord]:
+    """
+    Read a CSV file containing trace data through a memory map, decoding only the
+    given columns, and return it as a list of records. The rows and fields are
+    found directly in the mapped file, so nothing is copied through a file buffer,
+    and the columns that aren't needed are never decoded. The decoded values are
+    interned, so that every record refers to a single copy of each distinct value.
+
+    Args:
+        file_path (str): The path to the CSV file.
+        byte_ranges (Optional[Sequence[Tuple[int, int]]]): The (start, end) byte
+        offsets of the parts of the file to read, such as test segments from the
+        test segment index. Each range must start and end on row boundaries. If
+        omitted, every row after the header is read.
+        columns (Sequence[str]): The names of the columns to decode. If omitted,
+        the columns read by the trace parsers are decoded.
+
+    Returns:
+        List[TraceRecord]: A list of records where each record represents a row in
+        the CSV file, indexed by the given column names in the same way as a
+        dictionary, with the values being the corresponding values in the row.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            header_row = file.readline()
+            if not header_row:
+                return []
+            data_start = file.tell()
+            file_size = file.seek(0, 2)
+            if data_start == file_size:
+                return []
+
+            header = next(csv.reader([header_row.decode("utf8")]))
+            row_pattern, record_type, column_offsets = _compile_row_pattern(
+                header, columns
+            )
+            if byte_ranges is None:
+                byte_ranges = [(data_start, file_size)]
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                data = []
+                for start, end in byte_ranges:
+                    data.extend(
+                        _read_rows(
+                            mapped_file,
+                            start,
+                            end,
+                            row_pattern,
+                            record_type,
+                            column_offsets,
+                        )
+                    )
+
+        return data
+
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Trace log not found at path: {file_path}")
+
+    except:
+        raise ValueError(
+            f"An error occurred while reading the trace log at path: {file_path}."
+        )
+
+
+def _compile_row_pattern(
+    header: List[str], columns: Sequence[str]
+) -> Tuple[Pattern[bytes], Type[TraceRecord], List[int]]:
+    # Capture the span of fields from the first to the last chosen column as a
+    # single group, which is decoded and split in one step, and match over the
+    # fields outside of it
+    chosen_columns = set(columns)
+    chosen_column_positions = [
+        position for position, column in enumerate(header) if column in chosen_columns
+    ]
+    first_position = chosen_column_positions[0]
+    last_position = chosen_column_positions[-1]
+    field_pattern = b"(?:" + QUOTED_FIELD_PATTERN + b"|" + UNQUOTED_FIELD_PATTERN + b")"
+
+    chosen_span_pattern = b",".join(
+        [field_pattern] * (last_position - first_position + 1)
+    )
+    row_pattern = b",".join(
+        [field_pattern] * first_position
+        + [b"(" + chosen_span_pattern + b")"]
+        + [field_pattern] * (len(header) - last_position - 1)
+    )
+    record_type = get_trace_record_type(
+        tuple(header[position] for position in chosen_column_positions)
+    )
+    column_offsets = [position - first_position for position in chosen_column_positions]
+
+    return re.compile(row_pattern + ROW_END_PATTERN), record_type, column_offsets
+
+
+def _read_rows(
+    mapped_file: mmap.mmap,
+    start: int,
+    end: int,
+    row_pattern: Pattern[bytes],
+    record_type: Type[TraceRecord],
+    column_offsets: List[int],
+) -> List[TraceRecord]:
+    rows = []
+    intern = sys.intern
+    create_record = tuple.__new__
+    position = start
+    while position < end:
+        match = row_pattern.match(mapped_file, position, end)
+        if match is None or match.end() == position:
+            raise ValueError(f"Malformed trace log row at byte offset: {position}")
+        fields = _split_fields(match.group(1))
+        rows.append(
+            create_record(
+                record_type, [intern(fields[offset]) for offset in column_offsets]
+            )
+        )
+        position = match.end()
+
+    return rows
+
+
+def _split_fields(field_span: bytes) -> List[str]:
+    # Quoted fields are rare in the parsed columns, so only fall back to the
+    # CSV reader when the span contains a quote
+    if QUOTE in field_span:
+        return next(csv.reader([field_span.decode("utf8")]))
+
+    return field_span.decode("utf8").split(",")
+
+
+__all__ = ["read_trace_csv_log_mmap", "PARSED_TRACE_COLUMNS"]
@@ -0,0 +1,103 @@
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Iterable, Tuple, Type
+from pytctracer.config.constants import TraceDataHeader
+
+# Columns with free-form values, which are rarely repeated and so not interned
+UNINTERNED_TRACE_COLUMNS = frozenset(
+    {TraceDataHeader.RETURN_VALUE, TraceDataHeader.EXCEPTION_MESSAGE}
+)
+
+TRACE_DATA_HEADERS = frozenset(header.value for header in TraceDataHeader)
+
+
+class TraceRecord(tuple):
+    """
+    Base class for a row of a trace log. Rows are stored as tuples rather than
+    dictionaries, but are indexed by column name in the same way, so that the
+    parsers can treat them as if they were dictionaries.
+    """
+
+    __slots__ = ()
+    _column_positions = {}
+    _columns = ()
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._column_positions[key])
+
+        return tuple.__getitem__(self, key)
+
+    def __reduce__(self):
+        return _rebuild_trace_record, (self._columns, tuple(self))
+
+    def keys(self) -> Tuple[str, ...]:
+        """
+        Get the column names of the record, so that it can be converted back to a
+        dictionary with `dict(record)`.
+
+        Returns:
+            Tuple[str, ...]: The column names of the record, in order.
+        """
+        return self._columns
+
+
+@lru_cache(maxsize=None)
+def get_trace_record_type(columns: Tuple[str, ...]) -> Type[TraceRecord]:
+    """
+    Get the record type for the rows of a trace log with the given columns. The
+    record type is a named tuple which can be indexed by column name, with a field
+    for each column. Field names are the lower case names of the TraceDataHeader
+    members, such as `fully_qualified_function_name`.
+
+    Args:
+        columns (Tuple[str, ...]): The column names of the trace log, in order.
+
+    Returns:
+        Type[TraceRecord]: The record type for rows with the given columns.
+    """
+    field_names = [
+        (
+            TraceDataHeader(column).name.lower()
+            if column in TRACE_DATA_HEADERS
+            else f"column_{position}"
+        )
+        for position, column in enumerate(columns)
+    ]
+    named_tuple_type = namedtuple("TraceRecordFields", field_names)
+
+    return type(
+        "TraceRecord",
+        (TraceRecord, named_tuple_type),
+        {
+            "__slots__": (),
+            "_column_positions": {
+                column: position for position, column in enumerate(columns)
+            },
+            "_columns": tuple(columns),
+        },
+    )
+
+
+def get_interned_column_flags(columns: Iterable[str]) -> Tuple[bool, ...]:
+    """
+    Get whether the values of each column should be interned. Names and other
+    columns with few distinct values are interned, so that every row refers to
+    a single copy of each distinct value.
+
+    Args:
+        columns (Iterable[str]): The column names of the trace log, in order.
+
+    Returns:
+        Tuple[bool, ...]: Whether to intern the values of each column, in order.
+    """
+    return tuple(column not in UNINTERNED_TRACE_COLUMNS for column in columns)
+
+
+def _rebuild_trace_record(
+    columns: Tuple[str, ...], values: Tuple[Any, ...]
+) -> TraceRecord:
+    return tuple.__new__(get_trace_record_type(columns), values)
+
+
+__all__ = ["TraceRecord", "get_trace_record_type", "get_interned_column_flags"]
@@ -1,14 +1,25 @@
 from .to_display import (
     display_evaluation_results,
+    display_threshold_sweep_results,
+    display_grid_search_results,
     display_predicted_links,
     display_classifications,
 )
-from .to_file import write_dict_to_json, write_evaluation_metrics_to_csv
+from .to_file import (
+    write_dict_to_json,
+    write_evaluation_metrics_to_csv,
+    write_threshold_sweep_results_to_csv,
+    write_grid_search_results_to_csv,
+)
 
 __all__ = [
     "display_evaluation_results",
+    "display_threshold_sweep_results",
+    "display_grid_search_results",
     "display_predicted_links",
     "write_dict_to_json",
     "write_evaluation_metrics_to_csv",
+    "write_threshold_sweep_results_to_csv",
+    "write_grid_search_results_to_csv",
     "display_classifications",
 ]
@@ -1,4 +1,4 @@
-from typing import Dict, Set, List
+from typing import Dict, Set, List, Tuple
 
 
 def display_evaluation_results(
@@ -27,6 +27,111 @@ def display_evaluation_results(
     print("=" * 50 + "\n\n")
 
 
+def display_threshold_sweep_results(
+    sweep_results_for_techniques: Dict[str, Dict[float, Dict[str, float]]],
+    best_thresholds_for_techniques: Dict[str, float],
+    title: str,
+) -> None:
+    """
+    Display the results of a threshold sweep for each technique. Each technique will
+    be displayed as a table of the evaluation metrics at each threshold, followed by
+    the threshold with the best F1 score.
+
+    Args:
+        sweep_results_for_techniques (Dict[str, Dict[float, Dict[str, float]]]): A dictionary
+        where the keys are the names of the techniques, and the values are dictionaries where
+        the keys are the thresholds, and the values are dictionaries of the scores for each
+        evaluation metric at the threshold.
+
+        best_thresholds_for_techniques (Dict[str, float]): A dictionary where the keys are the
+        names of the techniques, and the values are the thresholds with the best F1 score.
+
+        title (str): The title of the threshold sweep results.
+    """
+    print(f"{'='*15} {title} {'='*15}\n")
+    for technique, sweep_results in sweep_results_for_techniques.items():
+        print(f"{'='*5} {technique} {'='*5}")
+        if sweep_results:
+            metrics = list(next(iter(sweep_results.values())).keys())
+            print(
+                "threshold".ljust(12) + "".join(metric.ljust(12) for metric in metrics)
+            )
+            for threshold, evaluation_dict in sweep_results.items():
+                row = f"{threshold:.5f}".ljust(12)
+                for score in evaluation_dict.values():
+                    if isinstance(score, float):
+                        row += f"{score:.5f}".ljust(12)
+                    else:
+                        row += f"{score}".ljust(12)
+                print(row)
+            print(
+                f"Best threshold by F1: {best_thresholds_for_techniques[technique]:.5f}"
+            )
+        print("\n")
+    print("=" * 50 + "\n\n")
+
+
+def display_grid_search_results(
+    grid_results_for_techniques: Dict[
+        str, Dict[Tuple[float, bool], Dict[float, Dict[str, float]]]
+    ],
+    best_thresholds_for_techniques: Dict[str, Dict[Tuple[float, bool], float]],
+    title: str,
+) -> None:
+    """
+    Display the results of a grid search for each technique. Each technique will be
+    displayed as a table of the evaluation metrics of each configuration of discount
+    factor and normalisation, at the threshold of the configuration with the best F1
+    score.
+
+    Args:
+        grid_results_for_techniques
+        (Dict[str, Dict[Tuple[float, bool], Dict[float, Dict[str, float]]]]): A dictionary
+        where the keys are the names of the techniques, and the values are dictionaries where
+        the keys are the (discount factor, normalise) configurations, and the values are
+        dictionaries of the scores for each evaluation metric at each threshold.
+
+        best_thresholds_for_techniques (Dict[str, Dict[Tuple[float, bool], float]]): A dictionary
+        where the keys are the names of the techniques, and the values are dictionaries where the
+        keys are the configurations, and the values are the thresholds with the best F1 score.
+
+        title (str): The title of the grid search results.
+    """
+    print(f"{'='*15} {title} {'='*15}\n")
+    for technique, grid_results in grid_results_for_techniques.items():
+        print(f"{'='*5} {technique} {'='*5}")
+        best_thresholds = best_thresholds_for_techniques[technique]
+        if best_thresholds:
+            first_configuration = next(iter(best_thresholds))
+            metrics = list(
+                grid_results[first_configuration][
+                    best_thresholds[first_configuration]
+                ].keys()
+            )
+            print(
+                "discount".ljust(12)
+                + "normalise".ljust(12)
+                + "threshold".ljust(12)
+                + "".join(metric.ljust(12) for metric in metrics)
+            )
+            for (discount_factor, normalise), threshold in best_thresholds.items():
+                row = (
+                    f"{discount_factor:.5f}".ljust(12)
+                    + f"{normalise}".ljust(12)
+                    + f"{threshold:.5f}".ljust(12)
+                )
+                for score in grid_results[(discount_factor, normalise)][
+                    threshold
+                ].values():
+                    if isinstance(score, float):
+                        row += f"{score:.5f}".ljust(12)
+                    else:
+                        row += f"{score}".ljust(12)
+                print(row)
+        print("\n")
+    print("=" * 50 + "\n\n")
+
+
 def display_predicted_links(predicted_links: Dict[str, Set[str]], title: str) -> None:
     """
     Display the predicted links for each test. Each test will be displayed with the
@@ -85,6 +190,8 @@ def display_classifications(
 
 __all__ = [
     "display_evaluation_results",
+    "display_threshold_sweep_results",
+    "display_grid_search_results",
     "display_predicted_links",
     "display_classifications",
 ]
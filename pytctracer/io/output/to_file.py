@@ -1,8 +1,11 @@
 import json
 import csv
-from typing import Dict
+from typing import Dict, Tuple
 
 TECHNIQUE = "Technique"
+THRESHOLD = "Threshold"
+DISCOUNT_FACTOR = "Discount Factor"
+NORMALISE = "Normalise"
 
 
 def write_dict_to_json(
@@ -66,4 +69,105 @@ def write_evaluation_metrics_to_csv(
         )
 
 
-__all__ = ["write_classifications_to_json", "write_evaluation_metrics_to_csv"]
+def write_threshold_sweep_results_to_csv(
+    sweep_results_for_techniques: Dict[str, Dict[float, Dict[str, float]]],
+    csv_name: str,
+) -> None:
+    """
+    Write the results of a threshold sweep for each technique to a CSV file, with a
+    row for each technique and threshold.
+
+    Args:
+        sweep_results_for_techniques (Dict[str, Dict[float, Dict[str, float]]]): A dictionary
+        where the keys are the names of the techniques, and the values are dictionaries where
+        the keys are the thresholds, and the values are dictionaries of the scores for each
+        evaluation metric at the threshold.
+
+        csv_name (str): The name of the CSV file to write the threshold sweep results to.
+    """
+    metrics = []
+    for sweep_results in sweep_results_for_techniques.values():
+        if sweep_results:
+            metrics = list(next(iter(sweep_results.values())).keys())
+            break
+    csv_headers = [TECHNIQUE, THRESHOLD] + metrics
+    try:
+        with open(csv_name, "w", newline="", encoding="utf8") as csv_file:
+            csv_writer = csv.DictWriter(csv_file, fieldnames=csv_headers)
+            csv_writer.writeheader()
+            for technique, sweep_results in sweep_results_for_techniques.items():
+                for threshold, evaluation_dict in sweep_results.items():
+                    row = {TECHNIQUE: technique, THRESHOLD: threshold}
+                    for metric, score in evaluation_dict.items():
+                        row[metric] = (
+                            score if not isinstance(score, float) else round(score, 5)
+                        )
+                    csv_writer.writerow(row)
+
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found at path: {csv_name}")
+
+    except:
+        raise ValueError(
+            f"An error occurred while writing to the CSV file with path: {csv_name}."
+        )
+
+
+def write_grid_search_results_to_csv(
+    grid_results_for_techniques: Dict[
+        str, Dict[Tuple[float, bool], Dict[float, Dict[str, float]]]
+    ],
+    csv_name: str,
+) -> None:
+    """
+    Write the results of a grid search for each technique to a CSV file, with a row
+    for each technique, discount factor, normalisation option and threshold.
+
+    Args:
+        grid_results_for_techniques
+        (Dict[str, Dict[Tuple[float, bool], Dict[float, Dict[str, float]]]]): A dictionary
+        where the keys are the names of the techniques, and the values are dictionaries where
+        the keys are the (discount factor, normalise) configurations, and the values are
+        dictionaries of the scores for each evaluation metric at each threshold.
+
+        csv_name (str): The name of the CSV file to write the grid search results to.
+    """
+    rows = [
+        {
+            TECHNIQUE: technique,
+            DISCOUNT_FACTOR: discount_factor,
+            NORMALISE: normalise,
+            THRESHOLD: threshold,
+            **{
+                metric: score if not isinstance(score, float) else round(score, 5)
+                for metric, score in evaluation_dict.items()
+            },
+        }
+        for technique, grid_results in grid_results_for_techniques.items()
+        for (discount_factor, normalise), sweep_results in grid_results.items()
+        for threshold, evaluation_dict in sweep_results.items()
+    ]
+    csv_headers = [TECHNIQUE, DISCOUNT_FACTOR, NORMALISE, THRESHOLD]
+    if rows:
+        csv_headers = list(rows[0].keys())
+    try:
+        with open(csv_name, "w", newline="", encoding="utf8") as csv_file:
+            csv_writer = csv.DictWriter(csv_file, fieldnames=csv_headers)
+            csv_writer.writeheader()
+            csv_writer.writerows(rows)
+
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found at path: {csv_name}")
+
+    except:
+        raise ValueError(
+            f"An error occurred while writing to the CSV file with path: {csv_name}."
+        )
+
+
+__all__ = [
+    "write_classifications_to_json",
+    "write_evaluation_metrics_to_csv",
+    "write_threshold_sweep_results_to_csv",
+    "write_grid_search_results_to_csv",
+]
@@ -0,0 +1,61 @@
+import os
+import hashlib
+from typing import Any, Dict
+
+SIZE = "size"
+MTIME_NS = "mtime_ns"
+SHA256 = "sha256"
+
+
+def fingerprint_trace_csv_log(trace_csv_log_path: str) -> Dict[str, Any]:
+    """
+    Fingerprint a trace log as it currently is on disk, with its size,
+    modification time and content hash. Files derived from the trace log, such as
+    the parsed trace cache and the test segment index, store the fingerprint so
+    that they can be checked against the trace log when they are loaded.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+
+    Returns:
+        Dict[str, Any]: The size, modification time and content hash of the trace log.
+    """
+    trace_stat = os.stat(trace_csv_log_path)
+
+    return {
+        SIZE: trace_stat.st_size,
+        MTIME_NS: trace_stat.st_mtime_ns,
+        SHA256: _compute_file_sha256(trace_csv_log_path),
+    }
+
+
+def matches_trace_csv_log(fingerprint: Dict[str, Any], trace_csv_log_path: str) -> bool:
+    """
+    Check whether a fingerprint matches a trace log as it currently is on disk. It
+    matches if the trace log has the same size, and either the same modification
+    time or the same content hash. The content hash is only computed when the
+    modification time differs.
+
+    Args:
+        fingerprint (Dict[str, Any]): The size, modification time and content hash
+        of the trace log when the fingerprint was taken.
+        trace_csv_log_path (str): The path to the trace log CSV file.
+
+    Returns:
+        bool: Whether the fingerprint matches the trace log.
+    """
+    trace_stat = os.stat(trace_csv_log_path)
+    if fingerprint[SIZE] != trace_stat.st_size:
+        return False
+
+    return fingerprint[MTIME_NS] == trace_stat.st_mtime_ns or fingerprint[
+        SHA256
+    ] == _compute_file_sha256(trace_csv_log_path)
+
+
+def _compute_file_sha256(file_path: str) -> str:
+    with open(file_path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+__all__ = ["fingerprint_trace_csv_log", "matches_trace_csv_log"]
@@ -0,0 +1,3 @@
+from .worker_pool import map_in_worker_pool
+
+__all__ = ["map_in_worker_pool"]
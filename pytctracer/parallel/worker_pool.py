@@ -0,0 +1,63 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List
+
+# Filled in each worker process by the pool initialiser, and read by the tasks
+# run in that process
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def map_in_worker_pool(
+    function: Callable[[Any, Dict[str, Any]], Any],
+    tasks: Iterable[Any],
+    jobs: int,
+    worker_state: Dict[str, Any],
+) -> List[Any]:
+    """
+    Apply a function to each task in a pool of worker processes, returning the
+    results in the order of the tasks. The function is called with the task and
+    the worker state, such as the parsed technique parameters. The worker state is
+    handed to each worker once, through the pool initialiser, and only the task is
+    sent with each call. With the fork start method, where it is available, the
+    worker state is inherited from this process copy-on-write rather than being
+    pickled at all. With a single job or task, the tasks are run one after another
+    in this process instead.
+
+    Args:
+        function (Callable[[Any, Dict[str, Any]], Any]): The function to apply to each
+        task. It must be defined at the top level of a module, so that it can be sent
+        to the workers.
+        tasks (Iterable[Any]): The tasks to apply the function to.
+        jobs (int): The maximum number of worker processes to run the tasks with.
+        worker_state (Dict[str, Any]): The state shared by the tasks run in each worker.
+
+    Returns:
+        List[Any]: The result of each task, in the order of the tasks.
+    """
+    tasks = list(tasks)
+    if jobs <= 1 or len(tasks) <= 1:
+        return [function(task, worker_state) for task in tasks]
+
+    start_methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in start_methods else None)
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(tasks)),
+        mp_context=context,
+        initializer=_initialise_worker,
+        initargs=(worker_state,),
+    ) as executor:
+        return list(executor.map(partial(_run_task_in_worker, function), tasks))
+
+
+def _initialise_worker(worker_state: Dict[str, Any]) -> None:
+    _WORKER_STATE.update(worker_state)
+
+
+def _run_task_in_worker(
+    function: Callable[[Any, Dict[str, Any]], Any], task: Any
+) -> Any:
+    return function(task, _WORKER_STATE)
+
+
+__all__ = ["map_in_worker_pool"]
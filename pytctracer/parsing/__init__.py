@@ -18,7 +18,21 @@ from .find_class_level_calls import (
 from .find_class_level_names import (
     find_function_class_names_tuple,
     find_test_class_names_tuple,
+    find_function_and_test_classes,
 )
+from .insertion_ordered_set import InsertionOrderedSet
+from .parse_technique_parameters import (
+    parse_technique_parameters,
+    parse_technique_parameters_for_levels,
+    parse_function_level_technique_parameters_and_classes,
+    parse_function_level_technique_parameters,
+    parse_class_level_technique_parameters,
+    roll_up_class_level_technique_parameters,
+    merge_technique_parameters,
+)
+from .parse_trace_csv_log import parse_trace_csv_log
+from .name_vocabulary import NameVocabulary, encode_technique_parameter_map
+from .technique_parameter_loader import TechniqueParameterLoader
 
 __all__ = [
     "find_functions_called_by_test_depth",
@@ -35,4 +49,17 @@ __all__ = [
     "find_function_classes_called_by_test_depth",
     "find_function_class_names_tuple",
     "find_test_class_names_tuple",
+    "find_function_and_test_classes",
+    "InsertionOrderedSet",
+    "parse_technique_parameters",
+    "parse_technique_parameters_for_levels",
+    "parse_function_level_technique_parameters_and_classes",
+    "parse_function_level_technique_parameters",
+    "parse_class_level_technique_parameters",
+    "roll_up_class_level_technique_parameters",
+    "merge_technique_parameters",
+    "parse_trace_csv_log",
+    "NameVocabulary",
+    "encode_technique_parameter_map",
+    "TechniqueParameterLoader",
 ]
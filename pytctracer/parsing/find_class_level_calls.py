@@ -1,5 +1,6 @@
 from typing import Dict, List, Set
 from collections import defaultdict
+from functools import partial
 from pytctracer.config.constants import (
     TraceDataHeader,
     TestingMethodType,
@@ -9,20 +10,22 @@ from pytctracer.config.constants import (
 
 
 def find_function_classes_called_by_test(
-    trace_data: List[Dict[str, str]]
+    trace_data: List[Dict[str, str]], set_type: type = set
 ) -> Dict[str, Set[str]]:
     """
     Find the function classes called by each test in the trace data.
 
     Args:
         trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        set_type (type): The type of set to collect the function classes called
+        by each test class in. Defaults to set.
 
     Returns:
         Dict[str, Set[str]]: A dictionary where the keys are the fully qualified
         names of the unit test, and the values are sets containing the
         fully qualified names of each function class invoked.
     """
-    function_classes_called_by_test_dict = defaultdict(set)
+    function_classes_called_by_test_dict = defaultdict(set_type)
     current_test = None
 
     for record in trace_data:
@@ -61,7 +64,8 @@ def find_function_classes_called_by_test_count(
         containing the fully qualified names of each function class invoked, along
         with the number of times each function class was called.
     """
-    function_classes_called_by_test_count_dict = defaultdict(lambda: defaultdict(int))
+    # Use a partial rather than a lambda so the result can be pickled
+    function_classes_called_by_test_count_dict = defaultdict(partial(defaultdict, int))
     current_test = None
 
     for record in trace_data:
@@ -86,20 +90,22 @@ def find_function_classes_called_by_test_count(
 
 
 def find_tests_that_call_function_classes(
-    trace_data: List[Dict[str, str]],
+    trace_data: List[Dict[str, str]], set_type: type = set
 ) -> Dict[str, Set[str]]:
     """
     Find the tests that call each function class in the trace data.
 
     Args:
         trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        set_type (type): The type of set to collect the test classes that call
+        each function class in. Defaults to set.
 
     Returns:
         Dict[str, Set[str]]: A dictionary where the keys are the fully qualified
         names of the function class, and the values are sets containing the
         fully qualified names of each test that calls the function class.
     """
-    tests_that_call_function_classes_dict = defaultdict(set)
+    tests_that_call_function_classes_dict = defaultdict(set_type)
     current_test = None
 
     for record in trace_data:
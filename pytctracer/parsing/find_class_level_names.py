@@ -7,7 +7,7 @@ from pytctracer.config.constants import (
 
 
 def find_function_class_names_tuple(
-    trace_data: List[Dict[str, str]]
+    trace_data: List[Dict[str, str]], set_type: type = set
 ) -> Set[Tuple[str, str]]:
     """
     Find the function and fully qualified names of the function classes found in the
@@ -15,13 +15,15 @@ def find_function_class_names_tuple(
 
     Args:
         trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        set_type (type): The type of set to collect the function class names in.
+        Defaults to set.
 
     Returns:
         Set[Tuple[str, str]]: A set of tuples where the first element of each
         tuple is the fully qualified (full path) name of a function class, and the second
         element is the short name of the function class.
     """
-    function_class_names_tuple = set()
+    function_class_names_tuple = set_type()
     for record in trace_data:
         if record[TraceDataHeader.FUNCTION_TYPE] == FunctionType.SOURCE:
             function_class_names_tuple.add(
@@ -35,7 +37,7 @@ def find_function_class_names_tuple(
 
 
 def find_test_class_names_tuple(
-    trace_data: List[Dict[str, str]]
+    trace_data: List[Dict[str, str]], set_type: type = set
 ) -> Set[Tuple[str, str]]:
     """
     Find the function and fully qualified names of the test classes found in the
@@ -43,13 +45,15 @@ def find_test_class_names_tuple(
 
     Args:
         trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        set_type (type): The type of set to collect the test class names in.
+        Defaults to set.
 
     Returns:
         Set[Tuple[str, str]]: A set of tuples where the first element of each
         tuple is the fully qualified (full path) name of a test class, and the second
         element is the short name of the test class.
     """
-    test_class_names_tuple = set()
+    test_class_names_tuple = set_type()
     for record in trace_data:
         if record[TraceDataHeader.TESTNG_METHOD] == TestingMethodType.TEST_METHOD_CALL:
             test_class_names_tuple.add(
@@ -62,4 +66,45 @@ def find_test_class_names_tuple(
     return test_class_names_tuple
 
 
-__all__ = ["find_function_class_names_tuple", "find_test_class_names_tuple"]
+def find_function_and_test_classes(
+    trace_data: List[Dict[str, str]]
+) -> Tuple[Dict[str, Tuple[str, str]], Dict[str, Tuple[str, str]]]:
+    """
+    Find the class of each function and of each test found in the trace data, so
+    that the class level parameters can be rolled up from the function level ones.
+
+    Args:
+        trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+
+    Returns:
+        Tuple[Dict[str, Tuple[str, str]], Dict[str, Tuple[str, str]]]: A pair of
+        dictionaries, for the functions and for the tests, where the keys are the fully
+        qualified names of the functions or tests, and the values are tuples of the
+        fully qualified name and the short name of their class.
+    """
+    function_classes = {}
+    test_classes = {}
+    for record in trace_data:
+        if record[TraceDataHeader.FUNCTION_TYPE] == FunctionType.SOURCE:
+            classes = function_classes
+        elif (
+            record[TraceDataHeader.TESTNG_METHOD] == TestingMethodType.TEST_METHOD_CALL
+        ):
+            classes = test_classes
+        else:
+            continue
+        fully_qualified_name = record[TraceDataHeader.FULLY_QUALIFIED_FUNCTION_NAME]
+        if fully_qualified_name not in classes:
+            classes[fully_qualified_name] = (
+                record[TraceDataHeader.FULLY_QUALIFIED_CLASS_NAME],
+                record[TraceDataHeader.CLASS_NAME],
+            )
+
+    return function_classes, test_classes
+
+
+__all__ = [
+    "find_function_class_names_tuple",
+    "find_test_class_names_tuple",
+    "find_function_and_test_classes",
+]
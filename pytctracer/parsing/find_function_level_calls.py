@@ -1,5 +1,6 @@
 from typing import List, Dict, Set
 from collections import defaultdict
+from functools import partial
 from pytctracer.config.constants import (
     TraceDataHeader,
     TestingMethodType,
@@ -9,20 +10,22 @@ from pytctracer.config.constants import (
 
 
 def find_functions_called_by_test(
-    trace_data: List[Dict[str, str]]
+    trace_data: List[Dict[str, str]], set_type: type = set
 ) -> Dict[str, Set[str]]:
     """
     Find the functions called by each test in the trace data.
 
     Args:
         trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        set_type (type): The type of set to collect the functions called by each
+        test in. Defaults to set.
 
     Returns:
         Dict[str, Set[str]]: A dictionary where the keys are the fully qualified
         names of the unit test, and the values are sets containing the
         fully qualified names of each function invoked.
     """
-    functions_called_by_test_dict = defaultdict(set)
+    functions_called_by_test_dict = defaultdict(set_type)
     current_test = None
 
     for record in trace_data:
@@ -60,7 +63,8 @@ def find_functions_called_by_test_count(
         containing the fully qualified names of each function invoked, along
         with the number of times each function was called.
     """
-    functions_called_by_test_count_dict = defaultdict(lambda: defaultdict(int))
+    # Use a partial rather than a lambda so the result can be pickled
+    functions_called_by_test_count_dict = defaultdict(partial(defaultdict, int))
     current_test = None
 
     for record in trace_data:
@@ -84,20 +88,22 @@ def find_functions_called_by_test_count(
 
 
 def find_tests_that_call_function(
-    trace_data: List[Dict[str, str]]
+    trace_data: List[Dict[str, str]], set_type: type = set
 ) -> Dict[str, Set[str]]:
     """
     Find the tests that call each function in the trace data.
 
     Args:
         trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        set_type (type): The type of set to collect the tests that call each
+        function in. Defaults to set.
 
     Returns:
         Dict[str, Set[str]]: A dictionary where the keys are the fully qualified
         names of the function, and the values are sets containing the fully
         qualified names of each test that calls the function.
     """
-    tests_that_call_function_dict = defaultdict(set)
+    tests_that_call_function_dict = defaultdict(set_type)
     current_test = None
 
     for record in trace_data:
@@ -6,20 +6,24 @@ from pytctracer.config.constants import (
 )
 
 
-def find_function_names_tuple(trace_data: List[Dict[str, str]]) -> Set[Tuple[str, str]]:
+def find_function_names_tuple(
+    trace_data: List[Dict[str, str]], set_type: type = set
+) -> Set[Tuple[str, str]]:
     """
     Find the function and fully qualified names of the functions found in the
     trace data.
 
     Args:
         trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        set_type (type): The type of set to collect the function names in.
+        Defaults to set.
 
     Returns:
         Set[Tuple[str, str]]: A set of tuples where the first element of each
         tuple is the fully qualified (full path) name of a function, and the second
         element is the short name of the function.
     """
-    function_names_tuple = set()
+    function_names_tuple = set_type()
     for record in trace_data:
         if record[TraceDataHeader.FUNCTION_TYPE] == FunctionType.SOURCE:
             function_names_tuple.add(
@@ -32,20 +36,24 @@ def find_function_names_tuple(trace_data: List[Dict[str, str]]) -> Set[Tuple[str
     return function_names_tuple
 
 
-def find_test_names_tuple(trace_data: List[Dict[str, str]]) -> Set[Tuple[str, str]]:
+def find_test_names_tuple(
+    trace_data: List[Dict[str, str]], set_type: type = set
+) -> Set[Tuple[str, str]]:
     """
     Find the function and fully qualified names of the tests found in the
     trace data.
 
     Args:
         trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        set_type (type): The type of set to collect the test names in. Defaults
+        to set.
 
     Returns:
         Set[Tuple[str, str]]: A set of tuples where the first element of each
         tuple is the fully qualified (full path) name of a test, and the second
         element is the short name of the test.
     """
-    test_names_tuple = set()
+    test_names_tuple = set_type()
     for record in trace_data:
         if record[TraceDataHeader.TESTNG_METHOD] == TestingMethodType.TEST_METHOD_CALL:
             test_names_tuple.add(
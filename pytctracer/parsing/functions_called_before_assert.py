@@ -9,7 +9,7 @@ from pytctracer.config.constants import (
 
 
 def find_functions_called_before_assert_for_each_test(
-    trace_data: List[Dict[str, str]]
+    trace_data: List[Dict[str, str]], set_type: type = set
 ) -> Dict[str, Set[str]]:
     """
     Finds the fully qualified names of the functions called before an
@@ -17,6 +17,8 @@ def find_functions_called_before_assert_for_each_test(
 
     Args:
         trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        set_type (type): The type of set to collect the functions each test
+        calls before an assert in. Defaults to set.
 
     Returns:
         Dict[str, Set[str]]: A dictionary where the keys are the fully qualified
@@ -24,7 +26,7 @@ def find_functions_called_before_assert_for_each_test(
         fully qualified names of each function invoked before
         an assert statement.
     """
-    functions_called_before_assert_for_each_test = defaultdict(set)
+    functions_called_before_assert_for_each_test = defaultdict(set_type)
     current_test = None
     last_returned_function = None
 
@@ -60,7 +62,7 @@ def find_functions_called_before_assert_for_each_test(
 
 
 def find_classes_called_before_assert_for_each_test(
-    trace_data: List[Dict[str, str]]
+    trace_data: List[Dict[str, str]], set_type: type = set
 ) -> Dict[str, Set[str]]:
     """
     Finds the fully qualified names of the classes called before an assert
@@ -68,6 +70,8 @@ def find_classes_called_before_assert_for_each_test(
 
     Args:
         trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        set_type (type): The type of set to collect the function classes each
+        test class calls before an assert in. Defaults to set.
 
     Returns:
         Dict[str, Set[str]]: A dictionary where the keys are the fully qualified
@@ -75,7 +79,7 @@ def find_classes_called_before_assert_for_each_test(
         fully qualified names function class invoked before
         an assert statement.
     """
-    function_classes_called_before_assert_for_each_test = defaultdict(set)
+    function_classes_called_before_assert_for_each_test = defaultdict(set_type)
     current_test_class = None
     last_returned_function_class = None
 
@@ -0,0 +1,20 @@
+class InsertionOrderedSet(dict):
+    """
+    Set that iterates over its values in the order they were first added. The
+    parsers collect their sets in it when a trace log is parsed in chunks, so that
+    the chunks can be merged by adding the values of each chunk in file order,
+    which builds each merged set in the same order as a parse of the whole trace
+    log does. Only adding values and iterating over them are supported.
+    """
+
+    def add(self, value: object) -> None:
+        """
+        Add a value to the set, keeping its position if it is already in the set.
+
+        Args:
+            value (object): The value to add.
+        """
+        self[value] = None
+
+
+__all__ = ["InsertionOrderedSet"]
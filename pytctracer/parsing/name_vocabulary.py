@@ -0,0 +1,318 @@
+from collections import defaultdict
+from functools import partial
+from typing import Any, Dict, Iterable, List, Union
+from pytctracer.config.constants import TechniqueParameter
+
+NAMES_TUPLE_PARAMETERS = (
+    TechniqueParameter.FUNCTION_NAMES_TUPLE,
+    TechniqueParameter.TEST_NAMES_TUPLE,
+)
+# The parameters that map each test to the functions it called
+PER_TEST_PARAMETERS = (
+    TechniqueParameter.FUNCTIONS_CALLED_BY_TESTS,
+    TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT,
+    TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH,
+    TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_BEFORE_ASSERT,
+)
+
+
+class NameVocabulary:
+    """
+    Vocabulary of the fully qualified names of the tests and functions in a
+    trace log, which maps each name to a dense integer ID. The technique
+    parameters are encoded with the IDs once, when the trace log is parsed, so
+    that the techniques, the combined scores and the evaluation key their
+    dictionaries and sets by integers rather than by long names. The names are
+    only decoded when links or classifications are output. Tests and functions
+    are numbered separately from zero, in the order of the names tuples, so in
+    a new vocabulary the ID of a function is also its position in the function
+    names tuple.
+
+    Attributes:
+        test_names (List[str]): The fully qualified name of each test or test class,
+        indexed by its ID.
+        function_names (List[str]): The fully qualified name of each function or
+        function class, indexed by its ID.
+    """
+
+    def __init__(self) -> None:
+        """
+        Vocabulary of the fully qualified names of the tests and functions in a
+        trace log.
+        """
+        self.test_names: List[str] = []
+        self.function_names: List[str] = []
+        self._test_ids: Dict[str, int] = {}
+        self._function_ids: Dict[str, int] = {}
+
+    def add_test_name(self, fully_qualified_test_name: str) -> int:
+        """
+        Get the ID of a test, adding the test to the vocabulary if it is new.
+
+        Args:
+            fully_qualified_test_name (str): The fully qualified name of the test.
+
+        Returns:
+            int: The ID of the test.
+        """
+        return _add_name(self._test_ids, self.test_names, fully_qualified_test_name)
+
+    def add_function_name(self, fully_qualified_function_name: str) -> int:
+        """
+        Get the ID of a function, adding the function to the vocabulary if it is new.
+
+        Args:
+            fully_qualified_function_name (str): The fully qualified name of the function.
+
+        Returns:
+            int: The ID of the function.
+        """
+        return _add_name(
+            self._function_ids, self.function_names, fully_qualified_function_name
+        )
+
+    def encode_test_name(self, fully_qualified_test_name: str) -> Union[int, str]:
+        """
+        Encode the name of a test with its ID. Tests that aren't in the vocabulary,
+        such as tests in a ground truth that weren't traced, keep their name, which
+        never matches an ID.
+
+        Args:
+            fully_qualified_test_name (str): The fully qualified name of the test.
+
+        Returns:
+            Union[int, str]: The ID of the test, or its name if it has no ID.
+        """
+        return self._test_ids.get(fully_qualified_test_name, fully_qualified_test_name)
+
+    def encode_function_name(
+        self, fully_qualified_function_name: str
+    ) -> Union[int, str]:
+        """
+        Encode the name of a function with its ID. Functions that aren't in the
+        vocabulary keep their name, which never matches an ID.
+
+        Args:
+            fully_qualified_function_name (str): The fully qualified name of the function.
+
+        Returns:
+            Union[int, str]: The ID of the function, or its name if it has no ID.
+        """
+        return self._function_ids.get(
+            fully_qualified_function_name, fully_qualified_function_name
+        )
+
+    def decode_test_name(self, test_id: Union[int, str]) -> str:
+        """
+        Decode the ID of a test to its fully qualified name.
+
+        Args:
+            test_id (Union[int, str]): The ID of the test, or its name if it has no ID.
+
+        Returns:
+            str: The fully qualified name of the test.
+        """
+        return self.test_names[test_id] if isinstance(test_id, int) else test_id
+
+    def decode_function_name(self, function_id: Union[int, str]) -> str:
+        """
+        Decode the ID of a function to its fully qualified name.
+
+        Args:
+            function_id (Union[int, str]): The ID of the function, or its name if it
+            has no ID.
+
+        Returns:
+            str: The fully qualified name of the function.
+        """
+        return (
+            self.function_names[function_id]
+            if isinstance(function_id, int)
+            else function_id
+        )
+
+    def encode_technique_parameters(
+        self, technique_parameter_map: Dict[TechniqueParameter, Any]
+    ) -> Dict[TechniqueParameter, Any]:
+        """
+        Encode the fully qualified names in a map of technique parameters with their
+        IDs, adding any new tests and functions to the vocabulary. The short names
+        in the names tuples are kept, as the name based techniques compare them, and
+        the names tuples become lists in the order they were iterated in, which is
+        the order the tests and functions are scored in.
+
+        Args:
+            technique_parameter_map (Dict[TechniqueParameter, Any]): The technique
+            parameters keyed by fully qualified names.
+
+        Returns:
+            Dict[TechniqueParameter, Any]: The technique parameters keyed by IDs.
+        """
+        encoded_technique_parameter_map = {}
+        # The names tuples are encoded first, so the tests and functions new to
+        # the vocabulary are numbered in the order of the names tuples
+        for parameter, value in sorted(
+            technique_parameter_map.items(),
+            key=lambda parameter_and_value: parameter_and_value[0]
+            not in NAMES_TUPLE_PARAMETERS,
+        ):
+            if parameter == TechniqueParameter.FUNCTION_NAMES_TUPLE:
+                encoded_value = [
+                    (self.add_function_name(fully_qualified_name), short_name)
+                    for fully_qualified_name, short_name in value
+                ]
+            elif parameter == TechniqueParameter.TEST_NAMES_TUPLE:
+                encoded_value = [
+                    (self.add_test_name(fully_qualified_name), short_name)
+                    for fully_qualified_name, short_name in value
+                ]
+            elif parameter == TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS:
+                encoded_value = defaultdict(set)
+                for fully_qualified_function_name, test_names in value.items():
+                    encoded_value[
+                        self.add_function_name(fully_qualified_function_name)
+                    ] = {
+                        self.add_test_name(fully_qualified_test_name)
+                        for fully_qualified_test_name in test_names
+                    }
+            elif parameter in PER_TEST_PARAMETERS:
+                encoded_value = self._encode_per_test_parameter(parameter, value)
+            else:
+                encoded_value = value
+            encoded_technique_parameter_map[parameter] = encoded_value
+
+        return encoded_technique_parameter_map
+
+    def encode_links(
+        self, links: Dict[str, Iterable[str]]
+    ) -> Dict[Union[int, str], List[Union[int, str]]]:
+        """
+        Encode the fully qualified names in a dictionary of links, such as a ground
+        truth, with their IDs.
+
+        Args:
+            links (Dict[str, Iterable[str]]): A dictionary where the keys are the fully
+            qualified names of the tests, and the values are the fully qualified names
+            of the functions linked to the test.
+
+        Returns:
+            Dict[Union[int, str], List[Union[int, str]]]: The links keyed by IDs.
+        """
+        return {
+            self.encode_test_name(fully_qualified_test_name): [
+                self.encode_function_name(fully_qualified_function_name)
+                for fully_qualified_function_name in links_for_test
+            ]
+            for fully_qualified_test_name, links_for_test in links.items()
+        }
+
+    def decode_links(
+        self, links: Dict[Union[int, str], Iterable[Union[int, str]]]
+    ) -> Dict[str, List[str]]:
+        """
+        Decode the IDs in a dictionary of links, such as predicted links, to their
+        fully qualified names, keeping the order of the tests and of their links.
+
+        Args:
+            links (Dict[Union[int, str], Iterable[Union[int, str]]]): The links keyed
+            by IDs.
+
+        Returns:
+            Dict[str, List[str]]: A dictionary where the keys are the fully qualified
+            names of the tests, and the values are lists of the fully qualified names
+            of the functions linked to the test.
+        """
+        return {
+            self.decode_test_name(test_id): [
+                self.decode_function_name(function_id) for function_id in links_for_test
+            ]
+            for test_id, links_for_test in links.items()
+        }
+
+    def decode_classifications(
+        self, classifications: Dict[Union[int, str], Dict[str, List[Union[int, str]]]]
+    ) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Decode the IDs in the classifications of predicted links to their fully
+        qualified names.
+
+        Args:
+            classifications (Dict[Union[int, str], Dict[str, List[Union[int, str]]]]):
+            The classifications of each test, keyed by IDs.
+
+        Returns:
+            Dict[str, Dict[str, List[str]]]: A dictionary where the keys are the fully
+            qualified names of the tests, and the values are dictionaries containing the
+            true positives, false positives, and false negatives for each test.
+        """
+        return {
+            self.decode_test_name(test_id): self.decode_links(classifications_for_test)
+            for test_id, classifications_for_test in classifications.items()
+        }
+
+    def _encode_per_test_parameter(
+        self, parameter: TechniqueParameter, values_for_tests: Dict[str, Any]
+    ) -> Dict[int, Any]:
+        # The encoded dictionaries default in the same way as the parsed ones
+        if parameter == TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT:
+            encoded_values_for_tests = defaultdict(partial(defaultdict, int))
+        elif parameter == TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH:
+            encoded_values_for_tests = defaultdict(dict)
+        else:
+            encoded_values_for_tests = defaultdict(set)
+
+        for fully_qualified_test_name, values in values_for_tests.items():
+            test_id = self.add_test_name(fully_qualified_test_name)
+            if isinstance(values, dict):
+                encoded_values = encoded_values_for_tests[test_id]
+                for fully_qualified_function_name, value in values.items():
+                    encoded_values[
+                        self.add_function_name(fully_qualified_function_name)
+                    ] = value
+            else:
+                encoded_values_for_tests[test_id] = {
+                    self.add_function_name(fully_qualified_function_name)
+                    for fully_qualified_function_name in values
+                }
+
+        return encoded_values_for_tests
+
+
+def encode_technique_parameter_map(
+    technique_parameter_map: Dict[TechniqueParameter, Any],
+) -> Dict[TechniqueParameter, Any]:
+    """
+    Encode the fully qualified names in a map of technique parameters with the IDs
+    of a new vocabulary of the trace log, which is added to the map so that names
+    can be decoded for output.
+
+    Args:
+        technique_parameter_map (Dict[TechniqueParameter, Any]): The technique
+        parameters keyed by fully qualified names.
+
+    Returns:
+        Dict[TechniqueParameter, Any]: The technique parameters keyed by IDs, along
+        with the vocabulary of the names.
+    """
+    name_vocabulary = NameVocabulary()
+    encoded_technique_parameter_map = name_vocabulary.encode_technique_parameters(
+        technique_parameter_map
+    )
+    encoded_technique_parameter_map[TechniqueParameter.NAME_VOCABULARY] = (
+        name_vocabulary
+    )
+
+    return encoded_technique_parameter_map
+
+
+def _add_name(ids: Dict[str, int], names: List[str], name: str) -> int:
+    name_id = ids.get(name)
+    if name_id is None:
+        name_id = len(names)
+        ids[name] = name_id
+        names.append(name)
+
+    return name_id
+
+
+__all__ = ["NameVocabulary", "encode_technique_parameter_map"]
@@ -0,0 +1,535 @@
+from collections import defaultdict
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from pytctracer.config.constants import (
+    LevelType,
+    TechniqueParameter,
+    TestingMethodType,
+    TraceDataHeader,
+)
+from pytctracer.parsing.find_function_level_calls import (
+    find_functions_called_by_test,
+    find_functions_called_by_test_count,
+    find_functions_called_by_test_depth,
+    find_tests_that_call_function,
+)
+from pytctracer.parsing.find_function_level_names import (
+    find_function_names_tuple,
+    find_test_names_tuple,
+)
+from pytctracer.parsing.find_class_level_calls import (
+    find_function_classes_called_by_test,
+    find_function_classes_called_by_test_count,
+    find_function_classes_called_by_test_depth,
+    find_tests_that_call_function_classes,
+)
+from pytctracer.parsing.find_class_level_names import (
+    find_function_class_names_tuple,
+    find_test_class_names_tuple,
+    find_function_and_test_classes,
+)
+from pytctracer.parsing.functions_called_before_assert import (
+    find_functions_called_before_assert_for_each_test,
+    find_classes_called_before_assert_for_each_test,
+)
+
+
+def parse_technique_parameters(
+    trace_data: List[Dict[str, str]],
+    traceability_level: LevelType,
+    tests_to_parse: Optional[Set[str]] = None,
+    set_type: type = set,
+) -> Dict[TechniqueParameter, Any]:
+    """
+    Parse the trace data into the parameters required by the traceability
+    techniques, at the given level of traceability.
+
+    Args:
+        trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        traceability_level (LevelType): The level of traceability to parse for.
+        tests_to_parse (Optional[Set[str]]): The fully qualified names of the tests or
+        test classes to parse the calls of each test for. The names of every test, and
+        the tests that call each function, are still parsed from every test, as the
+        global statistics of the techniques depend on them. If omitted, every test is
+        parsed.
+        set_type (type): The type of set to collect the names and calls in. Defaults
+        to set.
+
+    Returns:
+        Dict[TechniqueParameter, Any]: A dictionary where the keys are the technique
+        parameters, and the values are the parsed data for each parameter.
+    """
+    if traceability_level == LevelType.FUNCTION:
+        return parse_function_level_technique_parameters(
+            trace_data, tests_to_parse, set_type
+        )
+
+    return parse_class_level_technique_parameters(trace_data, tests_to_parse, set_type)
+
+
+def parse_technique_parameters_for_levels(
+    trace_data: List[Dict[str, str]],
+    traceability_levels: List[LevelType],
+    tests_to_parse: Optional[Dict[LevelType, Set[str]]] = None,
+    set_type: type = set,
+) -> Dict[LevelType, Dict[TechniqueParameter, Any]]:
+    """
+    Parse the trace data into the parameters required by the traceability
+    techniques, at each of the given levels of traceability. When both levels are
+    given, the trace data is only parsed at the function level, and the class level
+    parameters are rolled up from the function level ones.
+
+    Args:
+        trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        traceability_levels (List[LevelType]): The levels of traceability to parse for.
+        tests_to_parse (Optional[Dict[LevelType, Set[str]]]): The fully qualified names
+        of the tests or test classes to parse the calls of each test for, at each level.
+        Every test is parsed at the levels that are missing, or if omitted.
+        set_type (type): The type of set to collect the names and calls in. Defaults
+        to set.
+
+    Returns:
+        Dict[LevelType, Dict[TechniqueParameter, Any]]: A dictionary where the keys are
+        the traceability levels, and the values are the technique parameter maps parsed
+        at that level.
+    """
+    if tests_to_parse is None:
+        tests_to_parse = {}
+    if (
+        LevelType.FUNCTION not in traceability_levels
+        or LevelType.CLASS not in traceability_levels
+    ):
+        return {
+            level: parse_technique_parameters(
+                trace_data, level, tests_to_parse.get(level), set_type
+            )
+            for level in traceability_levels
+        }
+
+    function_level_technique_parameter_map, function_classes, test_classes = (
+        parse_function_level_technique_parameters_and_classes(
+            trace_data, tests_to_parse, set_type
+        )
+    )
+    class_level_technique_parameter_map = roll_up_class_level_technique_parameters(
+        function_level_technique_parameter_map, function_classes, test_classes
+    )
+
+    return {
+        level: (
+            function_level_technique_parameter_map
+            if level == LevelType.FUNCTION
+            else class_level_technique_parameter_map
+        )
+        for level in traceability_levels
+    }
+
+
+def parse_function_level_technique_parameters_and_classes(
+    trace_data: List[Dict[str, str]],
+    tests_to_parse: Optional[Dict[LevelType, Set[str]]] = None,
+    set_type: type = set,
+) -> Tuple[
+    Dict[TechniqueParameter, Any],
+    Dict[str, Tuple[str, str]],
+    Dict[str, Tuple[str, str]],
+]:
+    """
+    Parse the trace data into the parameters required by the traceability
+    techniques at the function level, along with the class of each function and of
+    each test, which the class level parameters are rolled up with. When the tests
+    to parse are given at both levels, the tests of each test class to parse are
+    parsed as well.
+
+    Args:
+        trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        tests_to_parse (Optional[Dict[LevelType, Set[str]]]): The fully qualified names
+        of the tests or test classes to parse the calls of each test for, at each level.
+        Every test is parsed if either level is missing, or if omitted.
+        set_type (type): The type of set to collect the names and calls in. Defaults
+        to set.
+
+    Returns:
+        Tuple[Dict[TechniqueParameter, Any], Dict[str, Tuple[str, str]], Dict[str,
+        Tuple[str, str]]]: The function level technique parameters, and the classes of
+        the functions and of the tests, as found by find_function_and_test_classes.
+    """
+    if tests_to_parse is None:
+        tests_to_parse = {}
+    function_classes, test_classes = find_function_and_test_classes(trace_data)
+    function_level_tests_to_parse = None
+    if (
+        tests_to_parse.get(LevelType.FUNCTION) is not None
+        and tests_to_parse.get(LevelType.CLASS) is not None
+    ):
+        # The tests of each test class to parse are needed to roll it up
+        function_level_tests_to_parse = tests_to_parse[LevelType.FUNCTION] | {
+            test_name
+            for test_name, (test_class_name, _) in test_classes.items()
+            if test_class_name in tests_to_parse[LevelType.CLASS]
+        }
+    function_level_technique_parameter_map = parse_function_level_technique_parameters(
+        trace_data, function_level_tests_to_parse, set_type
+    )
+
+    return function_level_technique_parameter_map, function_classes, test_classes
+
+
+def parse_function_level_technique_parameters(
+    trace_data: List[Dict[str, str]],
+    tests_to_parse: Optional[Set[str]] = None,
+    set_type: type = set,
+) -> Dict[TechniqueParameter, Any]:
+    """
+    Parse the trace data into the parameters required by the traceability
+    techniques at the function level.
+
+    Args:
+        trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        tests_to_parse (Optional[Set[str]]): The fully qualified names of the tests to
+        parse the calls of each test for. If omitted, every test is parsed.
+        set_type (type): The type of set to collect the names and calls in. Defaults
+        to set.
+
+    Returns:
+        Dict[TechniqueParameter, Any]: A dictionary where the keys are the technique
+        parameters, and the values are the parsed data for each parameter.
+    """
+    function_names_tuple = find_function_names_tuple(trace_data, set_type)
+    test_names_tuple = find_test_names_tuple(trace_data, set_type)
+    test_trace_data = _select_test_segments(
+        trace_data, tests_to_parse, TraceDataHeader.FULLY_QUALIFIED_FUNCTION_NAME
+    )
+    functions_called_by_test = find_functions_called_by_test(test_trace_data, set_type)
+    functions_called_by_test_count = find_functions_called_by_test_count(
+        test_trace_data
+    )
+    functions_called_by_test_depth = find_functions_called_by_test_depth(
+        test_trace_data
+    )
+    functions_called_by_test_before_assert = (
+        find_functions_called_before_assert_for_each_test(test_trace_data, set_type)
+    )
+    tests_that_call_function = find_tests_that_call_function(trace_data, set_type)
+
+    return {
+        TechniqueParameter.FUNCTION_NAMES_TUPLE: function_names_tuple,
+        TechniqueParameter.TEST_NAMES_TUPLE: test_names_tuple,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TESTS: functions_called_by_test,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT: functions_called_by_test_count,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH: functions_called_by_test_depth,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_BEFORE_ASSERT: (
+            functions_called_by_test_before_assert
+        ),
+        TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS: tests_that_call_function,
+    }
+
+
+def parse_class_level_technique_parameters(
+    trace_data: List[Dict[str, str]],
+    tests_to_parse: Optional[Set[str]] = None,
+    set_type: type = set,
+) -> Dict[TechniqueParameter, Any]:
+    """
+    Parse the trace data into the parameters required by the traceability
+    techniques at the class level.
+
+    Args:
+        trace_data (List[Dict[str, str]]): The tracing CSV log as a dictionary.
+        tests_to_parse (Optional[Set[str]]): The fully qualified names of the test
+        classes to parse the calls of each test class for. If omitted, every test
+        class is parsed.
+        set_type (type): The type of set to collect the names and calls in. Defaults
+        to set.
+
+    Returns:
+        Dict[TechniqueParameter, Any]: A dictionary where the keys are the technique
+        parameters, and the values are the parsed data for each parameter.
+    """
+    function_class_names_tuple = find_function_class_names_tuple(trace_data, set_type)
+    test_class_names_tuple = find_test_class_names_tuple(trace_data, set_type)
+    test_trace_data = _select_test_segments(
+        trace_data, tests_to_parse, TraceDataHeader.FULLY_QUALIFIED_CLASS_NAME
+    )
+    functions_called_by_test_class = find_function_classes_called_by_test(
+        test_trace_data, set_type
+    )
+    functions_called_by_test_class_count = find_function_classes_called_by_test_count(
+        test_trace_data
+    )
+    functions_called_by_test_class_depth = find_function_classes_called_by_test_depth(
+        test_trace_data
+    )
+    functions_called_by_test_class_before_assert = (
+        find_classes_called_before_assert_for_each_test(test_trace_data, set_type)
+    )
+    tests_that_call_function_classes = find_tests_that_call_function_classes(
+        trace_data, set_type
+    )
+
+    return {
+        TechniqueParameter.FUNCTION_NAMES_TUPLE: function_class_names_tuple,
+        TechniqueParameter.TEST_NAMES_TUPLE: test_class_names_tuple,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TESTS: functions_called_by_test_class,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT: functions_called_by_test_class_count,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH: functions_called_by_test_class_depth,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_BEFORE_ASSERT: (
+            functions_called_by_test_class_before_assert
+        ),
+        TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS: tests_that_call_function_classes,
+    }
+
+
+def roll_up_class_level_technique_parameters(
+    function_level_technique_parameter_map: Dict[TechniqueParameter, Any],
+    function_classes: Dict[str, Tuple[str, str]],
+    test_classes: Dict[str, Tuple[str, str]],
+) -> Dict[TechniqueParameter, Any]:
+    """
+    Derive the class level technique parameters from the function level ones, by
+    replacing each test and function with its class. The classes must be found in
+    the same trace data as the function level parameters. Called sets are unioned, call
+    counts are summed, and the lowest call depth is kept, so the result matches
+    parsing the trace data at the class level. Functions and tests without a class
+    are left out of the calls, as they are by the class level parsers.
+
+    Args:
+        function_level_technique_parameter_map (Dict[TechniqueParameter, Any]): The
+        technique parameters parsed at the function level.
+        function_classes (Dict[str, Tuple[str, str]]): A dictionary where the keys
+        are the fully qualified names of the functions, in the order they first appear
+        in the trace data, and the values are tuples of the fully qualified name and
+        the short name of their class.
+        test_classes (Dict[str, Tuple[str, str]]): A dictionary where the keys are
+        the fully qualified names of the tests, and the values are tuples of the fully
+        qualified name and the short name of their class.
+
+    Returns:
+        Dict[TechniqueParameter, Any]: The technique parameters at the class level.
+    """
+    function_class_names = {
+        function_name: function_class[0]
+        for function_name, function_class in function_classes.items()
+        if function_class[0]
+    }
+    test_class_names = {
+        test_name: test_class[0]
+        for test_name, test_class in test_classes.items()
+        if test_class[0]
+    }
+    # The names tuples are sets, as the class level parsers return. Each class is
+    # added in the order it first appears in the trace data, as the parsers add
+    # them, so for the same hash seed the sets iterate in the same order
+    function_class_names_tuple = set(function_classes.values())
+    test_class_names_tuple = set(test_classes.values())
+    function_classes_called_by_test_count = defaultdict(partial(defaultdict, int))
+    for test_name, function_counts in function_level_technique_parameter_map[
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT
+    ].items():
+        test_class_name = test_class_names.get(test_name)
+        if test_class_name is None:
+            continue
+        for function_name, count in function_counts.items():
+            function_class_name = function_class_names.get(function_name)
+            if function_class_name is not None:
+                function_classes_called_by_test_count[test_class_name][
+                    function_class_name
+                ] += count
+
+    function_classes_called_by_test_depth = defaultdict(dict)
+    for test_name, function_depths in function_level_technique_parameter_map[
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH
+    ].items():
+        test_class_name = test_class_names.get(test_name)
+        if test_class_name is None:
+            continue
+        for function_name, depth in function_depths.items():
+            function_class_name = function_class_names.get(function_name)
+            if function_class_name is None:
+                continue
+            function_class_depths = function_classes_called_by_test_depth[
+                test_class_name
+            ]
+            if function_class_name in function_class_depths:
+                depth = min(depth, function_class_depths[function_class_name])
+            function_class_depths[function_class_name] = depth
+
+    return {
+        TechniqueParameter.FUNCTION_NAMES_TUPLE: function_class_names_tuple,
+        TechniqueParameter.TEST_NAMES_TUPLE: test_class_names_tuple,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TESTS: _roll_up_set_dict(
+            function_level_technique_parameter_map[
+                TechniqueParameter.FUNCTIONS_CALLED_BY_TESTS
+            ],
+            test_class_names,
+            function_class_names,
+        ),
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT: function_classes_called_by_test_count,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH: function_classes_called_by_test_depth,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_BEFORE_ASSERT: _roll_up_set_dict(
+            function_level_technique_parameter_map[
+                TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_BEFORE_ASSERT
+            ],
+            test_class_names,
+            function_class_names,
+        ),
+        TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS: _roll_up_set_dict(
+            function_level_technique_parameter_map[
+                TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS
+            ],
+            function_class_names,
+            test_class_names,
+        ),
+    }
+
+
+def merge_technique_parameters(
+    technique_parameter_maps: List[Dict[TechniqueParameter, Any]]
+) -> Dict[TechniqueParameter, Any]:
+    """
+    Merge technique parameters parsed from separate parts of the same trace log.
+    The parts must be split on test boundaries, so that each test segment is
+    parsed as a whole. Name tuples and called sets are unioned, call counts are
+    summed, and the lowest call depth is kept. The merged sets are built by adding
+    the values of each part in the order of the maps, so when the parts are given in
+    file order and parsed with InsertionOrderedSet, each set is built in the same
+    order as parsing the whole trace log builds it, and iterates in the same order.
+
+    Args:
+        technique_parameter_maps (List[Dict[TechniqueParameter, Any]]): A list of
+        technique parameter maps, each parsed from a part of the trace log.
+
+    Returns:
+        Dict[TechniqueParameter, Any]: The technique parameter map for the whole
+        trace log.
+    """
+    function_names_tuple = set()
+    test_names_tuple = set()
+    functions_called_by_tests = defaultdict(set)
+    functions_called_by_test_count = defaultdict(partial(defaultdict, int))
+    functions_called_by_test_depth = defaultdict(dict)
+    functions_called_by_test_before_assert = defaultdict(set)
+    tests_that_call_functions = defaultdict(set)
+
+    for technique_parameter_map in technique_parameter_maps:
+        _merge_set(
+            function_names_tuple,
+            technique_parameter_map[TechniqueParameter.FUNCTION_NAMES_TUPLE],
+        )
+        _merge_set(
+            test_names_tuple,
+            technique_parameter_map[TechniqueParameter.TEST_NAMES_TUPLE],
+        )
+        _merge_set_dict(
+            functions_called_by_tests,
+            technique_parameter_map[TechniqueParameter.FUNCTIONS_CALLED_BY_TESTS],
+        )
+        _merge_set_dict(
+            functions_called_by_test_before_assert,
+            technique_parameter_map[
+                TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_BEFORE_ASSERT
+            ],
+        )
+        _merge_set_dict(
+            tests_that_call_functions,
+            technique_parameter_map[TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS],
+        )
+
+        for test, function_counts in technique_parameter_map[
+            TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT
+        ].items():
+            for function, count in function_counts.items():
+                functions_called_by_test_count[test][function] += count
+
+        for test, function_depths in technique_parameter_map[
+            TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH
+        ].items():
+            merged_function_depths = functions_called_by_test_depth[test]
+            for function, depth in function_depths.items():
+                if function in merged_function_depths:
+                    depth = min(depth, merged_function_depths[function])
+                merged_function_depths[function] = depth
+
+    return {
+        TechniqueParameter.FUNCTION_NAMES_TUPLE: function_names_tuple,
+        TechniqueParameter.TEST_NAMES_TUPLE: test_names_tuple,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TESTS: functions_called_by_tests,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT: functions_called_by_test_count,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH: functions_called_by_test_depth,
+        TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_BEFORE_ASSERT: (
+            functions_called_by_test_before_assert
+        ),
+        TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS: tests_that_call_functions,
+    }
+
+
+def _merge_set(merged_set: Set[Any], values: Iterable[Any]) -> None:
+    # Values are added one at a time, as the parsers add them, since updating a
+    # set from another set lays it out differently, which changes its order
+    for value in values:
+        merged_set.add(value)
+
+
+def _merge_set_dict(
+    merged_set_dict: Dict[str, Set[str]], set_dict: Dict[str, Set[str]]
+) -> None:
+    for key, values in set_dict.items():
+        _merge_set(merged_set_dict[key], values)
+
+
+def _select_test_segments(
+    trace_data: List[Dict[str, str]],
+    tests_to_parse: Optional[Set[str]],
+    test_name_header: TraceDataHeader,
+) -> List[Dict[str, str]]:
+    # The calls of each test are only parsed from the records between its call
+    # and return, so the segments of the other tests can be left out entirely
+    if tests_to_parse is None:
+        return trace_data
+
+    test_trace_data = []
+    in_test_to_parse = False
+    for record in trace_data:
+        if record[TraceDataHeader.TESTNG_METHOD] == TestingMethodType.TEST_METHOD_CALL:
+            in_test_to_parse = record[test_name_header] in tests_to_parse
+        if in_test_to_parse:
+            test_trace_data.append(record)
+            if (
+                record[TraceDataHeader.TESTNG_METHOD]
+                == TestingMethodType.TEST_METHOD_RETURN
+            ):
+                in_test_to_parse = False
+
+    return test_trace_data
+
+
+def _roll_up_set_dict(
+    set_dict: Dict[str, Set[str]],
+    key_classes: Dict[str, str],
+    value_classes: Dict[str, str],
+) -> Dict[str, Set[str]]:
+    # Classes are only added once they have a value, so that classes with no
+    # calls are missing from the result, as they are from the parsed one
+    rolled_up_set_dict = defaultdict(set)
+    for key, values in set_dict.items():
+        key_class = key_classes.get(key)
+        if key_class is None:
+            continue
+        value_classes_for_key = {
+            value_classes[value] for value in values if value in value_classes
+        }
+        if value_classes_for_key:
+            rolled_up_set_dict[key_class].update(value_classes_for_key)
+
+    return rolled_up_set_dict
+
+
+__all__ = [
+    "parse_technique_parameters",
+    "parse_technique_parameters_for_levels",
+    "parse_function_level_technique_parameters_and_classes",
+    "parse_function_level_technique_parameters",
+    "parse_class_level_technique_parameters",
+    "roll_up_class_level_technique_parameters",
+    "merge_technique_parameters",
+]
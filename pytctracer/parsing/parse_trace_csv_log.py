@@ -0,0 +1,194 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+from pytctracer.config.constants import LevelType, TechniqueParameter
+from pytctracer.io.input import read_trace_csv_log_mmap, find_trace_chunk_boundaries
+from pytctracer.io.index import (
+    load_trace_segment_index,
+    find_trace_chunk_boundaries_from_index,
+)
+from pytctracer.parsing.insertion_ordered_set import InsertionOrderedSet
+from pytctracer.parsing.parse_technique_parameters import (
+    parse_technique_parameters_for_levels,
+    parse_function_level_technique_parameters_and_classes,
+    roll_up_class_level_technique_parameters,
+    merge_technique_parameters,
+)
+
+# Split the trace log into more chunks than workers, so that workers which
+# finish early can pick up the remaining chunks
+CHUNKS_PER_PARSE_JOB = 4
+
+
+def parse_trace_csv_log(
+    trace_csv_log_path: str,
+    traceability_levels: List[LevelType],
+    parse_jobs: int = 1,
+    tests_to_parse: Optional[Dict[LevelType, Set[str]]] = None,
+) -> Dict[LevelType, Dict[TechniqueParameter, Any]]:
+    """
+    Read and parse a trace log CSV file into the parameters required by the
+    traceability techniques, at each of the given levels of traceability. When more
+    than one parse job is given, the trace log is split into chunks on test method
+    boundaries, and the chunks are read and parsed in separate processes before
+    being merged back together. If the trace log has a valid test segment index,
+    the chunks are split using the index rather than by scanning the trace log.
+    The trace log is read through a memory map, so each process reads its chunk
+    straight from the mapped file, and only the columns used by the parsers
+    are decoded. When both levels are given, the trace log is parsed once, at the
+    function level, and the class level is rolled up from it. The parameters parsed
+    with more than one parse job are the same as those parsed with one, including
+    the order the names and calls iterate in.
+
+    Args:
+        trace_csv_log_path (str): The path to the trace log CSV file.
+        traceability_levels (List[LevelType]): The levels of traceability to parse for.
+        parse_jobs (int): The number of processes to parse the trace log with.
+        tests_to_parse (Optional[Dict[LevelType, Set[str]]]): The fully qualified names
+        of the tests or test classes to parse the calls of each test for, at each level.
+        The names of every test, and the tests that call each function, are still
+        parsed from every test. Every test is parsed at the levels that are missing,
+        or if omitted.
+
+    Returns:
+        Dict[LevelType, Dict[TechniqueParameter, Any]]: A dictionary where the keys are
+        the traceability levels, and the values are the technique parameter maps parsed
+        at that level.
+    """
+    if parse_jobs <= 1:
+        trace_data = read_trace_csv_log_mmap(trace_csv_log_path)
+        return parse_technique_parameters_for_levels(
+            trace_data, traceability_levels, tests_to_parse
+        )
+
+    chunk_boundaries = _find_chunk_boundaries(
+        trace_csv_log_path, parse_jobs * CHUNKS_PER_PARSE_JOB
+    )
+
+    roll_up_class_level = (
+        LevelType.FUNCTION in traceability_levels
+        and LevelType.CLASS in traceability_levels
+    )
+    with ProcessPoolExecutor(max_workers=parse_jobs) as executor:
+        if roll_up_class_level:
+            futures = [
+                executor.submit(
+                    _parse_trace_chunk_and_classes,
+                    trace_csv_log_path,
+                    start,
+                    end,
+                    tests_to_parse,
+                )
+                for start, end in chunk_boundaries
+            ]
+        else:
+            futures = [
+                executor.submit(
+                    _parse_trace_chunk,
+                    trace_csv_log_path,
+                    start,
+                    end,
+                    traceability_levels,
+                    tests_to_parse,
+                )
+                for start, end in chunk_boundaries
+            ]
+        # The chunks are merged in file order, which adds the values of each set in
+        # the order they first appear in the trace log, as a sequential parse does
+        chunk_results = [future.result() for future in futures]
+
+    if roll_up_class_level:
+        return _merge_trace_chunks_and_roll_up(chunk_results, traceability_levels)
+
+    return {
+        level: merge_technique_parameters(
+            [
+                technique_parameter_maps[level]
+                for technique_parameter_maps in chunk_results
+            ]
+        )
+        for level in traceability_levels
+    }
+
+
+def _find_chunk_boundaries(
+    trace_csv_log_path: str, number_of_chunks: int
+) -> List[Tuple[int, int]]:
+    trace_segment_index = load_trace_segment_index(trace_csv_log_path)
+    if trace_segment_index is None:
+        return find_trace_chunk_boundaries(trace_csv_log_path, number_of_chunks)
+
+    return find_trace_chunk_boundaries_from_index(trace_segment_index, number_of_chunks)
+
+
+def _parse_trace_chunk(
+    trace_csv_log_path: str,
+    start: int,
+    end: int,
+    traceability_levels: List[LevelType],
+    tests_to_parse: Optional[Dict[LevelType, Set[str]]],
+) -> Dict[LevelType, Dict[TechniqueParameter, Any]]:
+    # Only the chunk's offsets are sent to the worker, which maps the trace log
+    # itself rather than being sent a copy of the chunk
+    trace_data = read_trace_csv_log_mmap(trace_csv_log_path, [(start, end)])
+
+    return parse_technique_parameters_for_levels(
+        trace_data, traceability_levels, tests_to_parse, InsertionOrderedSet
+    )
+
+
+def _parse_trace_chunk_and_classes(
+    trace_csv_log_path: str,
+    start: int,
+    end: int,
+    tests_to_parse: Optional[Dict[LevelType, Set[str]]],
+) -> Tuple[
+    Dict[TechniqueParameter, Any],
+    Dict[str, Tuple[str, str]],
+    Dict[str, Tuple[str, str]],
+]:
+    # The class level is rolled up once the chunks are merged, as its sets are
+    # built from the merged function level ones
+    trace_data = read_trace_csv_log_mmap(trace_csv_log_path, [(start, end)])
+
+    return parse_function_level_technique_parameters_and_classes(
+        trace_data, tests_to_parse, InsertionOrderedSet
+    )
+
+
+def _merge_trace_chunks_and_roll_up(
+    chunk_results: List[
+        Tuple[
+            Dict[TechniqueParameter, Any],
+            Dict[str, Tuple[str, str]],
+            Dict[str, Tuple[str, str]],
+        ]
+    ],
+    traceability_levels: List[LevelType],
+) -> Dict[LevelType, Dict[TechniqueParameter, Any]]:
+    # Each function and test keeps the class it first appears with, as it does
+    # when the classes are found in the whole trace log
+    function_classes = {}
+    test_classes = {}
+    for _, chunk_function_classes, chunk_test_classes in chunk_results:
+        for function_name, function_class in chunk_function_classes.items():
+            function_classes.setdefault(function_name, function_class)
+        for test_name, test_class in chunk_test_classes.items():
+            test_classes.setdefault(test_name, test_class)
+    function_level_technique_parameter_map = merge_technique_parameters(
+        [technique_parameter_map for technique_parameter_map, _, _ in chunk_results]
+    )
+    class_level_technique_parameter_map = roll_up_class_level_technique_parameters(
+        function_level_technique_parameter_map, function_classes, test_classes
+    )
+
+    return {
+        level: (
+            function_level_technique_parameter_map
+            if level == LevelType.FUNCTION
+            else class_level_technique_parameter_map
+        )
+        for level in traceability_levels
+    }
+
+
+__all__ = ["parse_trace_csv_log"]
@@ -0,0 +1,120 @@
+from typing import Any, Dict, List, Optional, Set
+from pytctracer.config.constants import LevelType, TechniqueParameter
+from pytctracer.io.cache import (
+    load_parsed_trace_cache,
+    write_parsed_trace_cache,
+    clear_parsed_trace_cache,
+)
+from pytctracer.parsing.parse_trace_csv_log import parse_trace_csv_log
+from pytctracer.parsing.name_vocabulary import encode_technique_parameter_map
+
+
+class TechniqueParameterLoader:
+    """
+    Class which loads the technique parameters of trace logs, with the names of
+    the tests and functions encoded as IDs. The parameters are loaded from the
+    parsed trace cache when it is valid. On a cache miss, the trace log is parsed
+    at both levels, so that the cache serves either level, and the cache is
+    written. Without the cache, the trace log is only parsed at the levels asked
+    for, and only for the tests asked for.
+
+    Attributes:
+        use_parsed_trace_cache (bool): Whether to load and store the parsed parameters
+        in the parsed trace cache.
+        cache_directory (Optional[str]): The directory to store cache files in.
+        parse_jobs (int): The number of processes to read and parse trace logs with.
+    """
+
+    def __init__(
+        self,
+        use_parsed_trace_cache: bool = True,
+        cache_directory: Optional[str] = None,
+        parse_jobs: int = 1,
+    ) -> None:
+        """
+        Class which loads the technique parameters of trace logs.
+
+        Args:
+            use_parsed_trace_cache (bool): Whether to load and store the parsed
+            parameters in the parsed trace cache.
+            cache_directory (Optional[str]): The directory to store cache files in. If
+            omitted, the cache file is stored next to the trace log.
+            parse_jobs (int): The number of processes to read and parse trace logs with.
+        """
+        self.use_parsed_trace_cache = use_parsed_trace_cache
+        self.cache_directory = cache_directory
+        self.parse_jobs = parse_jobs
+
+    def load_technique_parameter_maps(
+        self,
+        trace_csv_log_path: str,
+        traceability_levels: List[LevelType],
+        tests_to_parse: Optional[Dict[LevelType, Optional[Set[str]]]] = None,
+    ) -> Dict[LevelType, Dict[TechniqueParameter, Any]]:
+        """
+        Load the technique parameters of a trace log at each of the given levels.
+
+        Args:
+            trace_csv_log_path (str): The path to the trace log CSV file.
+            traceability_levels (List[LevelType]): The levels to load the parameters at.
+            tests_to_parse (Optional[Dict[LevelType, Optional[Set[str]]]]): The tests or
+            test classes to parse the calls of at each level, when the trace log is
+            parsed without the cache. If omitted, or None for a level, every test is
+            parsed.
+
+        Returns:
+            Dict[LevelType, Dict[TechniqueParameter, Any]]: A dictionary where the keys
+            are the traceability levels, and the values are the technique parameter maps
+            at that level.
+        """
+        if not self.use_parsed_trace_cache:
+            # Only a parse for this run alone can leave out the calls of the
+            # tests that aren't scored, as the cache serves every run
+            return {
+                level: encode_technique_parameter_map(technique_parameter_map)
+                for level, technique_parameter_map in parse_trace_csv_log(
+                    trace_csv_log_path,
+                    traceability_levels,
+                    self.parse_jobs,
+                    tests_to_parse,
+                ).items()
+            }
+
+        return self._load_cached_technique_parameter_maps(
+            trace_csv_log_path, traceability_levels
+        )
+
+    def clear_parsed_trace_cache(self, trace_csv_log_path: str) -> bool:
+        """
+        Remove the parsed trace cache of a trace log, if one exists.
+
+        Args:
+            trace_csv_log_path (str): The path to the trace log CSV file.
+
+        Returns:
+            bool: Whether a cache file was removed.
+        """
+        return clear_parsed_trace_cache(trace_csv_log_path, self.cache_directory)
+
+    def _load_cached_technique_parameter_maps(
+        self, trace_csv_log_path: str, traceability_levels: List[LevelType]
+    ) -> Dict[LevelType, Dict[TechniqueParameter, Any]]:
+        technique_parameter_maps = load_parsed_trace_cache(
+            trace_csv_log_path, self.cache_directory
+        )
+        if technique_parameter_maps is None:
+            # Parse both levels on a cache miss, so the cache serves either level
+            technique_parameter_maps = {
+                level: encode_technique_parameter_map(technique_parameter_map)
+                for level, technique_parameter_map in parse_trace_csv_log(
+                    trace_csv_log_path, list(LevelType), self.parse_jobs
+                ).items()
+            }
+            write_parsed_trace_cache(
+                trace_csv_log_path, technique_parameter_maps, self.cache_directory
+            )
+
+        return {level: technique_parameter_maps[level] for level in traceability_levels}
+
+
+__all__ = ["TechniqueParameterLoader"]
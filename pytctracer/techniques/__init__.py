@@ -1,4 +1,7 @@
 from .technique import Technique
+from .traceability_scores import TraceabilityScores
+from .similarity_cache import SimilarityCache
+from .incremental_scoring_state import IncrementalScoringState
 from .naming_conventions import NamingConventions, NamingConventionsContains
 from .last_call_before_assert import LastCallBeforeAssert
 from .levenshtein_distance import LevenshteinDistance
@@ -11,9 +14,13 @@ from .tarantula import Tarantula
 from .tfidf import TFIDF, TFIDFMultiset
 from .combined import Combined
 from .arg_name_to_technique_mapper import ArgNameToTechniqueMapper
+from .technique_runner import TechniqueRunner, run_technique
 
 __all__ = [
     "Technique",
+    "TraceabilityScores",
+    "SimilarityCache",
+    "IncrementalScoringState",
     "NamingConventions",
     "NamingConventionsContains",
     "LastCallBeforeAssert",
@@ -26,4 +33,6 @@ __all__ = [
     "TFIDFMultiset",
     "ArgNameToTechniqueMapper",
     "Combined",
+    "TechniqueRunner",
+    "run_technique",
 ]
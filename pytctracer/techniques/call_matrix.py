@@ -0,0 +1,215 @@
+from typing import Dict, Iterable, List, Tuple, Union
+import numpy as np
+from scipy.sparse import csr_matrix
+from pytctracer.techniques.traceability_scores import TraceabilityScores
+
+
+def create_call_matrix(
+    function_names_tuple: List[Tuple[str, str]],
+    test_names_tuple: List[Tuple[str, str]],
+    functions_called_by_tests: Dict[str, Union[Iterable[str], Dict[str, int]]],
+) -> csr_matrix:
+    """
+    Create a sparse test by function matrix of the functions called by each
+    test. There is a row for each test in the test names tuple and a column for
+    each function in the function names tuple, in the same order, and a stored
+    entry for each function a test called. Entries are the number of times the
+    function was called if the called functions of each test are given with
+    their call counts, or one otherwise.
+
+    Args:
+        function_names_tuple (List[Tuple[str, str]]): A list of tuples,
+        where the first element of each tuple is the fully qualified
+        (full path) name of a function or function class, and the second
+        element is the short name of the function or function class.
+
+        test_names_tuple (List[Tuple[str, str]]): A list of tuples,
+        where the first element of each tuple is the fully qualified
+        (full path) name of a test or test class, and the second element
+        is the short name of the test or test class.
+
+        functions_called_by_tests (Dict[str, Union[Iterable[str], Dict[str, int]]]):
+        A dictionary where the keys are the fully qualified names of the test or
+        test classes, and the values contain the fully qualified names of each
+        function or function class invoked, optionally mapped to the number of
+        times it was invoked.
+
+    Returns:
+        csr_matrix: The test by function call matrix.
+    """
+    fully_qualified_function_names = _list_fully_qualified_names(function_names_tuple)
+    function_positions = {
+        fully_qualified_function_name: position
+        for position, fully_qualified_function_name in enumerate(
+            fully_qualified_function_names
+        )
+    }
+    row_starts = [0]
+    column_positions = []
+    entries = []
+    for fully_qualified_test_name, _ in test_names_tuple:
+        functions_called_by_test = functions_called_by_tests.get(
+            fully_qualified_test_name, ()
+        )
+        called_function_positions = sorted(
+            function_positions[fully_qualified_function_name]
+            for fully_qualified_function_name in functions_called_by_test
+            if fully_qualified_function_name in function_positions
+        )
+        column_positions.extend(called_function_positions)
+        if isinstance(functions_called_by_test, dict):
+            entries.extend(
+                functions_called_by_test[fully_qualified_function_names[position]]
+                for position in called_function_positions
+            )
+        else:
+            entries.extend([1] * len(called_function_positions))
+        row_starts.append(len(column_positions))
+
+    return csr_matrix(
+        (
+            np.array(entries, dtype=np.float64),
+            np.array(column_positions, dtype=np.int64),
+            np.array(row_starts, dtype=np.int64),
+        ),
+        shape=(len(test_names_tuple), len(function_names_tuple)),
+    )
+
+
+def discount_call_matrix(
+    score_matrix: csr_matrix,
+    function_names_tuple: List[Tuple[str, str]],
+    test_names_tuple: List[Tuple[str, str]],
+    functions_called_by_test_depth: Dict[str, Dict[str, int]],
+    discount_factor: float,
+) -> csr_matrix:
+    """
+    Discount the scores in a test by function score matrix by the call depth
+    of each function in place, multiplying each score by the discount factor to
+    the power of one less than the depth. Functions without a recorded depth for
+    a test are left undiscounted.
+
+    Args:
+        score_matrix (csr_matrix): The test by function score matrix.
+        function_names_tuple (List[Tuple[str, str]]): The function names tuple the
+        columns of the matrix were created from.
+        test_names_tuple (List[Tuple[str, str]]): The test names tuple the rows of
+        the matrix were created from.
+        functions_called_by_test_depth (Dict[str, Dict[str, int]]): A dictionary
+        where the keys are the fully qualified names of the test or test classes,
+        and the values are dictionaries containing the fully qualified names of
+        each function or function class invoked and the depth of the call.
+        discount_factor (float): The factor to discount scores by for each level of
+        call depth.
+
+    Returns:
+        csr_matrix: The discounted score matrix.
+    """
+    depth_matrix = create_call_matrix(
+        function_names_tuple, test_names_tuple, functions_called_by_test_depth
+    )
+    score_matrix.sort_indices()
+    # Both matrices have sorted columns in each row, so the entries of each are in
+    # order of their positions in the flattened matrix, and the depth of each
+    # score is found by searching for its position among those of the depths
+    number_of_columns = score_matrix.shape[1]
+    score_positions = _find_flattened_positions(score_matrix, number_of_columns)
+    depth_positions = _find_flattened_positions(depth_matrix, number_of_columns)
+    discount_exponents = np.zeros(score_matrix.nnz, dtype=np.float64)
+    if depth_matrix.nnz > 0:
+        depth_entries = np.minimum(
+            np.searchsorted(depth_positions, score_positions), depth_matrix.nnz - 1
+        )
+        has_depth = depth_positions[depth_entries] == score_positions
+        discount_exponents[has_depth] = depth_matrix.data[depth_entries[has_depth]] - 1
+
+    score_matrix.data *= np.power(discount_factor, discount_exponents)
+
+    return score_matrix
+
+
+def normalise_call_matrix(score_matrix: csr_matrix) -> csr_matrix:
+    """
+    Normalise each row of a test by function score matrix by its maximum score
+    in place, leaving rows whose maximum score is not positive as they are.
+
+    Args:
+        score_matrix (csr_matrix): The test by function score matrix.
+
+    Returns:
+        csr_matrix: The normalised score matrix.
+    """
+    row_lengths = np.diff(score_matrix.indptr)
+    non_empty_rows = row_lengths > 0
+    max_scores = np.zeros(score_matrix.shape[0], dtype=np.float64)
+    if score_matrix.nnz > 0:
+        # Empty rows store no entries, so the entries between the starts of
+        # consecutive non-empty rows are exactly the entries of each row
+        max_scores[non_empty_rows] = np.maximum.reduceat(
+            score_matrix.data, score_matrix.indptr[:-1][non_empty_rows]
+        )
+    # The initial maximum is zero, as when normalising a dictionary of scores
+    max_scores = np.maximum(max_scores, 0)
+    divisors = np.where(max_scores > 0, max_scores, 1)
+
+    score_matrix.data /= np.repeat(divisors, row_lengths)
+
+    return score_matrix
+
+
+def convert_call_matrix_to_traceability_scores(
+    score_matrix: csr_matrix,
+    function_names_tuple: List[Tuple[str, str]],
+    test_names_tuple: List[Tuple[str, str]],
+) -> TraceabilityScores:
+    """
+    Convert a test by function score matrix into a sparse store of traceability
+    scores, with a score for each stored entry of the matrix.
+
+    Args:
+        score_matrix (csr_matrix): The test by function score matrix.
+        function_names_tuple (List[Tuple[str, str]]): The function names tuple the
+        columns of the matrix were created from.
+        test_names_tuple (List[Tuple[str, str]]): The test names tuple the rows of
+        the matrix were created from.
+
+    Returns:
+        TraceabilityScores: The traceability scores for each test-to-code pair.
+    """
+    fully_qualified_function_names = _list_fully_qualified_names(function_names_tuple)
+    traceability_scores = TraceabilityScores(
+        function_names=fully_qualified_function_names
+    )
+    row_starts = score_matrix.indptr.tolist()
+    column_positions = score_matrix.indices.tolist()
+    scores = score_matrix.data.tolist()
+    for row, (fully_qualified_test_name, _) in enumerate(test_names_tuple):
+        start = row_starts[row]
+        end = row_starts[row + 1]
+        traceability_scores[fully_qualified_test_name] = {
+            fully_qualified_function_names[position]: score
+            for position, score in zip(column_positions[start:end], scores[start:end])
+        }
+
+    return traceability_scores
+
+
+def _find_flattened_positions(matrix: csr_matrix, number_of_columns: int) -> np.ndarray:
+    # The position of each stored entry in the matrix flattened a row at a time
+    rows = np.repeat(np.arange(matrix.shape[0], dtype=np.int64), np.diff(matrix.indptr))
+
+    return rows * number_of_columns + matrix.indices
+
+
+def _list_fully_qualified_names(names_tuple: Iterable[Tuple[str, str]]) -> List[str]:
+    # The names tuples may be sets, whose iteration order is the same each time
+    # they are iterated over, which gives the order of the rows and columns
+    return [fully_qualified_name for fully_qualified_name, _ in names_tuple]
+
+
+__all__ = [
+    "create_call_matrix",
+    "discount_call_matrix",
+    "normalise_call_matrix",
+    "convert_call_matrix_to_traceability_scores",
+]
@@ -1,6 +1,10 @@
-from typing import Dict
-from collections import defaultdict
+import heapq
+import math
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 from pytctracer.techniques.technique import Technique
+from pytctracer.techniques.traceability_scores import TraceabilityScores
 from pytctracer.config.constants import TechniqueThreshold
 
 
@@ -9,7 +13,8 @@ class Combined(Technique):
     Class implementing the Combined
     traceability technique. This technique doesn't run any specific
     traceability algorithm, but instead combines the results of other
-    techniques through a simple average.
+    techniques through an average, weighted by the weight given to each
+    technique. Without weights, this is a simple average.
 
     Attributes:
         full_name (str): The full name of the technique.
@@ -25,6 +30,8 @@ class Combined(Technique):
         normalise (bool): A boolean indicating whether the technique normalises scores.
         call_depth_discount (bool): A boolean indicating whether the technique
         discounts scores based on call depth.
+        weights (Dict[str, float]): The weight of each technique to combine, keyed by
+        its arg name. Techniques without a weight have a weight of one.
     """
 
     full_name = "Combined"
@@ -36,14 +43,34 @@ class Combined(Technique):
     threshold = TechniqueThreshold.THRESHOLD_FOR_COMBINED
     normalise = True
 
+    def __init__(self, weights: Optional[Dict[str, float]] = None, **kwargs) -> None:
+        """
+        Class implementing the Combined traceability technique.
+
+        Args:
+            weights (Optional[Dict[str, float]]): The weight of each technique to
+            combine, keyed by its arg name, which must be finite and not negative. If
+            omitted, every technique has a weight of one.
+            **kwargs: The options of the technique, as for any other technique.
+        """
+        super().__init__(**kwargs)
+        self.weights = dict(weights) if weights else {}
+        for technique_arg_name, weight in self.weights.items():
+            if not math.isfinite(weight) or weight < 0:
+                raise ValueError(
+                    f"Weight of technique '{technique_arg_name}' must be a finite number "
+                    f"that isn't negative, but got {weight}."
+                )
+
     def run(
         self, traceability_scores_for_techniques: Dict[str, Dict[str, Dict[str, float]]]
     ) -> Dict[str, Dict[str, float]]:
         """
         Invokes the Combined traceability technique to produce traceability scores
-        for each test-to-code pair given. This simply takes the traceability scores
-        for each test-to-code pair from each technique, and produces the simple mean of
-        them.
+        for each test-to-code pair given. This takes the traceability scores for each
+        test-to-code pair from each technique, and produces the weighted mean of them.
+        The tests are combined one at a time with combine_score_rows, in the order
+        they first appear in the scores of the techniques.
 
         Args:
             traceability_scores_for_techniques (Dict[str, Dict[str, Dict[str, float]]]):
@@ -57,25 +84,139 @@ class Combined(Technique):
             names of the testor test classes, and the values are dictionaries containing the
             traceability scores for each function or function class.
         """
-        number_of_techniques_to_combine = len(traceability_scores_for_techniques)
-        combined_scores = None
-        for _, traceability_scores in traceability_scores_for_techniques.items():
-            if combined_scores is None:
-                combined_scores = defaultdict(lambda: defaultdict(float))
-
-            for (
-                fully_qualified_test_name,
-                function_scores,
-            ) in traceability_scores.items():
-                for fully_qualified_function_name, score in function_scores.items():
-                    combined_scores[fully_qualified_test_name][
-                        fully_qualified_function_name
-                    ] += (score / number_of_techniques_to_combine)
+        if not traceability_scores_for_techniques:
+            return None
 
-        if self.normalise:
-            combined_scores = self._normalise_dict(combined_scores)
+        combined_scores = TraceabilityScores()
+        test_names = {}
+        for traceability_scores in traceability_scores_for_techniques.values():
+            # Pairs a technique didn't score contribute zero to the average
+            combined_scores.function_names.update(
+                getattr(traceability_scores, "function_names", ())
+            )
+            test_names.update(dict.fromkeys(traceability_scores))
+
+        # The scores of each technique are keyed in the order it scored the tests
+        # in, which can differ between techniques, so each technique's rows are
+        # put in the order of every test before they are merged
+        score_rows_for_techniques = {
+            technique_arg_name: _order_score_rows(traceability_scores, test_names)
+            for technique_arg_name, traceability_scores in (
+                traceability_scores_for_techniques.items()
+            )
+        }
+        combined_scores.update(
+            self.combine_score_rows(score_rows_for_techniques, test_names)
+        )
 
         return combined_scores
 
+    def combine_score_rows(
+        self,
+        score_rows_for_techniques: Dict[str, Iterable[Tuple[str, Dict[str, float]]]],
+        test_names: Iterable[str],
+    ) -> Iterator[Tuple[str, Dict[str, float]]]:
+        """
+        Combine the score rows of each technique one test at a time. The rows of each
+        technique must be in the order of the given tests, so that the rows of every
+        technique can be merged as a k-way merge of sorted streams, and a ValueError is
+        raised for a row that is out of order. Every technique given a weight must have
+        rows to combine. The rows are taken from the full traceability scores of each
+        technique, as in run.
+
+        Args:
+            score_rows_for_techniques (Dict[str, Iterable[Tuple[str, Dict[str, float]]]]):
+            A dictionary where the keys are the arg names of the techniques, and the
+            values are iterables of the fully qualified name of each test or test class,
+            and a dictionary containing its traceability scores for each function or
+            function class.
+            test_names (Iterable[str]): The fully qualified names of every test or test
+            class in the rows, in the order the rows are produced in.
+
+        Returns:
+            Iterator[Tuple[str, Dict[str, float]]]: An iterator of the fully qualified
+            name of each test or test class, in the order of the given tests, and a
+            dictionary containing its combined traceability scores for each function or
+            function class.
+        """
+        techniques_not_combined = set(self.weights) - set(score_rows_for_techniques)
+        if techniques_not_combined:
+            raise ValueError(
+                "Weights were given for techniques that aren't combined: "
+                f"{', '.join(sorted(techniques_not_combined))}."
+            )
+
+        test_names = list(test_names)
+        test_positions = {
+            fully_qualified_test_name: position
+            for position, fully_qualified_test_name in enumerate(test_names)
+        }
+        technique_weights = [
+            self.weights.get(technique_arg_name, 1)
+            for technique_arg_name in score_rows_for_techniques
+        ]
+        total_weight = sum(technique_weights)
+        if total_weight <= 0:
+            raise ValueError(
+                "The weights of the techniques to combine must not all be zero."
+            )
+
+        # The technique's index breaks ties between the rows of the same test, so
+        # the rows of each test are added in the order of the techniques
+        merged_score_rows = heapq.merge(
+            *(
+                _index_score_rows(score_rows, test_positions, technique_index)
+                for technique_index, score_rows in enumerate(
+                    score_rows_for_techniques.values()
+                )
+            )
+        )
+        for test_position, score_rows_for_test in groupby(
+            merged_score_rows, key=itemgetter(0)
+        ):
+            fully_qualified_test_name = test_names[test_position]
+            combined_scores_for_test = {}
+            for _, technique_index, function_scores in score_rows_for_test:
+                weight = technique_weights[technique_index]
+                for fully_qualified_function_name, score in function_scores.items():
+                    combined_scores_for_test[fully_qualified_function_name] = (
+                        combined_scores_for_test.get(fully_qualified_function_name, 0.0)
+                        + score * weight / total_weight
+                    )
+
+            self._discount_and_normalise_scores(
+                {fully_qualified_test_name: combined_scores_for_test}
+            )
+            yield fully_qualified_test_name, combined_scores_for_test
+
+
+def _order_score_rows(
+    traceability_scores: Dict[str, Dict[str, float]], test_names: Iterable[str]
+) -> Iterator[Tuple[str, Dict[str, float]]]:
+    for fully_qualified_test_name in test_names:
+        scores_for_test = traceability_scores.get(fully_qualified_test_name)
+        if scores_for_test is not None:
+            yield fully_qualified_test_name, scores_for_test
+
+
+def _index_score_rows(
+    score_rows: Iterable[Tuple[str, Dict[str, float]]],
+    test_positions: Dict[str, int],
+    technique_index: int,
+) -> Iterator[Tuple[int, int, Dict[str, float]]]:
+    # Keyed by the position of the test, so the rows of the techniques can be
+    # merged without comparing the score dictionaries. A row out of order would
+    # split the rows of its test between several groups, so it is rejected
+    previous_test_position = -1
+    for fully_qualified_test_name, function_scores in score_rows:
+        test_position = test_positions[fully_qualified_test_name]
+        if test_position <= previous_test_position:
+            raise ValueError(
+                "The score rows of each technique must be in the order of the tests, "
+                f"but the row of test '{fully_qualified_test_name}' is out of order."
+            )
+        previous_test_position = test_position
+        yield test_position, technique_index, function_scores
+
 
 __all__ = ["Combined"]
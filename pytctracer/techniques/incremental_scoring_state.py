@@ -0,0 +1,255 @@
+from typing import Any, Dict, Iterable, List, Set
+from pytctracer.config.constants import TechniqueParameter
+from pytctracer.techniques.traceability_scores import TraceabilityScores
+
+# The parameters that map each test to what it called, whose entries for a test
+# are replaced as a whole when the test is traced again
+PER_TEST_PARAMETERS = (
+    TechniqueParameter.FUNCTIONS_CALLED_BY_TESTS,
+    TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT,
+    TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_DEPTH,
+    TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_BEFORE_ASSERT,
+)
+
+
+class IncrementalScoringState:
+    """
+    State of a traceability technique that has been run on a trace log, which can
+    be updated when tests are traced again, added or removed, without running
+    the technique on every test again. The state holds the technique parameters
+    of every test, the global statistics computed from them, such as the number
+    of tests that call each function, and the traceability scores of every test.
+    The state can be pickled, to be kept between runs.
+
+    Attributes:
+        technique_parameters (Dict[TechniqueParameter, Any]): The technique parameters
+        of every test, as the technique requires them.
+        global_statistics (Dict[str, Any]): The global statistics of the technique
+        computed from the technique parameters.
+        traceability_scores (TraceabilityScores): The traceability scores of every test.
+    """
+
+    def __init__(
+        self,
+        technique_parameters: Dict[TechniqueParameter, Any],
+        global_statistics: Dict[str, Any],
+        traceability_scores: TraceabilityScores,
+    ) -> None:
+        """
+        State of a traceability technique that has been run on a trace log.
+
+        Args:
+            technique_parameters (Dict[TechniqueParameter, Any]): The technique
+            parameters of every test, as the technique requires them.
+            global_statistics (Dict[str, Any]): The global statistics of the
+            technique computed from the technique parameters.
+            traceability_scores (TraceabilityScores): The traceability scores of
+            every test.
+        """
+        self.technique_parameters = technique_parameters
+        self.global_statistics = global_statistics
+        self.traceability_scores = traceability_scores
+
+    def apply_delta(
+        self,
+        delta_technique_parameters: Dict[TechniqueParameter, Any],
+        removed_test_names: Iterable[str] = (),
+    ) -> Set[str]:
+        """
+        Update the technique parameters with the tests that were traced again or
+        added, and without the tests that were removed. Tests traced again replace
+        what they previously called, and new tests and functions are added after
+        the existing ones.
+
+        Args:
+            delta_technique_parameters (Dict[TechniqueParameter, Any]): The technique
+            parameters parsed from a trace of only the tests that were traced again or
+            added.
+            removed_test_names (Iterable[str]): The fully qualified names of the tests
+            that were removed.
+
+        Returns:
+            Set[str]: The fully qualified names of the tests that were traced again,
+            added or removed.
+        """
+        technique_parameters = self.technique_parameters
+        delta_test_names_tuple = list(
+            delta_technique_parameters[TechniqueParameter.TEST_NAMES_TUPLE]
+        )
+        delta_test_names = {
+            fully_qualified_test_name
+            for fully_qualified_test_name, _ in delta_test_names_tuple
+        }
+        changed_test_names = delta_test_names | set(removed_test_names)
+
+        if TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS in technique_parameters:
+            self._remove_tests_that_call_functions(changed_test_names)
+            tests_that_call_functions = technique_parameters[
+                TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS
+            ]
+            for fully_qualified_function_name, test_names in delta_technique_parameters[
+                TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS
+            ].items():
+                tests_that_call_functions.setdefault(
+                    fully_qualified_function_name, set()
+                ).update(test_names)
+
+        for parameter in PER_TEST_PARAMETERS:
+            if parameter not in technique_parameters:
+                continue
+            values_for_tests = technique_parameters[parameter]
+            for fully_qualified_test_name in changed_test_names:
+                values_for_tests.pop(fully_qualified_test_name, None)
+            for fully_qualified_test_name, values in delta_technique_parameters[
+                parameter
+            ].items():
+                if fully_qualified_test_name in delta_test_names:
+                    values_for_tests[fully_qualified_test_name] = values
+
+        technique_parameters[TechniqueParameter.TEST_NAMES_TUPLE] = [
+            test_names
+            for test_names in technique_parameters[TechniqueParameter.TEST_NAMES_TUPLE]
+            if test_names[0] not in changed_test_names
+            or test_names[0] in delta_test_names
+        ]
+        existing_test_names = {
+            fully_qualified_test_name
+            for fully_qualified_test_name, _ in technique_parameters[
+                TechniqueParameter.TEST_NAMES_TUPLE
+            ]
+        }
+        technique_parameters[TechniqueParameter.TEST_NAMES_TUPLE].extend(
+            test_names
+            for test_names in delta_test_names_tuple
+            if test_names[0] not in existing_test_names
+        )
+
+        # Functions that are no longer called remain, with a score of zero
+        existing_function_names = set(
+            technique_parameters[TechniqueParameter.FUNCTION_NAMES_TUPLE]
+        )
+        technique_parameters[TechniqueParameter.FUNCTION_NAMES_TUPLE] = list(
+            technique_parameters[TechniqueParameter.FUNCTION_NAMES_TUPLE]
+        ) + [
+            function_names
+            for function_names in delta_technique_parameters[
+                TechniqueParameter.FUNCTION_NAMES_TUPLE
+            ]
+            if function_names not in existing_function_names
+        ]
+
+        return changed_test_names
+
+    def find_changed_functions(self, global_statistics: Dict[str, Any]) -> Set[str]:
+        """
+        Find the functions whose global statistics differ from those in the state.
+
+        Args:
+            global_statistics (Dict[str, Any]): The updated global statistics of the
+            technique, where each statistic is a dictionary with a value for each
+            function.
+
+        Returns:
+            Set[str]: The fully qualified names of the functions whose statistics changed.
+        """
+        changed_function_names = set()
+        for statistic, values in global_statistics.items():
+            previous_values = self.global_statistics.get(statistic, {})
+            changed_function_names.update(
+                fully_qualified_function_name
+                for fully_qualified_function_name in values.keys()
+                | previous_values.keys()
+                if values.get(fully_qualified_function_name)
+                != previous_values.get(fully_qualified_function_name)
+            )
+
+        return changed_function_names
+
+    def find_tests_that_call(self, function_names: Set[str]) -> Set[str]:
+        """
+        Find the tests that call any of the given functions.
+
+        Args:
+            function_names (Set[str]): The fully qualified names of the functions.
+
+        Returns:
+            Set[str]: The fully qualified names of the tests that call the functions.
+        """
+        if not function_names:
+            return set()
+
+        tests_that_call_functions = self.technique_parameters.get(
+            TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS
+        )
+        if tests_that_call_functions is None:
+            # Without the index, every test may call one of the functions
+            return {
+                fully_qualified_test_name
+                for fully_qualified_test_name, _ in self.technique_parameters[
+                    TechniqueParameter.TEST_NAMES_TUPLE
+                ]
+            }
+
+        return {
+            fully_qualified_test_name
+            for fully_qualified_function_name in function_names
+            for fully_qualified_test_name in tests_that_call_functions.get(
+                fully_qualified_function_name, ()
+            )
+        }
+
+    def list_test_names_tuple(self, test_names: Set[str]) -> List[tuple]:
+        """
+        List the names tuples of the given tests, in the order of the tests in the
+        state.
+
+        Args:
+            test_names (Set[str]): The fully qualified names of the tests.
+
+        Returns:
+            List[tuple]: The (fully qualified name, short name) tuple of each test.
+        """
+        return [
+            test_names_tuple
+            for test_names_tuple in self.technique_parameters[
+                TechniqueParameter.TEST_NAMES_TUPLE
+            ]
+            if test_names_tuple[0] in test_names
+        ]
+
+    def _remove_tests_that_call_functions(self, test_names: Set[str]) -> None:
+        # The functions each test previously called are looked up from the per
+        # test parameters where possible, rather than checking every function
+        tests_that_call_functions = self.technique_parameters[
+            TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS
+        ]
+        functions_called_by_tests = self.technique_parameters.get(
+            TechniqueParameter.FUNCTIONS_CALLED_BY_TESTS,
+            self.technique_parameters.get(
+                TechniqueParameter.FUNCTIONS_CALLED_BY_TEST_COUNT
+            ),
+        )
+        if functions_called_by_tests is None:
+            called_function_names = list(tests_that_call_functions)
+        else:
+            called_function_names = {
+                fully_qualified_function_name
+                for fully_qualified_test_name in test_names
+                for fully_qualified_function_name in functions_called_by_tests.get(
+                    fully_qualified_test_name, ()
+                )
+            }
+
+        for fully_qualified_function_name in called_function_names:
+            calling_test_names = tests_that_call_functions.get(
+                fully_qualified_function_name
+            )
+            if calling_test_names is None:
+                continue
+            calling_test_names.difference_update(test_names)
+            if not calling_test_names:
+                # Functions that no test calls have no entry, as when parsed
+                del tests_that_call_functions[fully_qualified_function_name]
+
+
+__all__ = ["IncrementalScoringState"]
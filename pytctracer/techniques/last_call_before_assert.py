@@ -1,5 +1,4 @@
 from typing import Dict, Union, List, Tuple, Set
-from collections import defaultdict
 from pytctracer.techniques.technique import Technique
 from pytctracer.config.constants import TechniqueParameter
 
@@ -59,24 +58,26 @@ class LastCallBeforeAssert(Technique):
             and the values are dictionaries containing the traceability scores
             for each function or function class.
         """
-        lcba_scores = defaultdict(dict)
+        lcba_scores = self._create_traceability_scores(
+            function_names_tuple, test_names_tuple
+        )
 
-        for fully_qualified_test_name, _ in test_names_tuple:
-            functions_called_by_test = functions_called_by_tests[
-                fully_qualified_test_name
-            ]
-            for fully_qualified_function_name, _ in function_names_tuple:
-                lcba_scores[fully_qualified_test_name][
-                    fully_qualified_function_name
-                ] = 0
-                if fully_qualified_function_name in functions_called_by_test:
-                    lcba_scores[fully_qualified_test_name][
-                        fully_qualified_function_name
-                    ] = self._compute_lcba_score(
+        for (
+            fully_qualified_test_name,
+            _,
+            called_functions,
+        ) in self._iterate_called_functions(
+            function_names_tuple, test_names_tuple, functions_called_by_tests
+        ):
+            lcba_scores_for_test = lcba_scores[fully_qualified_test_name]
+            for fully_qualified_function_name, _ in called_functions:
+                lcba_scores_for_test[fully_qualified_function_name] = (
+                    self._compute_lcba_score(
                         fully_qualified_function_name,
                         fully_qualified_test_name,
                         functions_called_by_test_before_assert,
                     )
+                )
 
         return lcba_scores
 
@@ -1,8 +1,10 @@
+import math
 from typing import Dict, Union, List, Tuple, Set
-from collections import defaultdict
 from pytctracer.techniques.technique import Technique
 from pytctracer.config.constants import TechniqueParameter, TechniqueThreshold
 
+BOUNDED_DISTANCE_TOLERANCE = 1e-9
+
 
 class LevenshteinDistance(Technique):
     """
@@ -64,60 +66,127 @@ class LevenshteinDistance(Technique):
             and the values are dictionaries containing the traceability scores
             for each function or function class.
         """
-        levenshtein_scores = defaultdict(dict)
-
-        for fully_qualified_test_name, test_name in test_names_tuple:
-            functions_called_by_test = functions_called_by_tests[
-                fully_qualified_test_name
-            ]
-            for fully_qualified_function_name, function_name in function_names_tuple:
-                levenshtein_scores[fully_qualified_test_name][
-                    fully_qualified_function_name
-                ] = 0
-                if fully_qualified_function_name in functions_called_by_test:
-                    levenshtein_scores[fully_qualified_test_name][
-                        fully_qualified_function_name
-                    ] = self._compute_levenshtein_score(function_name, test_name)
-
-        if self.call_depth_discount:
-            levenshtein_scores = self._use_call_depth_discounting_dict(
-                levenshtein_scores, functions_called_by_test_depth
-            )
-        if self.normalise:
-            levenshtein_scores = self._normalise_dict(levenshtein_scores)
+        levenshtein_scores = self._create_traceability_scores(
+            function_names_tuple, test_names_tuple
+        )
+        use_bounded_scores = self.prediction_only and self.threshold > 0
+
+        for (
+            fully_qualified_test_name,
+            test_name,
+            called_functions,
+        ) in self._iterate_called_functions(
+            function_names_tuple, test_names_tuple, functions_called_by_tests
+        ):
+            levenshtein_scores_for_test = levenshtein_scores[fully_qualified_test_name]
+            stripped_test_name = self._strip_test_name(test_name)
+            if use_bounded_scores:
+                levenshtein_scores_for_test.update(
+                    self._compute_bounded_levenshtein_scores(
+                        called_functions,
+                        stripped_test_name,
+                        functions_called_by_test_depth.get(
+                            fully_qualified_test_name, {}
+                        ),
+                    )
+                )
+                continue
+
+            for fully_qualified_function_name, function_name in called_functions:
+                levenshtein_scores_for_test[fully_qualified_function_name] = (
+                    self._compute_levenshtein_score(function_name, stripped_test_name)
+                )
+
+        levenshtein_scores = self._discount_and_normalise_scores(
+            levenshtein_scores, functions_called_by_test_depth
+        )
 
         return levenshtein_scores
 
-    def _compute_levenshtein_score(self, function_name: str, test_name: str) -> int:
-        stripped_test_name = self._strip_test_name(test_name)
+    def _compute_bounded_levenshtein_scores(
+        self,
+        called_functions: List[Tuple[str, str]],
+        stripped_test_name: str,
+        depths_for_test: Dict[str, int],
+    ) -> Dict[str, float]:
+        # Only the pairs that can reach the threshold once discounted and
+        # normalised are scored. The best discounted score is found first,
+        # checking pairs in order of their upper bound from the difference in
+        # name lengths, so the remaining pairs can be bounded by the threshold
+        # relative to it. Pairs that can't reach it are left unscored.
+        upper_bounds = {}
+        for fully_qualified_function_name, function_name in called_functions:
+            max_length = max(len(stripped_test_name), len(function_name))
+            length_difference = abs(len(stripped_test_name) - len(function_name))
+            upper_bounds[fully_qualified_function_name] = (
+                1 - length_difference / max_length
+            ) * self._get_call_depth_discount(
+                fully_qualified_function_name, depths_for_test
+            )
+
+        scores = {}
+        best_discounted_score = 0
+        for fully_qualified_function_name, function_name in sorted(
+            called_functions,
+            key=lambda called_function: upper_bounds[called_function[0]],
+            reverse=True,
+        ):
+            if upper_bounds[fully_qualified_function_name] <= best_discounted_score:
+                break
+            score = self._compute_levenshtein_score(function_name, stripped_test_name)
+            scores[fully_qualified_function_name] = score
+            best_discounted_score = max(
+                best_discounted_score,
+                score
+                * self._get_call_depth_discount(
+                    fully_qualified_function_name, depths_for_test
+                ),
+            )
 
+        if best_discounted_score <= 0:
+            return scores
+
+        for fully_qualified_function_name, function_name in called_functions:
+            if fully_qualified_function_name in scores:
+                continue
+            max_length = max(len(stripped_test_name), len(function_name))
+            min_score = self.threshold / self._get_call_depth_discount(
+                fully_qualified_function_name, depths_for_test
+            )
+            if self.normalise:
+                min_score *= best_discounted_score
+            # Allow for rounding, as pairs at the edge of the bound are scored
+            # exactly and then compared with the threshold as usual
+            max_distance = math.floor(
+                (1 - min_score) * max_length + BOUNDED_DISTANCE_TOLERANCE
+            )
+            edit_distance = self.similarity_cache.get_bounded_edit_distance(
+                stripped_test_name, function_name, max_distance
+            )
+            if edit_distance is not None:
+                scores[fully_qualified_function_name] = 1 - edit_distance / max_length
+
+        # Keep the scores in the order the functions were called in, so that
+        # tied links are predicted in the same order as exact scoring
+        return {
+            fully_qualified_function_name: scores[fully_qualified_function_name]
+            for fully_qualified_function_name, _ in called_functions
+            if fully_qualified_function_name in scores
+        }
+
+    def _compute_levenshtein_score(
+        self, function_name: str, stripped_test_name: str
+    ) -> int:
         levenshtein_score = 1 - (
             self._compute_levenshtein(function_name, stripped_test_name)
         ) / (max(len(stripped_test_name), len(function_name)))
 
         return levenshtein_score
 
-    def _compute_levenshtein(self, function_name: str, test_name: str) -> int:
-        m = len(function_name)
-        n = len(test_name)
-        edit_distance_matrix = [[0 for _ in range(n + 1)] for _ in range(m + 1)]
-
-        for i in range(n + 1):
-            edit_distance_matrix[0][i] = i
-
-        for j in range(m + 1):
-            edit_distance_matrix[j][0] = j
-
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                edit_distance_matrix[i][j] = min(
-                    edit_distance_matrix[i][j - 1] + 1,
-                    edit_distance_matrix[i - 1][j] + 1,
-                    edit_distance_matrix[i - 1][j - 1]
-                    + (1 if function_name[i - 1] != test_name[j - 1] else 0),
-                )
-
-        return edit_distance_matrix[m][n]
+    def _compute_levenshtein(self, function_name: str, stripped_test_name: str) -> int:
+        return self.similarity_cache.get_edit_distance(
+            stripped_test_name, function_name
+        )
 
 
 __all__ = ["LevenshteinDistance"]
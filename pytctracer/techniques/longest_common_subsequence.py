@@ -1,6 +1,5 @@
 from typing import Dict, Union, List, Tuple, Set
 from abc import ABC, abstractmethod
-from collections import defaultdict
 from pytctracer.techniques.technique import Technique
 from pytctracer.config.constants import TechniqueParameter, TechniqueThreshold
 
@@ -76,47 +75,38 @@ class LongestCommonSubsequence(Technique, ABC):
         functions_called_by_tests: Dict[str, Set[str]],
         functions_called_by_test_depth: Dict[str, Dict[str, int]],
     ) -> Dict[str, Dict[str, Union[int, float]]]:
-        lcs_scores = defaultdict(dict)
-
-        for fully_qualified_test_name, test_name in test_names_tuple:
-            functions_called_by_test = functions_called_by_tests[
-                fully_qualified_test_name
-            ]
-            for fully_qualified_function_name, function_name in function_names_tuple:
-                lcs_scores[fully_qualified_test_name][fully_qualified_function_name] = 0
-                if fully_qualified_function_name in functions_called_by_test:
-                    lcs_scores[fully_qualified_test_name][
-                        fully_qualified_function_name
-                    ] = self._compute_lcs_score(function_name, test_name)
-
-        if self.call_depth_discount:
-            lcs_scores = self._use_call_depth_discounting_dict(
-                lcs_scores, functions_called_by_test_depth
-            )
-
-        if self.normalise:
-            lcs_scores = self._normalise_dict(lcs_scores)
+        lcs_scores = self._create_traceability_scores(
+            function_names_tuple, test_names_tuple
+        )
+
+        for (
+            fully_qualified_test_name,
+            test_name,
+            called_functions,
+        ) in self._iterate_called_functions(
+            function_names_tuple, test_names_tuple, functions_called_by_tests
+        ):
+            lcs_scores_for_test = lcs_scores[fully_qualified_test_name]
+            stripped_test_name = self._strip_test_name(test_name)
+            for fully_qualified_function_name, function_name in called_functions:
+                lcs_scores_for_test[fully_qualified_function_name] = (
+                    self._compute_lcs_score(function_name, stripped_test_name)
+                )
+
+        lcs_scores = self._discount_and_normalise_scores(
+            lcs_scores, functions_called_by_test_depth
+        )
 
         return lcs_scores
 
     @abstractmethod
-    def _compute_lcs_score(self, _function_name: str, _test_name: str) -> int:
+    def _compute_lcs_score(self, _function_name: str, _stripped_test_name: str) -> int:
         raise NotImplementedError(
             """LCS classes must implement this method to compute the traceability score"""
         )
 
-    def _compute_lcs(self, function_name: str, test_name: str) -> int:
-        m = len(function_name)
-        n = len(test_name)
-        lcs_matrix = [[0 for _ in range(n + 1)] for _ in range(m + 1)]
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if function_name[i - 1] == test_name[j - 1]:
-                    lcs_matrix[i][j] = lcs_matrix[i - 1][j - 1] + 1
-                else:
-                    lcs_matrix[i][j] = max(lcs_matrix[i - 1][j], lcs_matrix[i][j - 1])
-
-        return lcs_matrix[m][n]
+    def _compute_lcs(self, function_name: str, stripped_test_name: str) -> int:
+        return self.similarity_cache.get_lcs_length(stripped_test_name, function_name)
 
 
 class LongestCommonSubsequenceUnit(LongestCommonSubsequence):
@@ -177,10 +167,8 @@ class LongestCommonSubsequenceUnit(LongestCommonSubsequence):
             functions_called_by_test_depth=functions_called_by_test_depth,
         )
 
-    def _compute_lcs_score(self, function_name: str, test_name: str) -> int:
-        stripped_test_name = self._strip_test_name(test_name)
-
-        lcsu_score = (self._compute_lcs(stripped_test_name, function_name)) / len(
+    def _compute_lcs_score(self, function_name: str, stripped_test_name: str) -> int:
+        lcsu_score = (self._compute_lcs(function_name, stripped_test_name)) / len(
             function_name
         )
 
@@ -245,10 +233,8 @@ class LongestCommonSubsequenceBoth(LongestCommonSubsequence):
             functions_called_by_test_depth=functions_called_by_test_depth,
         )
 
-    def _compute_lcs_score(self, function_name: str, test_name: str) -> int:
-        stripped_test_name = self._strip_test_name(test_name)
-
-        lcsb_score = (self._compute_lcs(stripped_test_name, function_name)) / (
+    def _compute_lcs_score(self, function_name: str, stripped_test_name: str) -> int:
+        lcsb_score = (self._compute_lcs(function_name, stripped_test_name)) / (
             max(len(stripped_test_name), len(function_name))
         )
 
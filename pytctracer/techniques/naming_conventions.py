@@ -1,6 +1,6 @@
 from typing import Dict, Union, List, Tuple, Set
-from collections import defaultdict
 from pytctracer.techniques.technique import Technique
+from pytctracer.techniques.substring_index import SubstringIndex
 from pytctracer.config.constants import TechniqueParameter
 
 
@@ -63,25 +63,25 @@ class NamingConventions(Technique):
         test_names_tuple: List[Tuple[str, str]],
         functions_called_by_tests: Dict[str, Set[str]],
     ) -> Dict[str, Dict[str, Union[int, float]]]:
-        nc_scores = defaultdict(dict)
-
-        for fully_qualified_test_name, test_name in test_names_tuple:
-            functions_called_by_test = functions_called_by_tests[
-                fully_qualified_test_name
-            ]
-            for fully_qualified_function_name, function_name in function_names_tuple:
-                nc_scores[fully_qualified_test_name][fully_qualified_function_name] = 0
-                if fully_qualified_function_name in functions_called_by_test:
-                    nc_scores[fully_qualified_test_name][
-                        fully_qualified_function_name
-                    ] = self._compute_nc_score(function_name, test_name)
-
-        return nc_scores
+        nc_scores = self._create_traceability_scores(
+            function_names_tuple, test_names_tuple
+        )
 
-    def _compute_nc_score(self, function_name: str, test_name: str) -> int:
-        stripped_test_name = self._strip_test_name(test_name)
+        for (
+            fully_qualified_test_name,
+            test_name,
+            called_functions,
+        ) in self._iterate_called_functions(
+            function_names_tuple, test_names_tuple, functions_called_by_tests
+        ):
+            nc_scores_for_test = nc_scores[fully_qualified_test_name]
+            stripped_test_name = self._strip_test_name(test_name)
+            for fully_qualified_function_name, function_name in called_functions:
+                nc_scores_for_test[fully_qualified_function_name] = (
+                    1 if function_name == stripped_test_name else 0
+                )
 
-        return 1 if function_name == stripped_test_name else 0
+        return nc_scores
 
 
 class NamingConventionsContains(NamingConventions):
@@ -137,10 +137,49 @@ class NamingConventionsContains(NamingConventions):
             functions_called_by_tests=functions_called_by_tests,
         )
 
-    def _compute_nc_score(self, function_name: str, test_name: str) -> int:
-        stripped_test_name = self._strip_test_name(test_name)
-
-        return 1 if function_name in stripped_test_name else 0
+    def _run(
+        self,
+        function_names_tuple: List[Tuple[str, str]],
+        test_names_tuple: List[Tuple[str, str]],
+        functions_called_by_tests: Dict[str, Set[str]],
+    ) -> Dict[str, Dict[str, Union[int, float]]]:
+        ncc_scores = self._create_traceability_scores(
+            function_names_tuple, test_names_tuple
+        )
+        # Each stripped test name is scanned once for every function name it
+        # contains, rather than searched for each called function in turn
+        function_name_index = SubstringIndex(
+            function_name for _, function_name in function_names_tuple
+        )
+        # Test classes share their name with each of their tests, so the names
+        # contained in each stripped test name are only found once
+        contained_function_names_for_test_names = {}
+
+        for (
+            fully_qualified_test_name,
+            test_name,
+            called_functions,
+        ) in self._iterate_called_functions(
+            function_names_tuple, test_names_tuple, functions_called_by_tests
+        ):
+            ncc_scores_for_test = ncc_scores[fully_qualified_test_name]
+            stripped_test_name = self._strip_test_name(test_name)
+            contained_function_names = contained_function_names_for_test_names.get(
+                stripped_test_name
+            )
+            if contained_function_names is None:
+                contained_function_names = function_name_index.find_contained_names(
+                    stripped_test_name
+                )
+                contained_function_names_for_test_names[stripped_test_name] = (
+                    contained_function_names
+                )
+            for fully_qualified_function_name, function_name in called_functions:
+                ncc_scores_for_test[fully_qualified_function_name] = (
+                    1 if function_name in contained_function_names else 0
+                )
+
+        return ncc_scores
 
 
 __all__ = ["NamingConventions", "NamingConventionsContains"]
@@ -0,0 +1,333 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+TEST_NAME_PREFIX = "test"
+TEST_NAME_PREFIX_UNDERSCORE = "test_"
+DEFAULT_SIMILARITY_CACHE_SIZE = 65536
+LCS_LENGTH = 0
+EDIT_DISTANCE = 1
+
+
+class SimilarityCache:
+    """
+    Cache of the string similarities computed by the name based traceability
+    techniques. Function short names repeat across many tests, and the LCS-U,
+    LCS-B and Levenshtein techniques all compare the same pairs of names, so a
+    single cache can be shared by the techniques run on a trace log. Each test
+    name is stripped once, and the longest common subsequence length and edit
+    distance of each pair of names are computed at most once while the pair
+    remains in the cache.
+
+    Attributes:
+        max_size (int): The maximum number of pairs of names to keep the
+        similarities of. The least recently used pairs are evicted first.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_SIMILARITY_CACHE_SIZE) -> None:
+        """
+        Cache of the string similarities computed by the name based traceability
+        techniques.
+
+        Args:
+            max_size (int): The maximum number of pairs of names to keep the
+            similarities of.
+        """
+        self.max_size = max_size
+        self._stripped_test_names: Dict[str, str] = {}
+        self._similarities: OrderedDict[tuple, List[Optional[int]]] = OrderedDict()
+
+    def strip_test_name(self, test_name: str) -> str:
+        """
+        Strip the test prefix from a test or test class name, computing it only
+        the first time the name is seen.
+
+        Args:
+            test_name (str): The short name of the test or test class.
+
+        Returns:
+            str: The name with its test prefix removed.
+        """
+        stripped_test_name = self._stripped_test_names.get(test_name)
+        if stripped_test_name is None:
+            stripped_test_name = strip_test_name(test_name)
+            self._stripped_test_names[test_name] = stripped_test_name
+
+        return stripped_test_name
+
+    def get_lcs_length(self, stripped_test_name: str, function_name: str) -> int:
+        """
+        Get the length of the longest common subsequence of a stripped test name
+        and a function name.
+
+        Args:
+            stripped_test_name (str): The test name with its test prefix removed.
+            function_name (str): The short name of the function or function class.
+
+        Returns:
+            int: The length of the longest common subsequence of the names.
+        """
+        similarities = self._get_similarities(stripped_test_name, function_name)
+        if similarities[LCS_LENGTH] is None:
+            similarities[LCS_LENGTH] = compute_lcs_length(
+                stripped_test_name, function_name
+            )
+
+        return similarities[LCS_LENGTH]
+
+    def get_edit_distance(self, stripped_test_name: str, function_name: str) -> int:
+        """
+        Get the Levenshtein edit distance between a stripped test name and a
+        function name.
+
+        Args:
+            stripped_test_name (str): The test name with its test prefix removed.
+            function_name (str): The short name of the function or function class.
+
+        Returns:
+            int: The edit distance between the names.
+        """
+        similarities = self._get_similarities(stripped_test_name, function_name)
+        if similarities[EDIT_DISTANCE] is None:
+            similarities[EDIT_DISTANCE] = compute_edit_distance(
+                function_name, stripped_test_name
+            )
+
+        return similarities[EDIT_DISTANCE]
+
+    def get_bounded_edit_distance(
+        self, stripped_test_name: str, function_name: str, max_distance: int
+    ) -> Optional[int]:
+        """
+        Get the Levenshtein edit distance between a stripped test name and a
+        function name, but only if it is at most the given maximum distance.
+        Distances past the maximum are rejected without being computed in full.
+
+        Args:
+            stripped_test_name (str): The test name with its test prefix removed.
+            function_name (str): The short name of the function or function class.
+            max_distance (int): The largest edit distance to compute exactly.
+
+        Returns:
+            Optional[int]: The edit distance between the names, or None if it is
+            greater than the maximum distance.
+        """
+        similarities = self._similarities.get((stripped_test_name, function_name))
+        if similarities is not None and similarities[EDIT_DISTANCE] is not None:
+            edit_distance = similarities[EDIT_DISTANCE]
+            return edit_distance if edit_distance <= max_distance else None
+
+        edit_distance = compute_bounded_edit_distance(
+            function_name, stripped_test_name, max_distance
+        )
+        if edit_distance is not None:
+            # Only exact distances are cached, as a rejected pair may be within
+            # a larger maximum distance
+            similarities = self._get_similarities(stripped_test_name, function_name)
+            similarities[EDIT_DISTANCE] = edit_distance
+
+        return edit_distance
+
+    def _get_similarities(
+        self, stripped_test_name: str, function_name: str
+    ) -> List[Optional[int]]:
+        # Each similarity is only computed when first asked for, so a run of
+        # only one of the techniques doesn't pay for the other similarity
+        key = (stripped_test_name, function_name)
+        similarities = self._similarities.get(key)
+        if similarities is not None:
+            self._similarities.move_to_end(key)
+            return similarities
+
+        similarities = [None, None]
+        self._similarities[key] = similarities
+        if len(self._similarities) > self.max_size:
+            self._similarities.popitem(last=False)
+
+        return similarities
+
+
+def strip_test_name(test_name: str) -> str:
+    """
+    Strip the test prefix from a test or test class name.
+
+    Args:
+        test_name (str): The short name of the test or test class.
+
+    Returns:
+        str: The name with its test prefix removed.
+    """
+    # Use lowercase since test class may be PascalCase by convention.
+
+    lower_test_name = test_name.lower()
+    if lower_test_name.startswith(TEST_NAME_PREFIX_UNDERSCORE):
+        stripped_test_name = test_name[len(TEST_NAME_PREFIX_UNDERSCORE) :]
+    elif lower_test_name.startswith(TEST_NAME_PREFIX):
+        # Assumption that all test functions must begin with `test'
+        stripped_test_name = test_name[len(TEST_NAME_PREFIX) :]
+    else:
+        stripped_test_name = test_name
+
+    return stripped_test_name
+
+
+def compute_lcs_length(first_name: str, second_name: str) -> int:
+    """
+    Compute the length of the longest common subsequence of two names. The
+    shorter name is encoded as a bit vector, and the DP table is computed a
+    column at a time using bitwise operations on Python integers (the
+    bit-parallel algorithm of Allison and Dix, as formulated by Hyyrö), rather
+    than a cell at a time.
+
+    Args:
+        first_name (str): The first name to compare.
+        second_name (str): The second name to compare.
+
+    Returns:
+        int: The length of the longest common subsequence of the names.
+    """
+    if len(first_name) > len(second_name):
+        first_name, second_name = second_name, first_name
+    if not first_name:
+        return 0
+
+    character_masks = _compute_character_masks(first_name)
+    all_bits = (1 << len(first_name)) - 1
+    # Each zero bit in the vector marks a character of the first name matched
+    # in the longest common subsequence so far
+    vector = all_bits
+    for character in second_name:
+        matches = vector & character_masks.get(character, 0)
+        vector = ((vector + matches) | (vector - matches)) & all_bits
+
+    return len(first_name) - vector.bit_count()
+
+
+def compute_edit_distance(first_name: str, second_name: str) -> int:
+    """
+    Compute the Levenshtein edit distance between two names. The shorter name
+    is encoded as a bit vector, and the vertical differences between adjacent
+    cells of each DP column are computed using bitwise operations on Python
+    integers (the bit-parallel algorithm of Myers, in the form given by Hyyrö for
+    the edit distance between two whole strings), rather than a cell at a time.
+
+    Args:
+        first_name (str): The first name to compare.
+        second_name (str): The second name to compare.
+
+    Returns:
+        int: The edit distance between the names.
+    """
+    if len(first_name) > len(second_name):
+        first_name, second_name = second_name, first_name
+    if not first_name:
+        return len(second_name)
+
+    character_masks = _compute_character_masks(first_name)
+    all_bits = (1 << len(first_name)) - 1
+    last_bit = 1 << (len(first_name) - 1)
+    positive_vertical = all_bits
+    negative_vertical = 0
+    edit_distance = len(first_name)
+    for character in second_name:
+        matches = character_masks.get(character, 0)
+        vertical_changes = matches | negative_vertical
+        horizontal_changes = (
+            ((matches & positive_vertical) + positive_vertical) ^ positive_vertical
+        ) | matches
+        positive_horizontal = negative_vertical | ~(
+            horizontal_changes | positive_vertical
+        )
+        negative_horizontal = positive_vertical & horizontal_changes
+        # The last bit tracks the bottom row of the column, which holds the
+        # distance between the first name and the prefix of the second name
+        if positive_horizontal & last_bit:
+            edit_distance += 1
+        elif negative_horizontal & last_bit:
+            edit_distance -= 1
+        positive_horizontal = (positive_horizontal << 1) | 1
+        negative_horizontal <<= 1
+        positive_vertical = (
+            negative_horizontal | ~(vertical_changes | positive_horizontal)
+        ) & all_bits
+        negative_vertical = positive_horizontal & vertical_changes & all_bits
+
+    return edit_distance
+
+
+def compute_bounded_edit_distance(
+    first_name: str, second_name: str, max_distance: int
+) -> Optional[int]:
+    """
+    Compute the Levenshtein edit distance between two names, but only if it is
+    at most the given maximum distance. Names whose lengths differ by more than
+    the maximum distance are rejected straight away. Otherwise only a diagonal
+    band of the DP table, of the cells within the maximum distance of the main
+    diagonal, is computed, and the names are rejected as soon as every cell in
+    a row of the band is past the maximum distance.
+
+    Args:
+        first_name (str): The first name to compare.
+        second_name (str): The second name to compare.
+        max_distance (int): The largest edit distance to compute exactly.
+
+    Returns:
+        Optional[int]: The edit distance between the names, or None if it is
+        greater than the maximum distance.
+    """
+    if len(first_name) > len(second_name):
+        first_name, second_name = second_name, first_name
+    m = len(first_name)
+    n = len(second_name)
+    if max_distance < 0 or n - m > max_distance:
+        return None
+
+    if 2 * max_distance + 1 >= m:
+        # The band would cover most of the table, so the bit-parallel kernel
+        # is faster than computing the band
+        edit_distance = compute_edit_distance(first_name, second_name)
+        return edit_distance if edit_distance <= max_distance else None
+
+    # Cells outside the band, or past the maximum distance, are held at a
+    # distance one more than the maximum, since no alignment through them can
+    # be within the maximum distance
+    rejected_distance = max_distance + 1
+    previous_row = [j if j <= max_distance else rejected_distance for j in range(m + 1)]
+    for i in range(1, n + 1):
+        current_row = [rejected_distance] * (m + 1)
+        if i <= max_distance:
+            current_row[0] = i
+        row_minimum = current_row[0]
+        character = second_name[i - 1]
+        for j in range(max(1, i - max_distance), min(m, i + max_distance) + 1):
+            edit_distance = min(
+                previous_row[j - 1] + (first_name[j - 1] != character),
+                current_row[j - 1] + 1,
+                previous_row[j] + 1,
+                rejected_distance,
+            )
+            current_row[j] = edit_distance
+            row_minimum = min(row_minimum, edit_distance)
+        if row_minimum > max_distance:
+            return None
+        previous_row = current_row
+
+    edit_distance = previous_row[m]
+
+    return edit_distance if edit_distance <= max_distance else None
+
+
+def _compute_character_masks(name: str) -> Dict[str, int]:
+    character_masks = {}
+    for position, character in enumerate(name):
+        character_masks[character] = character_masks.get(character, 0) | (1 << position)
+
+    return character_masks
+
+
+__all__ = [
+    "SimilarityCache",
+    "strip_test_name",
+    "compute_lcs_length",
+    "compute_edit_distance",
+    "compute_bounded_edit_distance",
+]
@@ -0,0 +1,88 @@
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+ROOT_STATE = 0
+
+
+class SubstringIndex:
+    """
+    Index of a set of names for finding which of them are contained in a text,
+    built as an Aho-Corasick automaton over the names. Each text is scanned once,
+    a character at a time, rather than searching the text for each name in turn,
+    so the time to search a text doesn't grow with the number of names.
+
+    Attributes:
+        names (Set[str]): The names in the index.
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        """
+        Index of a set of names for finding which of them are contained in a text.
+
+        Args:
+            names (Iterable[str]): The names to index.
+        """
+        self.names = set(names)
+        self._transitions: List[Dict[str, int]] = [{}]
+
+        names_ending_at_state = [set()]
+        for name in self.names:
+            state = ROOT_STATE
+            for character in name:
+                next_state = self._transitions[state].get(character)
+                if next_state is None:
+                    next_state = len(self._transitions)
+                    self._transitions[state][character] = next_state
+                    self._transitions.append({})
+                    names_ending_at_state.append(set())
+                state = next_state
+            names_ending_at_state[state].add(name)
+
+        self._failures = [ROOT_STATE] * len(self._transitions)
+        self._matched_names: List[FrozenSet[str]] = [frozenset()] * len(
+            self._transitions
+        )
+        self._matched_names[ROOT_STATE] = frozenset(names_ending_at_state[ROOT_STATE])
+        # States are visited in breadth first order, so the failure state of
+        # each state, which is shallower, already has all of its matched names
+        states_to_visit = deque([ROOT_STATE])
+        while states_to_visit:
+            state = states_to_visit.popleft()
+            for character, next_state in self._transitions[state].items():
+                failure = ROOT_STATE
+                if state != ROOT_STATE:
+                    failure = self._failures[state]
+                    while (
+                        failure != ROOT_STATE
+                        and character not in self._transitions[failure]
+                    ):
+                        failure = self._failures[failure]
+                    failure = self._transitions[failure].get(character, ROOT_STATE)
+                self._failures[next_state] = failure
+                self._matched_names[next_state] = self._matched_names[failure].union(
+                    names_ending_at_state[next_state]
+                )
+                states_to_visit.append(next_state)
+
+    def find_contained_names(self, text: str) -> Set[str]:
+        """
+        Find every name in the index that is contained in a text.
+
+        Args:
+            text (str): The text to search.
+
+        Returns:
+            Set[str]: The names contained in the text.
+        """
+        contained_names = set(self._matched_names[ROOT_STATE])
+        state = ROOT_STATE
+        for character in text:
+            while state != ROOT_STATE and character not in self._transitions[state]:
+                state = self._failures[state]
+            state = self._transitions[state].get(character, ROOT_STATE)
+            contained_names.update(self._matched_names[state])
+
+        return contained_names
+
+
+__all__ = ["SubstringIndex"]
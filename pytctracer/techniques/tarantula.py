@@ -1,8 +1,11 @@
-from typing import Dict, Union, List, Tuple, Set
-from collections import defaultdict
+from typing import Any, Dict, Union, List, Tuple, Set
+import numpy as np
 from pytctracer.techniques.technique import Technique
+from pytctracer.techniques.call_matrix import create_call_matrix
 from pytctracer.config.constants import TechniqueParameter, TechniqueThreshold
 
+TARANTULA_SCORES = "tarantula_scores"
+
 
 class Tarantula(Technique):
     """
@@ -72,35 +75,72 @@ class Tarantula(Technique):
             and the values are dictionaries containing the traceability scores
             for each function or function class.
         """
-        tarantula_scores = defaultdict(dict)
+        # Tarantula scores only depend on the function, so the score of each
+        # function is computed once and spread over the tests that called it
+        call_matrix = create_call_matrix(
+            function_names_tuple, test_names_tuple, functions_called_by_tests
+        )
+        global_statistics = self._get_global_statistics(
+            function_names_tuple=function_names_tuple,
+            test_names_tuple=test_names_tuple,
+            tests_that_call_functions=tests_that_call_functions,
+        )
+        function_scores = np.array(
+            [
+                global_statistics[TARANTULA_SCORES].get(
+                    fully_qualified_function_name, 0
+                )
+                for fully_qualified_function_name, _ in function_names_tuple
+            ],
+            dtype=np.float64,
+        )
+        call_matrix.data = function_scores[call_matrix.indices]
 
-        number_of_tests = len(test_names_tuple)
+        return self._create_traceability_scores_from_matrix(
+            call_matrix,
+            function_names_tuple,
+            test_names_tuple,
+            functions_called_by_test_depth,
+        )
 
-        for fully_qualified_test_name, _ in test_names_tuple:
-            functions_called_by_test = functions_called_by_tests[
-                fully_qualified_test_name
-            ]
-            for fully_qualified_function_name, _ in function_names_tuple:
-                tarantula_scores[fully_qualified_test_name][
-                    fully_qualified_function_name
-                ] = 0
-                if fully_qualified_function_name in functions_called_by_test:
-                    tarantula_scores[fully_qualified_test_name][
-                        fully_qualified_function_name
-                    ] = self._compute_tarantula_score(
-                        fully_qualified_function_name,
-                        tests_that_call_functions,
-                        number_of_tests,
-                    )
-
-        if self.call_depth_discount:
-            tarantula_scores = self._use_call_depth_discounting_dict(
-                tarantula_scores, functions_called_by_test_depth
+    def compute_global_statistics(
+        self,
+        function_names_tuple: List[Tuple[str, str]],
+        test_names_tuple: List[Tuple[str, str]],
+        tests_that_call_functions: Dict[str, Set[str]],
+        **_,
+    ) -> Dict[str, Any]:
+        """
+        Compute the Tarantula score of each function, which depends on the
+        number of tests out of every test that call the function.
+
+        Args:
+            function_names_tuple (List[Tuple[str, str]]): A list of tuples of the
+            fully qualified and short names of each function or function class.
+            test_names_tuple (List[Tuple[str, str]]): A list of tuples of the fully
+            qualified and short names of every test or test class.
+            tests_that_call_functions (Dict[str, Set[str]]): A dictionary where the
+            keys are the fully qualified names of the function or function classes,
+            and the values are sets containing each test or test class that calls
+            the function or function class.
+            **_: The other parameters the technique is run with.
+
+        Returns:
+            Dict[str, Any]: The Tarantula score of each function or function class
+            that was called by a test.
+        """
+        number_of_tests = len(test_names_tuple)
+        tarantula_scores = {
+            fully_qualified_function_name: self._compute_tarantula_score(
+                fully_qualified_function_name,
+                tests_that_call_functions,
+                number_of_tests,
             )
-        if self.normalise:
-            tarantula_scores = self._normalise_dict(tarantula_scores)
+            for fully_qualified_function_name, _ in function_names_tuple
+            if fully_qualified_function_name in tests_that_call_functions
+        }
 
-        return tarantula_scores
+        return {TARANTULA_SCORES: tarantula_scores}
 
     def _compute_tarantula_score(
         self,
@@ -1,11 +1,39 @@
+import copy
+import heapq
 from collections import defaultdict
-from copy import deepcopy
+from operator import itemgetter
 from abc import ABC, abstractmethod
-from typing import Dict, Union, Set, Optional
+from typing import (
+    Any,
+    Dict,
+    Union,
+    Set,
+    Optional,
+    List,
+    Tuple,
+    Iterable,
+    Iterator,
+)
+from scipy.sparse import csr_matrix
+from pytctracer.parallel import map_in_worker_pool
+from pytctracer.techniques.traceability_scores import TraceabilityScores
+from pytctracer.techniques.similarity_cache import SimilarityCache
+from pytctracer.techniques.incremental_scoring_state import IncrementalScoringState
+from pytctracer.config.constants import TechniqueParameter
+from pytctracer.techniques.call_matrix import (
+    discount_call_matrix,
+    normalise_call_matrix,
+    convert_call_matrix_to_traceability_scores,
+)
 
 DISCOUNT_FACTOR = 0.5
-TEST_NAME_PREFIX = "test"
-TEST_NAME_PREFIX_UNDERSCORE = "test_"
+# Each worker is given several shards of the tests, so that a worker handed
+# the tests that are slow to score doesn't hold up the others
+SHARDS_PER_JOB = 4
+# The keys of the state shared by the tasks of each shard worker
+SHARD_TECHNIQUE = "technique"
+SHARD_PARAMETERS = "parameters"
+SHARD_GLOBAL_STATISTICS = "global_statistics"
 
 
 class Technique(ABC):
@@ -25,7 +53,15 @@ class Technique(ABC):
         uses_threshold (bool): A boolean indicating whether the technique uses a threshold.
         threshold (int): The threshold value for the technique.
         normalise (bool): A boolean indicating whether the technique normalises scores.
-        call_depth_discount (bool): A boolean indicating whether the technique discounts scores based on call depth.
+        call_depth_discount (bool): A boolean indicating whether the technique discounts scores
+        based on call depth.
+        discount_factor (float): The factor to discount scores by for each level of call depth.
+        similarity_cache (SimilarityCache): The cache of string similarities used by the
+        technique.
+        prediction_only (bool): A boolean indicating whether the scores are only used to
+        predict links.
+        global_statistics (Optional[Dict[str, Any]]): The statistics over every test that the
+        technique was given up front, rather than computing them from the tests it is run on.
     """
 
     full_name = "Technique"
@@ -37,6 +73,48 @@ class Technique(ABC):
     threshold = 0
     normalise = False
     call_depth_discount = False
+    discount_factor = DISCOUNT_FACTOR
+
+    def __init__(
+        self,
+        similarity_cache: Optional[SimilarityCache] = None,
+        prediction_only: bool = False,
+        global_statistics: Optional[Dict[str, Any]] = None,
+        discount_factor: Optional[float] = None,
+        raw_scores: bool = False,
+    ) -> None:
+        """
+        Abstract class for implementing a traceability technique.
+
+        Args:
+            similarity_cache (Optional[SimilarityCache]): A cache of string similarities
+            to share with other techniques run on the same trace log. If omitted, the
+            technique uses a cache of its own.
+            prediction_only (bool): Whether the scores are only used to predict links,
+            rather than to compute threshold independent metrics or combined scores.
+            Techniques may then skip computing the exact scores of pairs that can't
+            reach the threshold, leaving them unscored.
+            global_statistics (Optional[Dict[str, Any]]): The statistics over every test
+            computed by compute_global_statistics, for a technique run on only some of
+            the tests. If omitted, the statistics are computed from the tests the
+            technique is run on.
+            discount_factor (Optional[float]): The factor to discount scores by for each
+            level of call depth. If omitted, the technique's default discount factor
+            is used.
+            raw_scores (bool): Whether to produce the raw scores of the technique, without
+            call depth discounting or normalisation, so that they can be discounted and
+            normalised afterwards in different ways.
+        """
+        self.similarity_cache = (
+            similarity_cache if similarity_cache is not None else SimilarityCache()
+        )
+        self.prediction_only = prediction_only
+        self.global_statistics = global_statistics
+        if discount_factor is not None:
+            self.discount_factor = discount_factor
+        if raw_scores:
+            self.normalise = False
+            self.call_depth_discount = False
 
     @abstractmethod
     def run(self, **kwargs) -> Dict[str, Dict[str, Union[int, float]]]:
@@ -47,60 +125,346 @@ class Technique(ABC):
             "The 'run' method must be implemented by the subclass."
         )
 
-    def _use_call_depth_discounting_dict(
-        self,
-        traceability_score_dict: Dict[str, Dict[str, float]],
-        functions_called_by_test_depth_dict: Dict[str, Dict[str, int]],
+    def compute_global_statistics(self, **_) -> Dict[str, Any]:
+        """
+        Compute the statistics over every test that the scores of a single test
+        depend on, such as the number of tests. Techniques that score each test
+        independently of the others have no global statistics.
+
+        Args:
+            **_: The parameters the technique is run with, which are unused by
+            techniques without global statistics.
+
+        Returns:
+            Dict[str, Any]: The global statistics of the technique.
+        """
+        return {}
+
+    def run_sharded(self, jobs: int, **kwargs) -> Dict[str, Dict[str, float]]:
+        """
+        Run the traceability technique with the tests split into shards, which
+        are scored in parallel by a pool of worker processes. The global
+        statistics of the technique are computed once over every test, unless the
+        technique was already given them, and handed to each worker along with the
+        parameters, so every shard is scored exactly as it would be in a single run.
+        The score rows of the shards are then merged in the order of the tests.
+
+        Args:
+            jobs (int): The number of worker processes to score the tests with.
+            **kwargs: The parameters the technique is run with.
+
+        Returns:
+            Dict[str, Dict[str, float]]: A dictionary where the keys are the fully
+            qualified names of the test or test classes, and the values are
+            dictionaries containing the traceability scores for each function or
+            function class.
+        """
+        test_names_tuple = list(kwargs[TechniqueParameter.TEST_NAMES_TUPLE])
+        number_of_shards = min(jobs * SHARDS_PER_JOB, len(test_names_tuple))
+        if jobs <= 1 or number_of_shards <= 1:
+            return self.run(**kwargs)
+
+        global_statistics = self._get_global_statistics(**kwargs)
+        shard_size = -(-len(test_names_tuple) // number_of_shards)
+        test_shards = [
+            test_names_tuple[start : start + shard_size]
+            for start in range(0, len(test_names_tuple), shard_size)
+        ]
+
+        # The parameters are handed to each worker once, and only the tests of
+        # a shard are sent with each task
+        shard_scores = map_in_worker_pool(
+            _run_shard_in_worker,
+            test_shards,
+            jobs,
+            {
+                SHARD_TECHNIQUE: self,
+                SHARD_PARAMETERS: kwargs,
+                SHARD_GLOBAL_STATISTICS: global_statistics,
+            },
+        )
+
+        traceability_scores = self._create_traceability_scores(
+            kwargs[TechniqueParameter.FUNCTION_NAMES_TUPLE], []
+        )
+        for scores_for_shard in shard_scores:
+            traceability_scores.update(scores_for_shard)
+
+        return traceability_scores
+
+    def run_on_tests(
+        self, tests_to_score: Set[str], jobs: int = 1, **kwargs
     ) -> Dict[str, Dict[str, float]]:
-        discounted_score_dict = deepcopy(traceability_score_dict)
+        """
+        Run the traceability technique on only some of the tests, such as the tests
+        in a ground truth. The global statistics of the technique are computed over
+        every test in the parameters, so each test is scored exactly as it would be
+        in a run on every test, while the cost of scoring grows only with the number
+        of tests scored.
+
+        Args:
+            tests_to_score (Set[str]): The fully qualified names of the tests or test
+            classes to score.
+            jobs (int): The number of worker processes to score the tests with.
+            **kwargs: The parameters the technique is run with.
+
+        Returns:
+            Dict[str, Dict[str, float]]: A dictionary where the keys are the fully
+            qualified names of the tests or test classes that were scored, and the
+            values are dictionaries containing the traceability scores for each
+            function or function class.
+        """
+        global_statistics = self._get_global_statistics(**kwargs)
+        test_names_tuple = [
+            (fully_qualified_test_name, test_name)
+            for fully_qualified_test_name, test_name in kwargs[
+                TechniqueParameter.TEST_NAMES_TUPLE
+            ]
+            if fully_qualified_test_name in tests_to_score
+        ]
+
+        given_global_statistics = self.global_statistics
+        self.global_statistics = global_statistics
+        try:
+            return self.run_sharded(
+                jobs,
+                **{**kwargs, TechniqueParameter.TEST_NAMES_TUPLE: test_names_tuple},
+            )
+        finally:
+            self.global_statistics = given_global_statistics
+
+    def create_incremental_state(self, **kwargs) -> IncrementalScoringState:
+        """
+        Run the traceability technique on every test, keeping the parameters, the
+        global statistics and the scores as a state that can later be updated
+        with update_incremental_state when only some of the tests are traced again.
+
+        Args:
+            **kwargs: The parameters the technique is run with.
+
+        Returns:
+            IncrementalScoringState: The state of the technique, whose traceability
+            scores are the scores of every test.
+        """
+        technique_parameters = {
+            parameter: _copy_technique_parameter(parameter, value)
+            for parameter, value in kwargs.items()
+        }
+        global_statistics = self.compute_global_statistics(**technique_parameters)
+        self.global_statistics = global_statistics
+        try:
+            traceability_scores = self.run(**technique_parameters)
+        finally:
+            self.global_statistics = None
+
+        return IncrementalScoringState(
+            technique_parameters, global_statistics, traceability_scores
+        )
+
+    def update_incremental_state(
+        self,
+        state: IncrementalScoringState,
+        removed_test_names: Iterable[str] = (),
+        **kwargs,
+    ) -> IncrementalScoringState:
+        """
+        Update the state of the traceability technique in place with the tests
+        that were traced again, added or removed. The global statistics are
+        computed again over every test, and only the tests that changed, along
+        with the tests that call a function whose statistics changed, such as
+        its IDF or Tarantula score, are scored again. The scores of the other
+        tests are kept from the state. A change to the number of tests changes
+        the statistics of every function, and so every test is scored again.
+
+        Args:
+            state (IncrementalScoringState): The state of the technique, from
+            create_incremental_state.
+            removed_test_names (Iterable[str]): The fully qualified names of the tests
+            that were removed.
+            **kwargs: The parameters parsed from a trace of only the tests that were
+            traced again or added.
 
-        for fully_qualified_test_name, _ in discounted_score_dict.items():
-            for function_fully_qualified_name in functions_called_by_test_depth_dict[
+        Returns:
+            IncrementalScoringState: The updated state, whose traceability scores are
+            the same as running the technique on every test.
+        """
+        changed_test_names = state.apply_delta(kwargs, removed_test_names)
+        global_statistics = self.compute_global_statistics(**state.technique_parameters)
+        tests_to_score = changed_test_names | state.find_tests_that_call(
+            state.find_changed_functions(global_statistics)
+        )
+        test_names_tuple = state.list_test_names_tuple(tests_to_score)
+
+        self.global_statistics = global_statistics
+        try:
+            scores_for_tests = self.run(
+                **{
+                    **state.technique_parameters,
+                    TechniqueParameter.TEST_NAMES_TUPLE: test_names_tuple,
+                }
+            )
+        finally:
+            self.global_statistics = None
+
+        traceability_scores = self._create_traceability_scores(
+            state.technique_parameters[TechniqueParameter.FUNCTION_NAMES_TUPLE], []
+        )
+        # Rows are kept in the order of the tests, as the order of tied links
+        # depends on it
+        for fully_qualified_test_name, _ in state.technique_parameters[
+            TechniqueParameter.TEST_NAMES_TUPLE
+        ]:
+            if fully_qualified_test_name in tests_to_score:
+                scores_for_test = scores_for_tests.get(fully_qualified_test_name)
+            else:
+                scores_for_test = state.traceability_scores.get(
+                    fully_qualified_test_name
+                )
+            if scores_for_test is not None:
+                traceability_scores[fully_qualified_test_name] = scores_for_test
+
+        state.global_statistics = global_statistics
+        state.traceability_scores = traceability_scores
+
+        return state
+
+    def _get_global_statistics(self, **kwargs) -> Dict[str, Any]:
+        if self.global_statistics is not None:
+            return self.global_statistics
+
+        return self.compute_global_statistics(**kwargs)
+
+    def _create_traceability_scores(
+        self,
+        function_names_tuple: List[Tuple[str, str]],
+        test_names_tuple: List[Tuple[str, str]],
+    ) -> TraceabilityScores:
+        return TraceabilityScores(
+            function_names=(
+                fully_qualified_function_name
+                for fully_qualified_function_name, _ in function_names_tuple
+            ),
+            test_names=(
                 fully_qualified_test_name
-            ]:
-                original_score = discounted_score_dict[fully_qualified_test_name][
-                    function_fully_qualified_name
-                ]
-                depth = functions_called_by_test_depth_dict[fully_qualified_test_name][
-                    function_fully_qualified_name
-                ]
-                discounted_score_dict[fully_qualified_test_name][
-                    function_fully_qualified_name
-                ] = original_score * DISCOUNT_FACTOR ** (depth - 1)
-
-        return discounted_score_dict
-
-    def _normalise_dict(
-        self, traceability_score_dict: Dict[str, Dict[str, float]]
-    ) -> Dict[str, Dict[str, float]]:
-        normalised_score_dict = deepcopy(traceability_score_dict)
+                for fully_qualified_test_name, _ in test_names_tuple
+            ),
+        )
+
+    def _iterate_called_functions(
+        self,
+        function_names_tuple: List[Tuple[str, str]],
+        test_names_tuple: List[Tuple[str, str]],
+        functions_called_by_tests: Dict[str, Iterable[str]],
+    ) -> Iterator[Tuple[str, str, List[Tuple[str, str]]]]:
+        # Only the functions a test called can be scored, so iterate over those
+        # rather than checking every function against every test. Short names
+        # are looked up along with the position of each function, so the called
+        # functions are scored in the same order as the function names tuple
+        function_name_lookup = {
+            fully_qualified_function_name: (position, function_name)
+            for position, (fully_qualified_function_name, function_name) in enumerate(
+                function_names_tuple
+            )
+        }
 
-        for test_fully_qualified_name in traceability_score_dict:
-            # find maximum score and normalise w.r.t to it
-            functions_called_by_test = traceability_score_dict[
-                test_fully_qualified_name
+        for fully_qualified_test_name, test_name in test_names_tuple:
+            called_function_lookups = sorted(
+                (
+                    *function_name_lookup[fully_qualified_function_name],
+                    fully_qualified_function_name,
+                )
+                for fully_qualified_function_name in functions_called_by_tests.get(
+                    fully_qualified_test_name, ()
+                )
+                if fully_qualified_function_name in function_name_lookup
+            )
+            called_functions = [
+                (fully_qualified_function_name, function_name)
+                for _, function_name, fully_qualified_function_name in called_function_lookups
             ]
+
+            yield fully_qualified_test_name, test_name, called_functions
+
+    def _create_traceability_scores_from_matrix(
+        self,
+        score_matrix: csr_matrix,
+        function_names_tuple: List[Tuple[str, str]],
+        test_names_tuple: List[Tuple[str, str]],
+        functions_called_by_test_depth: Dict[str, Dict[str, int]],
+    ) -> TraceabilityScores:
+        # Applies the same call depth discount and normalisation as the
+        # dictionary based helpers, as operations over the stored scores
+        if self.call_depth_discount:
+            score_matrix = discount_call_matrix(
+                score_matrix,
+                function_names_tuple,
+                test_names_tuple,
+                functions_called_by_test_depth,
+                self.discount_factor,
+            )
+        if self.normalise:
+            score_matrix = normalise_call_matrix(score_matrix)
+
+        return convert_call_matrix_to_traceability_scores(
+            score_matrix, function_names_tuple, test_names_tuple
+        )
+
+    def _discount_and_normalise_scores(
+        self,
+        traceability_score_dict: Dict[str, Dict[str, float]],
+        functions_called_by_test_depth: Optional[Dict[str, Dict[str, int]]] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        # Discounts and normalises the scores of each test in place, in a single
+        # pass over the scores, rather than building a copy of every score for
+        # each step. Each score is discounted by its call depth if the technique
+        # uses call depth discounting, and then divided by the maximum discounted
+        # score of the test if the technique normalises scores.
+        discount = self.call_depth_discount and functions_called_by_test_depth
+        for (
+            fully_qualified_test_name,
+            scores_for_test,
+        ) in traceability_score_dict.items():
             max_score = 0
-            for function_fully_qualified_name in functions_called_by_test:
-                max_score = max(
-                    max_score,
-                    traceability_score_dict[test_fully_qualified_name][
-                        function_fully_qualified_name
-                    ],
+            if discount:
+                depths_for_test = functions_called_by_test_depth.get(
+                    fully_qualified_test_name, {}
                 )
+                for function_fully_qualified_name, score in scores_for_test.items():
+                    depth = depths_for_test.get(function_fully_qualified_name)
+                    if depth is not None:
+                        score = score * self.discount_factor ** (depth - 1)
+                        scores_for_test[function_fully_qualified_name] = score
+                    max_score = max(max_score, score)
+            elif self.normalise:
+                for score in scores_for_test.values():
+                    max_score = max(max_score, score)
 
-            for function_fully_qualified_name in functions_called_by_test:
-                if max_score > 0:
-                    normalised_score_dict[test_fully_qualified_name][
-                        function_fully_qualified_name
-                    ] /= max_score
+            if self.normalise and max_score > 0:
+                for function_fully_qualified_name in scores_for_test:
+                    scores_for_test[function_fully_qualified_name] /= max_score
 
-        return normalised_score_dict
+        return traceability_score_dict
+
+    def _get_call_depth_discount(
+        self, fully_qualified_function_name: str, depths_for_test: Dict[str, int]
+    ) -> float:
+        # Matches the discount applied by _discount_and_normalise_scores, which
+        # leaves functions without a recorded depth undiscounted
+        if (
+            not self.call_depth_discount
+            or fully_qualified_function_name not in depths_for_test
+        ):
+            return 1
+
+        return self.discount_factor ** (
+            depths_for_test[fully_qualified_function_name] - 1
+        )
 
     def generate_predicted_links(
         self,
         traceability_score_dict: Dict[str, Dict[str, float]],
         tests_to_create_links_for: Optional[Set[str]] = None,
+        top_k: Optional[int] = None,
     ) -> Dict[str, Set[str]]:
         """
         Takes a dictionary traceability scores for each test and source code pair,
@@ -112,56 +476,109 @@ class Technique(ABC):
             traceability_score_dict (Dict[str, Dict[str, float]]): A dictionary of traceability
                 scores for each test and source code pair.
             tests_to_create_links_for (Optional[Set[str]], optional): A set of test names to
-                generate links for. If None, links will be generated for all tests. Defaults to None.
+                generate links for. If None, links will be generated for all tests. Defaults to
+                None.
+            top_k (Optional[int], optional): The maximum number of links to predict for each
+                test, keeping the highest scoring links. If None, every link that is predicted
+                is kept. Defaults to None.
 
         Returns:
             Dict[str, Set[str]]: A dictionary of predicted links for each test.
         """
-        if not tests_to_create_links_for:
-            tests_to_create_links_for = set(traceability_score_dict.keys())
-
         predicted_links_dict = defaultdict(list)
 
         for (
             fully_qualified_test_name,
             results_for_test_dict,
         ) in traceability_score_dict.items():
-            predicted_functions_and_score = []
+            if (
+                tests_to_create_links_for
+                and fully_qualified_test_name not in tests_to_create_links_for
+            ):
+                continue
 
-            if fully_qualified_test_name in tests_to_create_links_for:
-                for (
-                    fully_qualified_function_name,
-                    score,
-                ) in results_for_test_dict.items():
-                    if (not self.uses_threshold and score == 1) or (
-                        self.uses_threshold and score >= self.threshold
-                    ):
-                        predicted_functions_and_score.append(
-                            (fully_qualified_function_name, score)
-                        )
-                predicted_functions_and_score.sort(key=lambda x: x[1], reverse=True)
-                predicted_functions_for_test = [
-                    function_name for function_name, _ in predicted_functions_and_score
-                ]
-                predicted_links_dict[fully_qualified_test_name] = (
-                    predicted_functions_for_test
+            predicted_functions_and_score = (
+                (fully_qualified_function_name, score)
+                for fully_qualified_function_name, score in self._iter_scores_for_test(
+                    traceability_score_dict,
+                    fully_qualified_test_name,
+                    results_for_test_dict,
+                )
+                if (not self.uses_threshold and score == 1)
+                or (self.uses_threshold and score >= self.threshold)
+            )
+            # Both keep tied links in the order they were scored
+            if top_k is None:
+                ranked_functions_and_score = sorted(
+                    predicted_functions_and_score, key=itemgetter(1), reverse=True
                 )
+            else:
+                ranked_functions_and_score = heapq.nlargest(
+                    top_k, predicted_functions_and_score, key=itemgetter(1)
+                )
+            predicted_links_dict[fully_qualified_test_name] = [
+                function_name for function_name, _ in ranked_functions_and_score
+            ]
 
         return predicted_links_dict
 
+    def _iter_scores_for_test(
+        self,
+        traceability_score_dict: Dict[str, Dict[str, float]],
+        fully_qualified_test_name: str,
+        results_for_test_dict: Dict[str, float],
+    ) -> Iterable[Tuple[str, float]]:
+        # Unscored functions can only be predicted if a score of zero reaches
+        # the threshold, in which case every function needs to be considered
+        if (
+            self.uses_threshold
+            and self.threshold <= 0
+            and isinstance(traceability_score_dict, TraceabilityScores)
+        ):
+            return traceability_score_dict.iter_dense_scores(fully_qualified_test_name)
+
+        return results_for_test_dict.items()
+
     def _strip_test_name(self, test_name: str) -> str:
-        # Use lowercase since test class may be PascalCase by convention.
-
-        lower_test_name = test_name.lower()
-        if lower_test_name.startswith(TEST_NAME_PREFIX_UNDERSCORE):
-            stripped_test_name = test_name[len(TEST_NAME_PREFIX_UNDERSCORE) :]
-        elif lower_test_name.startswith(TEST_NAME_PREFIX):
-            # Assumption that all test functions must begin with `test'
-            stripped_test_name = test_name[len(TEST_NAME_PREFIX) :]
-        else:
-            stripped_test_name = test_name
-
-        return stripped_test_name
+        return self.similarity_cache.strip_test_name(test_name)
+
+
+def _run_shard_in_worker(
+    test_names_tuple: List[Tuple[str, str]], worker_state: Dict[str, Any]
+) -> Dict[str, Dict[str, float]]:
+    # The technique is handed over as it was configured, so each worker scores
+    # its shards with the same options, and with the statistics over every test
+    technique = worker_state[SHARD_TECHNIQUE]
+    technique.global_statistics = worker_state[SHARD_GLOBAL_STATISTICS]
+    traceability_scores = technique.run(
+        **{
+            **worker_state[SHARD_PARAMETERS],
+            TechniqueParameter.TEST_NAMES_TUPLE: test_names_tuple,
+        }
+    )
+
+    # Only the score rows are sent back, as the merged scores know every function
+    return dict(traceability_scores)
+
+
+def _copy_technique_parameter(parameter: TechniqueParameter, value: Any) -> Any:
+    # The state is updated in place, so the sets of tests that call each
+    # function and the dictionaries of each test are copied, to leave the
+    # parameters the technique was first run with as they were
+    if parameter == TechniqueParameter.TESTS_THAT_CALL_FUNCTIONS:
+        return {
+            fully_qualified_function_name: set(test_names)
+            for fully_qualified_function_name, test_names in value.items()
+        }
+    if parameter in (
+        TechniqueParameter.FUNCTION_NAMES_TUPLE,
+        TechniqueParameter.TEST_NAMES_TUPLE,
+    ):
+        return list(value)
+    if isinstance(value, dict):
+        return copy.copy(value)
+
+    return value
 
 
 __all__ = ["Technique"]
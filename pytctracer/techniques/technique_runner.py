@@ -0,0 +1,154 @@
+from typing import Any, Dict, List, Optional, Set, Type
+from pytctracer.config.constants import TechniqueParameter
+from pytctracer.parallel import map_in_worker_pool
+from pytctracer.techniques.technique import Technique
+from pytctracer.techniques.similarity_cache import SimilarityCache
+from pytctracer.techniques.arg_name_to_technique_mapper import ArgNameToTechniqueMapper
+
+TECHNIQUE_PARAMETER_MAP = "technique_parameter_map"
+SIMILARITY_CACHE = "similarity_cache"
+TECHNIQUE_OPTIONS = "technique_options"
+TEST_JOBS = "test_jobs"
+TESTS_TO_SCORE = "tests_to_score"
+
+
+class TechniqueRunner:
+    """
+    Class which runs traceability techniques on the parsed technique parameters
+    of trace logs. With more than one job, each technique is run in one of a pool
+    of worker processes, in parallel with the others, and each worker keeps a
+    similarity cache of its own for the techniques it runs.
+
+    Attributes:
+        jobs (int): The number of processes to run the techniques with.
+        test_jobs (int): The number of processes to score the tests of each technique
+        with.
+        similarity_cache (SimilarityCache): The cache of string similarities shared by
+        the techniques run in this process.
+    """
+
+    def __init__(self, jobs: int = 1, test_jobs: int = 1) -> None:
+        """
+        Class which runs traceability techniques on parsed technique parameters.
+
+        Args:
+            jobs (int): The number of processes to run the techniques with.
+            test_jobs (int): The number of processes to score the tests of each
+            technique with.
+        """
+        self.jobs = jobs
+        self.test_jobs = test_jobs
+        # Shared by the techniques that are run, so that the names compared by
+        # one string similarity technique aren't compared again by another
+        self.similarity_cache = SimilarityCache()
+
+    def run_techniques(
+        self,
+        chosen_technique_names: List[str],
+        technique_parameter_map: Dict[TechniqueParameter, Any],
+        tests_to_score: Optional[Set[str]] = None,
+        **technique_options,
+    ) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Run each of the chosen traceability techniques on the parsed technique
+        parameters of a trace log.
+
+        Args:
+            chosen_technique_names (List[str]): The arg names of the techniques to run.
+            technique_parameter_map (Dict[TechniqueParameter, Any]): The parsed technique
+            parameters of the trace log.
+            tests_to_score (Optional[Set[str]]): The tests to score. If omitted, every
+            test is scored.
+            **technique_options: The options passed to the constructor of each
+            technique, such as prediction_only.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, float]]]: A dictionary where the keys are the
+            arg names of the techniques, and the values are their traceability scores.
+        """
+        if self.jobs > 1 and len(chosen_technique_names) > 1:
+            traceability_scores = map_in_worker_pool(
+                _run_technique_in_worker,
+                chosen_technique_names,
+                self.jobs,
+                {
+                    TECHNIQUE_PARAMETER_MAP: technique_parameter_map,
+                    SIMILARITY_CACHE: SimilarityCache(),
+                    TECHNIQUE_OPTIONS: technique_options,
+                    TEST_JOBS: self.test_jobs,
+                    TESTS_TO_SCORE: tests_to_score,
+                },
+            )
+
+            return dict(zip(chosen_technique_names, traceability_scores))
+
+        arg_name_to_technique_map = ArgNameToTechniqueMapper()
+        traceability_scores_for_techniques = {}
+        for technique_arg_name in chosen_technique_names:
+            traceability_scores_for_techniques[technique_arg_name] = run_technique(
+                arg_name_to_technique_map.get_technique(technique_arg_name),
+                technique_parameter_map,
+                self.similarity_cache,
+                technique_options,
+                self.test_jobs,
+                tests_to_score,
+            )
+
+        return traceability_scores_for_techniques
+
+
+def run_technique(
+    technique_class: Type[Technique],
+    technique_parameter_map: Dict[TechniqueParameter, Any],
+    similarity_cache: SimilarityCache,
+    technique_options: Dict[str, Any],
+    test_jobs: int = 1,
+    tests_to_score: Optional[Set[str]] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Run a traceability technique on the parsed technique parameters of a trace
+    log, passing the technique only the parameters it requires.
+
+    Args:
+        technique_class (Type[Technique]): The class of the technique to run.
+        technique_parameter_map (Dict[TechniqueParameter, Any]): The parsed technique
+        parameters of the trace log.
+        similarity_cache (SimilarityCache): The cache of string similarities for the
+        technique to use.
+        technique_options (Dict[str, Any]): The options passed to the constructor of
+        the technique.
+        test_jobs (int): The number of processes to score the tests with.
+        tests_to_score (Optional[Set[str]]): The tests to score. If omitted, every test
+        is scored.
+
+    Returns:
+        Dict[str, Dict[str, float]]: The traceability scores of the technique.
+    """
+    technique = technique_class(similarity_cache=similarity_cache, **technique_options)
+    technique_parameters = {
+        required_parameter: technique_parameter_map[required_parameter]
+        for required_parameter in technique.required_parameters
+    }
+
+    if tests_to_score is not None:
+        return technique.run_on_tests(tests_to_score, test_jobs, **technique_parameters)
+    if test_jobs > 1:
+        return technique.run_sharded(test_jobs, **technique_parameters)
+
+    return technique.run(**technique_parameters)
+
+
+def _run_technique_in_worker(
+    technique_arg_name: str, worker_state: Dict[str, Any]
+) -> Dict[str, Dict[str, float]]:
+    return run_technique(
+        ArgNameToTechniqueMapper().get_technique(technique_arg_name),
+        worker_state[TECHNIQUE_PARAMETER_MAP],
+        worker_state[SIMILARITY_CACHE],
+        worker_state[TECHNIQUE_OPTIONS],
+        worker_state[TEST_JOBS],
+        worker_state[TESTS_TO_SCORE],
+    )
+
+
+__all__ = ["TechniqueRunner", "run_technique"]
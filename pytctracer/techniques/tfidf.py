@@ -1,9 +1,12 @@
-from typing import Dict, Union, List, Tuple, Set
+from typing import Any, Dict, Union, List, Tuple, Set
 from math import log
-from collections import defaultdict
+import numpy as np
 from pytctracer.techniques.technique import Technique
+from pytctracer.techniques.call_matrix import create_call_matrix
 from pytctracer.config.constants import TechniqueParameter, TechniqueThreshold
 
+IDF_SCORES = "idf_scores"
+
 
 class TFIDF(Technique):
     """
@@ -74,76 +77,77 @@ class TFIDF(Technique):
             and the values are dictionaries containing the traceability scores
             for each function or function class.
         """
-        tfidf_scores = defaultdict(dict)
-        idf_scores = {}
-        number_of_tests = len(test_names_tuple)
-
-        for fully_qualified_function_name in tests_that_call_functions:
-            idf_scores[fully_qualified_function_name] = self._compute_idf_score(
-                fully_qualified_function_name,
-                tests_that_call_functions,
-                number_of_tests,
-            )
-
-        for fully_qualified_test_name, _ in test_names_tuple:
-            functions_called_by_test = functions_called_by_tests[
-                fully_qualified_test_name
-            ]
-            tf_score = self._compute_tf_score(
-                fully_qualified_test_name, functions_called_by_tests
-            )
-            for fully_qualified_function_name, _ in function_names_tuple:
-                tfidf_scores[fully_qualified_test_name][
-                    fully_qualified_function_name
-                ] = 0
-                if fully_qualified_function_name in functions_called_by_test:
-                    tfidf_scores[fully_qualified_test_name][
-                        fully_qualified_function_name
-                    ] = (tf_score * idf_scores[fully_qualified_function_name])
-
-        if self.call_depth_discount:
-            tfidf_scores = self._use_call_depth_discounting_dict(
-                tfidf_scores, functions_called_by_test_depth
-            )
-        if self.normalise:
-            tfidf_scores = self._normalise_dict(tfidf_scores)
-
-        return tfidf_scores
-
-    def _compute_tf_score(
-        self,
-        fully_qualified_test_name: str,
-        functions_called_by_tests: Dict[str, Set[str]],
-    ) -> float:
-        number_of_functions_called_by_test = len(
-            functions_called_by_tests[fully_qualified_test_name]
+        call_matrix = create_call_matrix(
+            function_names_tuple, test_names_tuple, functions_called_by_tests
         )
-
-        tf_score = (
-            log(1 + 1 / (number_of_functions_called_by_test))
-            if number_of_functions_called_by_test > 0
-            else 0
+        global_statistics = self._get_global_statistics(
+            function_names_tuple=function_names_tuple,
+            test_names_tuple=test_names_tuple,
+            tests_that_call_functions=tests_that_call_functions,
+        )
+        idf_scores = _list_idf_scores(
+            global_statistics[IDF_SCORES], function_names_tuple
         )
+        # Each test calls the functions in its row once, so the number of functions
+        # it called is the length of its row
+        row_lengths = np.diff(call_matrix.indptr)
+        tf_scores = _compute_logs_of_one_plus(
+            1 / np.repeat(row_lengths, row_lengths).astype(np.float64)
+        )
+        call_matrix.data = tf_scores * idf_scores[call_matrix.indices]
 
-        return tf_score
+        return self._create_traceability_scores_from_matrix(
+            call_matrix,
+            function_names_tuple,
+            test_names_tuple,
+            functions_called_by_test_depth,
+        )
 
-    def _compute_idf_score(
+    def compute_global_statistics(
         self,
-        fully_qualified_function_name: str,
+        function_names_tuple: List[Tuple[str, str]],
+        test_names_tuple: List[Tuple[str, str]],
         tests_that_call_functions: Dict[str, Set[str]],
-        number_of_tests: int,
-    ) -> float:
-        number_of_tests_that_call_function = len(
-            tests_that_call_functions[fully_qualified_function_name]
-        )
+        **_,
+    ) -> Dict[str, Any]:
+        """
+        Compute the IDF score of each function over every test, which the
+        TF-IDF scores of a single test depend on.
 
-        idf_score = (
-            log(1 + number_of_tests / (number_of_tests_that_call_function))
-            if number_of_tests_that_call_function > 0
-            else 0
+        Args:
+            function_names_tuple (List[Tuple[str, str]]): A list of tuples of the
+            fully qualified and short names of each function or function class.
+            test_names_tuple (List[Tuple[str, str]]): A list of tuples of the fully
+            qualified and short names of every test or test class.
+            tests_that_call_functions (Dict[str, Set[str]]): A dictionary where the
+            keys are the fully qualified names of the function or function classes,
+            and the values are sets containing each test or test class that calls
+            the function or function class.
+            **_: The other parameters the technique is run with.
+
+        Returns:
+            Dict[str, Any]: The IDF score of each function or function class that
+            was called by a test.
+        """
+        called_function_names = [
+            fully_qualified_function_name
+            for fully_qualified_function_name, _ in function_names_tuple
+            if fully_qualified_function_name in tests_that_call_functions
+        ]
+        numbers_of_tests_that_call_functions = np.array(
+            [
+                len(tests_that_call_functions[fully_qualified_function_name])
+                for fully_qualified_function_name in called_function_names
+            ],
+            dtype=np.float64,
+        )
+        idf_scores = np.zeros(len(called_function_names), dtype=np.float64)
+        called = numbers_of_tests_that_call_functions > 0
+        idf_scores[called] = _compute_logs_of_one_plus(
+            len(test_names_tuple) / numbers_of_tests_that_call_functions[called]
         )
 
-        return idf_score
+        return {IDF_SCORES: dict(zip(called_function_names, idf_scores.tolist()))}
 
 
 class TFIDFMultiset(TFIDF):
@@ -212,65 +216,68 @@ class TFIDFMultiset(TFIDF):
             and the values are dictionaries containing the traceability scores
             for each function or function class.
         """
-        tfidf_scores = defaultdict(dict)
-        idf_scores = {}
-        number_of_tests = len(test_names_tuple)
-
-        for fully_qualified_function_name in tests_that_call_functions:
-            idf_scores[fully_qualified_function_name] = self._compute_idf_score(
-                fully_qualified_function_name,
-                tests_that_call_functions,
-                number_of_tests,
-            )
-
-        for fully_qualified_test_name, _ in test_names_tuple:
-            number_of_functions_called_by_test = sum(
-                functions_called_by_test_count[fully_qualified_test_name].values()
-            )
-            for fully_qualified_function_name, _ in function_names_tuple:
-                tfidf_scores[fully_qualified_test_name][
-                    fully_qualified_function_name
-                ] = 0
-                functions_count = functions_called_by_test_count[
-                    fully_qualified_test_name
-                ]
-                if fully_qualified_function_name in functions_count:
-                    tf_score = self._compute_tf_multiset_score(
-                        fully_qualified_function_name,
-                        number_of_functions_called_by_test,
-                        functions_count,
-                    )
-                    tfidf_scores[fully_qualified_test_name][
-                        fully_qualified_function_name
-                    ] = (tf_score * idf_scores[fully_qualified_function_name])
-
-        if self.call_depth_discount:
-            tfidf_scores = self._use_call_depth_discounting_dict(
-                tfidf_scores, functions_called_by_test_depth
+        count_matrix = create_call_matrix(
+            function_names_tuple, test_names_tuple, functions_called_by_test_count
+        )
+        global_statistics = self._get_global_statistics(
+            function_names_tuple=function_names_tuple,
+            test_names_tuple=test_names_tuple,
+            tests_that_call_functions=tests_that_call_functions,
+        )
+        idf_scores = _list_idf_scores(
+            global_statistics[IDF_SCORES], function_names_tuple
+        )
+        numbers_of_functions_called_by_tests = np.array(
+            [
+                sum(
+                    functions_called_by_test_count.get(
+                        fully_qualified_test_name, {}
+                    ).values()
+                )
+                for fully_qualified_test_name, _ in test_names_tuple
+            ],
+            dtype=np.float64,
+        )
+        tf_multiset_scores = _compute_logs_of_one_plus(
+            count_matrix.data
+            / np.repeat(
+                numbers_of_functions_called_by_tests, np.diff(count_matrix.indptr)
             )
-        if self.normalise:
-            tfidf_scores = self._normalise_dict(tfidf_scores)
-
-        return tfidf_scores
+        )
+        count_matrix.data = tf_multiset_scores * idf_scores[count_matrix.indices]
 
-    def _compute_tf_multiset_score(
-        self,
-        fully_qualified_function_name: str,
-        number_of_functions_called_by_test: int,
-        functions_count: Dict[str, int],
-    ) -> float:
-        number_of_times_function_called = functions_count[fully_qualified_function_name]
-
-        tf_multiset_score = (
-            log(
-                1
-                + number_of_times_function_called / (number_of_functions_called_by_test)
-            )
-            if number_of_functions_called_by_test > 0
-            else 0
+        return self._create_traceability_scores_from_matrix(
+            count_matrix,
+            function_names_tuple,
+            test_names_tuple,
+            functions_called_by_test_depth,
         )
 
-        return tf_multiset_score
+
+def _compute_logs_of_one_plus(ratios: np.ndarray) -> np.ndarray:
+    # The log of each distinct ratio is taken with math.log, so the scores are
+    # exactly those computed a pair at a time. The ratios only take a few
+    # distinct values, as they come from small counts
+    distinct_ratios, ratio_positions = np.unique(ratios, return_inverse=True)
+    distinct_logs = np.array(
+        [log(1 + ratio) for ratio in distinct_ratios.tolist()], dtype=np.float64
+    )
+
+    return distinct_logs[ratio_positions]
+
+
+def _list_idf_scores(
+    idf_scores: Dict[str, float], function_names_tuple: List[Tuple[str, str]]
+) -> np.ndarray:
+    # The IDF score of each column of the call matrix, where functions that no
+    # test calls have an IDF score of zero
+    return np.array(
+        [
+            idf_scores.get(fully_qualified_function_name, 0)
+            for fully_qualified_function_name, _ in function_names_tuple
+        ],
+        dtype=np.float64,
+    )
 
 
 __all__ = ["TFIDF", "TFIDFMultiset"]
@@ -0,0 +1,109 @@
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+
+class TraceabilityScores(dict):
+    """
+    Sparse store of the traceability scores produced by a technique. The keys are
+    the fully qualified names of the tests or test classes, and the values are
+    dictionaries containing the scores of only the functions or function classes
+    that were scored for the test, which are those the test called. Any other pair
+    of a test and a function in the store's function names has a score of zero.
+
+    Attributes:
+        function_names (Set[str]): The fully qualified names of every function or
+        function class that can be linked to, including those that weren't scored.
+    """
+
+    def __init__(
+        self,
+        function_names: Optional[Iterable[str]] = None,
+        test_names: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Sparse store of the traceability scores produced by a technique.
+
+        Args:
+            function_names (Optional[Iterable[str]]): The fully qualified names of every
+            function or function class that can be linked to.
+            test_names (Optional[Iterable[str]]): The fully qualified names of the tests
+            or test classes to create an empty set of scores for.
+        """
+        super().__init__()
+        self.function_names = set(function_names) if function_names else set()
+        for test_name in test_names or ():
+            self[test_name] = {}
+
+    def __missing__(self, _fully_qualified_test_name: str) -> Dict[str, float]:
+        # Tests that weren't scored have a score of zero for every function,
+        # as they did with the dense dictionaries used previously
+        return {}
+
+    def get_score(
+        self, fully_qualified_test_name: str, fully_qualified_function_name: str
+    ) -> float:
+        """
+        Get the traceability score for a test-to-code pair, which is zero if the
+        pair wasn't scored.
+
+        Args:
+            fully_qualified_test_name (str): The fully qualified name of the test.
+            fully_qualified_function_name (str): The fully qualified name of the function.
+
+        Returns:
+            float: The traceability score for the pair.
+        """
+        return self[fully_qualified_test_name].get(fully_qualified_function_name, 0)
+
+    def iter_dense_scores(
+        self, fully_qualified_test_name: str
+    ) -> Iterator[Tuple[str, float]]:
+        """
+        Iterate over the traceability scores of a test for every function in the
+        store's function names, including the functions with a score of zero.
+
+        Args:
+            fully_qualified_test_name (str): The fully qualified name of the test.
+
+        Returns:
+            Iterator[Tuple[str, float]]: An iterator of the fully qualified name of each
+            function, and its traceability score for the test.
+        """
+        scores_for_test = self[fully_qualified_test_name]
+        yield from scores_for_test.items()
+        for fully_qualified_function_name in self.function_names:
+            if fully_qualified_function_name not in scores_for_test:
+                yield fully_qualified_function_name, 0
+
+    def count_unscored_functions(
+        self, fully_qualified_test_name: str, function_names_to_count: Set[str]
+    ) -> Tuple[int, int]:
+        """
+        Count the functions that weren't scored for a test, and therefore have a
+        score of zero, without enumerating them.
+
+        Args:
+            fully_qualified_test_name (str): The fully qualified name of the test.
+            function_names_to_count (Set[str]): A set of fully qualified function names,
+            such as the ground truth links of the test, to count separately.
+
+        Returns:
+            Tuple[int, int]: The number of unscored functions that are in the given set,
+            and the number of unscored functions that aren't.
+        """
+        scores_for_test = self[fully_qualified_test_name]
+        unscored_in_set = sum(
+            1
+            for fully_qualified_function_name in function_names_to_count
+            if fully_qualified_function_name in self.function_names
+            and fully_qualified_function_name not in scores_for_test
+        )
+        number_of_unscored = len(self.function_names) - sum(
+            1
+            for fully_qualified_function_name in scores_for_test
+            if fully_qualified_function_name in self.function_names
+        )
+
+        return unscored_in_set, number_of_unscored - unscored_in_set
+
+
+__all__ = ["TraceabilityScores"]
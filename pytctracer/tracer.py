@@ -2,10 +2,12 @@ from types import FrameType, CodeType
 from typing import Callable, List, Optional, Any, Tuple
 import os
 import inspect
+from collections import defaultdict
 import pytest
 import csv
 import threading
 import dis
+from pytctracer.io.index import create_trace_segment_index, write_trace_segment_index
 from pytctracer.config.constants import (
     TraceDataHeader,
     TestingMethodType,
@@ -265,17 +267,68 @@ class PytestTracer:
             self._current_depth -= 1
             self._check_remaining_in_line_functions(self._current_depth)
 
-    def write_to_csv(self) -> None:
+    def write_to_csv(self, write_segment_index: bool = False) -> None:
         """
         Write stored trace data to a CSV file. The CSV is written to
         the file specified in the `output_csv_file_name` parameter the
         class was initialised with.
+
+        Args:
+            write_segment_index (bool): Whether to also write a test segment index
+            next to the CSV file, mapping each test to the byte offsets and rows of
+            its segments in the CSV file.
         """
+        # Each segment is [start byte, end byte, start row, end row], as stored
+        # in the test segment index
+        segments = defaultdict(list)
+        # The test whose segment is open, and the start byte and start row of
+        # the segment. The segment is added once its end is known
+        open_test = None
+        open_start_byte = open_start_row = 0
         with open(self._csv_name, "w", newline="") as csv_file:
             csv_writer = csv.DictWriter(csv_file, fieldnames=self._csv_headers)
             csv_writer.writeheader()
-            for data_row in self._csv_data:
+            data_start = csv_file.tell() if write_segment_index else None
+            for row_number, data_row in enumerate(self._csv_data):
+                testing_method = data_row[TraceDataHeader.TESTNG_METHOD]
+                if not write_segment_index or not testing_method:
+                    csv_writer.writerow(data_row)
+                    continue
+
+                row_start = csv_file.tell()
                 csv_writer.writerow(data_row)
+                if testing_method == TestingMethodType.TEST_METHOD_CALL:
+                    if open_test is not None:
+                        segments[open_test].append(
+                            [open_start_byte, row_start, open_start_row, row_number]
+                        )
+                    open_test = data_row[TraceDataHeader.FULLY_QUALIFIED_FUNCTION_NAME]
+                    open_start_byte, open_start_row = row_start, row_number
+                elif (
+                    testing_method == TestingMethodType.TEST_METHOD_RETURN
+                    and open_test is not None
+                ):
+                    row_end = csv_file.tell()
+                    segments[open_test].append(
+                        [open_start_byte, row_end, open_start_row, row_number + 1]
+                    )
+                    open_test = None
+
+            if open_test is not None:
+                data_end = csv_file.tell()
+                segments[open_test].append(
+                    [open_start_byte, data_end, open_start_row, len(self._csv_data)]
+                )
+
+        if write_segment_index:
+            trace_segment_index = create_trace_segment_index(
+                trace_csv_log_path=self._csv_name,
+                columns=list(self._csv_headers),
+                data_start=data_start,
+                row_count=len(self._csv_data),
+                segments=dict(segments),
+            )
+            write_trace_segment_index(self._csv_name, trace_segment_index)
 
     def our_frame(self, frame: FrameType) -> bool:
         """
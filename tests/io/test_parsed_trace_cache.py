@@ -0,0 +1,51 @@
+import pickle
+import pytest
+from pytctracer.config.constants import LevelType
+from pytctracer.io.cache.parsed_trace_cache import (
+    get_parsed_trace_cache_path,
+    load_parsed_trace_cache,
+    write_parsed_trace_cache,
+)
+
+
+class _FailsWhenUnpickled:
+    def __reduce__(self):
+        return (pytest.fail, ("The cache file was unpickled",))
+
+
+@pytest.fixture(name="trace_csv_log_path")
+def fixture_trace_csv_log_path(tmp_path):
+    trace_csv_log_path = tmp_path / "trace.csv"
+    trace_csv_log_path.write_text("Depth,Function Type\n")
+
+    return str(trace_csv_log_path)
+
+
+def test_load_parsed_trace_cache_loads_the_written_parameters(trace_csv_log_path):
+    technique_parameter_maps = {LevelType.FUNCTION: {"parameter": {"test": {1, 2}}}}
+    write_parsed_trace_cache(trace_csv_log_path, technique_parameter_maps)
+
+    assert load_parsed_trace_cache(trace_csv_log_path) == technique_parameter_maps
+
+
+def test_load_parsed_trace_cache_does_not_unpickle_a_cache_without_a_header(
+    trace_csv_log_path,
+):
+    with open(get_parsed_trace_cache_path(trace_csv_log_path), "wb") as file:
+        pickle.dump(_FailsWhenUnpickled(), file)
+
+    assert load_parsed_trace_cache(trace_csv_log_path) is None
+
+
+def test_load_parsed_trace_cache_does_not_unpickle_parameters_that_were_replaced(
+    trace_csv_log_path,
+):
+    write_parsed_trace_cache(trace_csv_log_path, {LevelType.FUNCTION: {}})
+    cache_path = get_parsed_trace_cache_path(trace_csv_log_path)
+    with open(cache_path, "rb") as file:
+        header_line = file.readline()
+    with open(cache_path, "wb") as file:
+        file.write(header_line)
+        pickle.dump(_FailsWhenUnpickled(), file)
+
+    assert load_parsed_trace_cache(trace_csv_log_path) is None
@@ -0,0 +1,120 @@
+import csv
+import random
+import pytest
+from pytctracer.config.constants import LevelType
+from pytctracer.parsing.parse_trace_csv_log import parse_trace_csv_log
+
+TRACE_CSV_LOG_HEADER = [
+    "Depth",
+    "Function Type",
+    "Testing Method",
+    "Function Name",
+    "Fully Qualified Function Name",
+    "Class Name",
+    "Fully Qualified Class Name",
+    "Line",
+    "Event Type",
+    "Return Value",
+    "Return Type",
+    "Exception Type",
+    "Exception Message",
+    "Thread ID",
+]
+
+
+def _write_trace_csv_log(trace_csv_log_path, number_of_tests, number_of_functions):
+    # Tests call random functions in random orders, and some tests run more than
+    # once, as parametrised tests do, so the same names appear in several chunks
+    generator = random.Random(0)
+    functions = []
+    for function_index in range(number_of_functions):
+        module_name = f"src.module{function_index % 7}"
+        class_name = f"Class{function_index % 5}"
+        functions.append(
+            (
+                f"function{function_index}",
+                f"{module_name}.{class_name}.function{function_index}",
+                class_name,
+                f"{module_name}.{class_name}",
+            )
+        )
+    rows = []
+
+    def add_row(depth, function_type, testing_method, function, event_type):
+        function_name, fully_qualified_name, class_name, fully_qualified_class = (
+            function
+        )
+        rows.append(
+            [
+                depth,
+                function_type,
+                testing_method,
+                function_name,
+                fully_qualified_name,
+                class_name,
+                fully_qualified_class,
+                1,
+                event_type,
+                "None" if event_type == "RETURN" else "",
+                "",
+                "",
+                "",
+                1,
+            ]
+        )
+
+    for test_index in range(number_of_tests):
+        test_class_name = f"TestClass{test_index % 6}"
+        test_name = f"test_{test_index % (number_of_tests // 2)}"
+        test = (
+            test_name,
+            f"tests.test_module.{test_class_name}.{test_name}",
+            test_class_name,
+            f"tests.test_module.{test_class_name}",
+        )
+        add_row(0, "TEST FUNCTION", "TEST METHOD CALL", test, "CALL")
+        for function in generator.sample(functions, generator.randint(1, 12)):
+            depth = generator.randint(1, 3)
+            add_row(depth, "SOURCE", "", function, "CALL")
+            add_row(depth, "SOURCE", "", function, "RETURN")
+            if generator.random() < 0.3:
+                add_row(1, "ASSERT", "", test, "LINE")
+        add_row(0, "TEST FUNCTION", "TEST METHOD RETURN", test, "RETURN")
+
+    with open(trace_csv_log_path, "w", newline="") as trace_csv_log:
+        writer = csv.writer(trace_csv_log)
+        writer.writerow(TRACE_CSV_LOG_HEADER)
+        writer.writerows(rows)
+
+
+def _in_iteration_order(value):
+    # Sets and dictionaries are compared as lists, so that their order is compared
+    if isinstance(value, dict):
+        return [(key, _in_iteration_order(item)) for key, item in value.items()]
+    if isinstance(value, set):
+        return list(value)
+
+    return value
+
+
+@pytest.mark.parametrize(
+    "traceability_levels",
+    [[LevelType.FUNCTION], [LevelType.CLASS], [LevelType.FUNCTION, LevelType.CLASS]],
+)
+def test_parallel_parse_matches_sequential_parse_in_iteration_order(
+    tmp_path, traceability_levels
+):
+    trace_csv_log_path = str(tmp_path / "trace.csv")
+    _write_trace_csv_log(trace_csv_log_path, 120, 60)
+
+    sequential_parameters = parse_trace_csv_log(
+        trace_csv_log_path, traceability_levels, parse_jobs=1
+    )
+    parallel_parameters = parse_trace_csv_log(
+        trace_csv_log_path, traceability_levels, parse_jobs=3
+    )
+
+    for level in traceability_levels:
+        assert _in_iteration_order(parallel_parameters[level]) == _in_iteration_order(
+            sequential_parameters[level]
+        )
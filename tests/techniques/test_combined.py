@@ -0,0 +1,34 @@
+import pytest
+from pytctracer.techniques.combined import Combined
+
+
+def test_run_combines_techniques_that_scored_the_tests_in_different_orders():
+    traceability_scores_for_techniques = {
+        "a": {"t1": {"f": 1, "g": 0.5}, "t2": {"f": 0.5}},
+        "b": {"t2": {"f": 1}, "t1": {"f": 0.2, "g": 1}},
+    }
+
+    combined_scores = Combined().run(traceability_scores_for_techniques)
+
+    assert combined_scores["t1"] == pytest.approx({"f": 0.8, "g": 1.0})
+    assert combined_scores["t2"] == pytest.approx({"f": 1.0})
+
+
+def test_run_gives_the_same_scores_whatever_order_the_tests_were_scored_in():
+    scores_for_a = {"t1": {"f": 1, "g": 0.5}, "t2": {"f": 0.5, "g": 0.25}}
+    scores_for_b = {"t1": {"f": 0.2, "g": 1}, "t2": {"f": 1}}
+    reversed_scores_for_b = dict(reversed(scores_for_b.items()))
+
+    assert Combined().run({"a": scores_for_a, "b": scores_for_b}) == Combined().run(
+        {"a": scores_for_a, "b": reversed_scores_for_b}
+    )
+
+
+def test_combine_score_rows_rejects_rows_out_of_the_order_of_the_tests():
+    score_rows_for_techniques = {
+        "a": [("t1", {"f": 1}), ("t2", {"f": 1})],
+        "b": [("t2", {"f": 1}), ("t1", {"f": 1})],
+    }
+
+    with pytest.raises(ValueError):
+        list(Combined().combine_score_rows(score_rows_for_techniques, ["t1", "t2"]))
@@ -0,0 +1,111 @@
+import random
+import pytest
+from pytctracer.techniques.similarity_cache import (
+    compute_bounded_edit_distance,
+    compute_edit_distance,
+    compute_lcs_length,
+)
+
+NAME_PAIRS = [
+    ("", ""),
+    ("", "parse_date"),
+    ("parse_date", ""),
+    ("parse_date", "parse_date"),
+    ("parse_date", "date_parse"),
+    ("a", "b"),
+    ("humanize", "humanise"),
+    ("naïve_résumé", "naive_resume"),
+    ("計算_距離", "距離を計算"),
+    ("émoji_🙂_name", "emoji_🙃_name"),
+    ("x" * 64, "x" * 65),
+    ("get_" + "abc" * 30, "set_" + "abc" * 29 + "abd"),
+    ("test_" + "α" * 70 + "_case", "α" * 72),
+    ("a" * 100, "b" * 100),
+    ("ab" * 40, "ba" * 40),
+]
+
+
+# The textbook DP, computed a cell at a time, which the bit-parallel and banded
+# kernels must agree with
+def _reference_lcs_length(first_name, second_name):
+    previous_row = [0] * (len(second_name) + 1)
+    for first_character in first_name:
+        current_row = [0]
+        for j, second_character in enumerate(second_name, start=1):
+            if first_character == second_character:
+                current_row.append(previous_row[j - 1] + 1)
+            else:
+                current_row.append(max(previous_row[j], current_row[j - 1]))
+        previous_row = current_row
+
+    return previous_row[-1]
+
+
+def _reference_edit_distance(first_name, second_name):
+    previous_row = list(range(len(second_name) + 1))
+    for i, first_character in enumerate(first_name, start=1):
+        current_row = [i]
+        for j, second_character in enumerate(second_name, start=1):
+            current_row.append(
+                min(
+                    previous_row[j - 1] + (first_character != second_character),
+                    current_row[j - 1] + 1,
+                    previous_row[j] + 1,
+                )
+            )
+        previous_row = current_row
+
+    return previous_row[-1]
+
+
+def _random_name_pairs(number_of_pairs):
+    # Small alphabets, including non-ASCII characters, give many matches. Half of
+    # the second names are a few edits away from the first, so that the band of
+    # the bounded edit distance is computed rather than rejected by length
+    generator = random.Random(0)
+    alphabet = "abc_é字🙂"
+    name_pairs = []
+    for pair_index in range(number_of_pairs):
+        first_name = "".join(generator.choices(alphabet, k=generator.randint(0, 130)))
+        if pair_index % 2:
+            second_name = "".join(
+                generator.choices(alphabet, k=generator.randint(0, 130))
+            )
+        else:
+            second_name = list(first_name)
+            for _ in range(generator.randint(0, 10)):
+                position = generator.randint(0, len(second_name))
+                if second_name and generator.random() < 0.5:
+                    del second_name[min(position, len(second_name) - 1)]
+                else:
+                    second_name.insert(position, generator.choice(alphabet))
+            second_name = "".join(second_name)
+        name_pairs.append((first_name, second_name))
+
+    return name_pairs
+
+
+@pytest.mark.parametrize("first_name, second_name", NAME_PAIRS + _random_name_pairs(60))
+def test_compute_lcs_length_matches_the_dp(first_name, second_name):
+    assert compute_lcs_length(first_name, second_name) == _reference_lcs_length(
+        first_name, second_name
+    )
+
+
+@pytest.mark.parametrize("first_name, second_name", NAME_PAIRS + _random_name_pairs(60))
+def test_compute_edit_distance_matches_the_dp(first_name, second_name):
+    assert compute_edit_distance(first_name, second_name) == _reference_edit_distance(
+        first_name, second_name
+    )
+
+
+@pytest.mark.parametrize("first_name, second_name", NAME_PAIRS + _random_name_pairs(60))
+def test_compute_bounded_edit_distance_matches_the_dp(first_name, second_name):
+    edit_distance = _reference_edit_distance(first_name, second_name)
+
+    for max_distance in [-1, 0, 1, 2, 3, 5, 8, 20, 64, 200]:
+        assert compute_bounded_edit_distance(first_name, second_name, max_distance) == (
+            edit_distance
+            if 0 <= max_distance and edit_distance <= max_distance
+            else None
+        )